@@ -26,7 +26,8 @@ from .extensions import db, mail, limiter
 from .utils.helpers.response_helpers import error_response
 from .utils.helpers.basic_helpers import log_exception, console_log
 from .utils.helpers.user_helpers import add_user_role
-from .utils.middleware import set_access_control_allows, check_emerge, json_check, ping_url
+from .utils.middleware import set_access_control_allows, check_emerge, json_check, ping_url, compress_response
+from .utils.json_provider import FastJSONProvider
 from config import Config, configure_logging, config_by_name
 
 
@@ -42,6 +43,7 @@ def create_app(config_name=Config.ENV):
     '''
     flask_app = Flask(__name__)
     flask_app.config.from_object(config_by_name[config_name])
+    flask_app.json = FastJSONProvider(flask_app) # encode responses with orjson when it's installed
     
     
 
@@ -57,6 +59,7 @@ def create_app(config_name=Config.ENV):
 
     # Use the after_request decorator to set Access-Control-Allow
     flask_app.after_request(set_access_control_allows)
+    flask_app.after_request(compress_response) # gzip/brotli large JSON responses
     
     # Before request hooks
     flask_app.before_request(check_emerge)
@@ -29,6 +29,50 @@ def make_celery(flask_app: Flask) -> Celery:
 
     celery.Task = ContextTask
     
+    # Periodic jobs, run with celery beat
+    celery.conf.beat_schedule = {
+        'rebuild-task-inventory': {
+            'task': 'app.celery.jobs.tasks.rebuild_task_inventory',
+            'schedule': crontab(minute='*/15'),
+        },
+        'rebuild-task-counts': {
+            'task': 'app.celery.jobs.tasks.rebuild_task_counts',
+            'schedule': crontab(minute='*/15'),
+        },
+        'refresh-task-ranking': {
+            'task': 'app.celery.jobs.tasks.refresh_task_ranking',
+            'schedule': 30.0, # seconds
+        },
+        'rebuild-task-ranking': {
+            'task': 'app.celery.jobs.tasks.rebuild_task_ranking',
+            'schedule': crontab(minute='*/30'),
+        },
+        'expire-due-tasks': {
+            'task': 'app.celery.jobs.tasks.expire_due_tasks',
+            'schedule': 15.0, # seconds
+        },
+        'expire-timed-out-tasks': {
+            'task': 'app.celery.jobs.tasks.check_expired_tasks',
+            'schedule': crontab(minute=0), # sweep for anything the deadline queue missed
+        },
+        'release-expired-reservations': {
+            'task': 'app.celery.jobs.tasks.release_expired_reservations',
+            'schedule': crontab(minute='*/5'),
+        },
+        'recount-task-slots': {
+            'task': 'app.celery.jobs.tasks.recount_task_slots',
+            'schedule': crontab(minute=30, hour=2),
+        },
+        'recount-task-counters': {
+            'task': 'app.celery.jobs.tasks.recount_task_counters',
+            'schedule': crontab(minute=45, hour=2),
+        },
+        'refresh-exchange-rates': {
+            'task': 'app.celery.jobs.tasks.refresh_exchange_rates',
+            'schedule': crontab(minute=0, hour='*/3'),
+        },
+    }
+    
     # Import all tasks to ensure they are registered with Celery
     from app.celery.jobs import tasks
     
@@ -4,17 +4,16 @@ from datetime import datetime, timedelta
 from celery import shared_task
 
 from app.extensions import db
-from app.models.task import TaskPerformance
+from app.utils.tasks.expiry import expire_timed_out_performances
 
 @shared_task(bind=True)
-def check_tasks_status():
-    now = datetime.utcnow()
-    timeout_threshold = now - timedelta(hours=1)
-    timed_out_tasks = TaskPerformance.query.filter(
-        TaskPerformance.status == 'pending',
-        TaskPerformance.started_at <= timeout_threshold
-    ).all()
-    for task in timed_out_tasks:
-        task.status = 'timed_out'
-        logging.info(f'Task performance with ID{task.id}, expired and status updated to timed_out')
-    db.session.commit()
+def check_tasks_status(self):
+    try:
+        metrics = expire_timed_out_performances()
+        logging.info(f"{metrics['expired']} task performances expired and status updated to timed_out")
+        return metrics
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    finally:
+        db.session.close()
@@ -7,6 +7,11 @@ from ...extensions import db
 from ...models import TaskPerformance
 from ...utils.helpers.basic_helpers import log_exception, console_log
 from ...utils.helpers.media_helpers import save_media
+from ...utils.tasks import inventory, ranking, catalog_counts
+from ...utils.tasks.counters import recount_task_progress
+from ...utils.tasks.expiry import expire_due_performances, expire_timed_out_performances
+from ...utils.payments.rates import refresh_exchange_rates as publish_exchange_rates
+from ...utils.tasks.reservation import recount_task_allocations, release_expired_reservations as release_reservations
 
 
 @shared_task(bind=True)
@@ -40,9 +45,140 @@ def save_task_media_files(self, task_id_key: str | int, media_file_paths):
 
 
 @shared_task(bind=True)
-def check_expired_tasks():
-    pending_tasks = TaskPerformance.query.filter_by(status='pending').all()
-    for task in pending_tasks:
-        if task.started_at < datetime.utcnow() - timedelta(hours=1):
-            task.update(status='failed')
-            db.session.commit()
\ No newline at end of file
+def rebuild_task_inventory(self):
+    """Rebuilds the inventory of open tasks from the database, to recover from any drift."""
+    try:
+        total = inventory.rebuild_task_inventory()
+        console_log("task inventory rebuilt", f"{total} open tasks")
+        return total
+    except Exception as e:
+        log_exception("an exception occurred rebuilding task inventory", e)
+        raise e
+    finally:
+        db.session.close()
+
+
+@shared_task(bind=True)
+def rebuild_task_counts(self):
+    """Rebuilds the counts of open tasks per platform, goal and targeting value, to recover from any drift."""
+    try:
+        total = catalog_counts.rebuild_task_counts()
+        console_log("task counts rebuilt", f"{total} open tasks")
+        return total
+    except Exception as e:
+        log_exception("an exception occurred rebuilding task counts", e)
+        raise e
+    finally:
+        db.session.close()
+
+
+@shared_task(bind=True)
+def refresh_task_ranking(self):
+    """Re-scores the tasks that changed since the last run."""
+    try:
+        return ranking.refresh_task_ranking()
+    except Exception as e:
+        log_exception("an exception occurred refreshing task ranking", e)
+        raise e
+    finally:
+        db.session.close()
+
+
+@shared_task(bind=True)
+def rebuild_task_ranking(self):
+    """Rebuilds the ranking of open tasks from the database, to recover from any drift."""
+    try:
+        total = ranking.rebuild_task_ranking()
+        console_log("task ranking rebuilt", f"{total} open tasks")
+        return total
+    except Exception as e:
+        log_exception("an exception occurred rebuilding task ranking", e)
+        raise e
+    finally:
+        db.session.close()
+
+
+@shared_task(bind=True)
+def recount_task_slots(self):
+    """Recomputes how many slots of each task are held by earners."""
+    try:
+        corrected = recount_task_allocations()
+        console_log("task slots recounted", f"{corrected} tasks corrected")
+        return corrected
+    except Exception as e:
+        log_exception("an exception occurred recounting task slots", e)
+        db.session.rollback()
+        raise e
+    finally:
+        db.session.close()
+
+
+@shared_task(bind=True)
+def expire_due_tasks(self):
+    """Times out the task performances whose deadline has passed, as popped from the deadline queue."""
+    try:
+        metrics = expire_due_performances()
+        if metrics is None: # deadline queue unavailable, scan the table instead
+            metrics = expire_timed_out_performances()
+        return metrics
+    except Exception as e:
+        log_exception("an exception occurred expiring due task performances", e)
+        db.session.rollback()
+        raise e
+    finally:
+        db.session.close()
+
+
+@shared_task(bind=True)
+def check_expired_tasks(self):
+    """Times out task performances that weren't submitted in time, giving their slots back."""
+    try:
+        return expire_timed_out_performances()
+    except Exception as e:
+        log_exception("an exception occurred expiring task performances", e)
+        db.session.rollback()
+        raise e
+    finally:
+        db.session.close()
+
+@shared_task(bind=True)
+def release_expired_reservations(self, performance_ids=None):
+    """Gives back the slots of prefetched tasks the earner didn't perform in time."""
+    try:
+        released = release_reservations(performance_ids)
+        console_log("task reservations released", f"{released} reservations")
+        return released
+    except Exception as e:
+        log_exception("an exception occurred releasing task reservations", e)
+        db.session.rollback()
+        raise e
+    finally:
+        db.session.close()
+
+
+@shared_task(bind=True)
+def recount_task_counters(self):
+    """Rebuilds the per-status performance counters of every task."""
+    try:
+        corrected = recount_task_progress()
+        console_log("task counters recounted", f"{corrected} tasks corrected")
+        return corrected
+    except Exception as e:
+        log_exception("an exception occurred recounting task counters", e)
+        db.session.rollback()
+        raise e
+    finally:
+        db.session.close()
+
+
+@shared_task(bind=True)
+def refresh_exchange_rates(self):
+    """Fetches the latest exchange rates and publishes them to every process through Redis."""
+    try:
+        version = publish_exchange_rates()
+        if version is None:
+            console_log("exchange rates not refreshed", "the API returned no rates, keeping the published ones")
+        return version
+    except Exception as e:
+        log_exception("an exception occurred refreshing exchange rates", e)
+        raise e
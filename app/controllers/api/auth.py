@@ -14,7 +14,7 @@ from flask import request, make_response, current_app
 from sqlalchemy.exc import ( IntegrityError, DataError, DatabaseError, InvalidRequestError, )
 from werkzeug.security import generate_password_hash
 from werkzeug.exceptions import UnsupportedMediaType
-from flask_jwt_extended import create_access_token, decode_token, get_jwt_identity
+from flask_jwt_extended import create_access_token, decode_token
 from flask_jwt_extended.exceptions import JWTDecodeError
 from jwt import ExpiredSignatureError, DecodeError
 import pyotp
@@ -26,7 +26,7 @@ from ...models.social import social_media_platforms
 from ...utils.helpers.basic_helpers import console_log, log_exception
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.auth_helpers import generate_six_digit_code, save_pwd_reset_token, send_2fa_code
-from ...utils.helpers.user_helpers import is_user_exist, get_trendit3_user, referral_code_exists
+from ...utils.helpers.user_helpers import is_user_exist, get_trendit3_user, referral_code_exists, get_current_user
 from ...utils.helpers.mail_helpers import send_other_emails, send_code_to_email, send_url_to_email
 
 class AuthController:
@@ -537,8 +537,7 @@ class AuthController:
     @staticmethod
     def delete_account():
         try:
-            current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -623,8 +622,7 @@ class AuthController:
     @staticmethod
     def update_user_role():
         try:
-            current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             data = request.get_json()
             
             if not data or "user_type" not in data:
@@ -7,6 +7,10 @@ from app.models.item import Item
 from app.utils.helpers.item_helpers import save_item, fetch_item
 from app.utils.helpers.payment_helpers import is_paid
 from app.utils.helpers.response_helpers import error_response, success_response
+from app.utils.helpers.pagination_helpers import paginate_query, pagination_meta
+from app.exceptions import InvalidCursorError
+from app.utils.serializers.fields import requested_fields
+from app.utils.serializers.records import ITEM_FIELDS, item_load_options, serialize_records
 
 
 class ItemController:
@@ -15,21 +19,28 @@ class ItemController:
         error = False
         try:
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             items_per_page = int(Config.ITEMS_PER_PAGE)
-            pagination = Item.query.order_by(Item.created_at.desc()).paginate(page=page, per_page=items_per_page, error_out=False)
+            query = Item.query.options(*item_load_options(fields))
+            pagination = paginate_query(query, Item.created_at, page, items_per_page)
             
             items = pagination.items
-            current_items = [item.to_dict() for item in items]
+            current_items = serialize_records(items, ITEM_FIELDS, fields)
             extra_data = {
                 "total": pagination.total,
                 "all_items": current_items,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
+                **pagination_meta(pagination),
             }
             
             if not items:
                 return success_response('There are no product or services yet', 200, extra_data)
                 
+        except InvalidCursorError as e:
+            error = True
+            msg = f'{e}'
+            status_code = 400
         except Exception as e:
             error = True
             status_code = 500
@@ -9,8 +9,12 @@ from ...models import Notification, NotificationType
 from ...models.user import Trendit3User
 
 from ...utils.helpers.basic_helpers import console_log, log_exception
-from ...utils.helpers.user_helpers import get_notifications, mark_as_read
+from ...utils.helpers.user_helpers import get_notifications, mark_as_read, get_current_user
 from ...utils.helpers.response_helpers import *
+from ...utils.helpers.pagination_helpers import paginate_query, pagination_meta
+from ...exceptions import InvalidCursorError
+from ...utils.serializers.fields import requested_fields
+from ...utils.serializers.records import NOTIFICATION_FIELDS, serialize_records
 
 class NotificationController:
     @staticmethod
@@ -20,6 +24,7 @@ class NotificationController:
             current_user_id = get_jwt_identity()
             page = request.args.get("page", 1, type=int)
             notification_type = request.args.get("type", "")
+            fields = requested_fields()
             tasks_per_page = int(10)
             
             notifications_query: list[Notification] = Notification.query
@@ -34,18 +39,18 @@ class NotificationController:
             
             console_log("notifications_query", notifications_query)
             
-            pagination = notifications_query.filter_by(recipient_id=current_user_id) \
-                .order_by(Notification.created_at.desc()) \
-                .paginate(page=page, per_page=tasks_per_page, error_out=False)
+            query = notifications_query.filter_by(recipient_id=current_user_id)
+            pagination = paginate_query(query, Notification.created_at, page, tasks_per_page)
             
             
             notifications: list[Notification] = pagination.items
-            current_notifications = [notification.to_dict() for notification in notifications]
+            current_notifications = serialize_records(notifications, NOTIFICATION_FIELDS, fields)
             extra_data = {
                 'total': pagination.total,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
                 "notifications": current_notifications,
+                **pagination_meta(pagination),
             }
             
             if not notifications:
@@ -53,6 +58,8 @@ class NotificationController:
             
             api_response = success_response('User notifications fetched successfully', 200, extra_data)
         
+        except InvalidCursorError as e:
+            api_response = error_response(f'{e}', 400)
         except Exception as e:
             msg = f'An error occurred while getting user notifications: {e}'
             # Log the error details for debugging
@@ -171,7 +178,7 @@ class NotificationController:
         """
         try:
             recipient_id = int(get_jwt_identity())
-            recipients = Trendit3User.query.filter_by(id=recipient_id).first()
+            recipients = get_current_user()
             Notification.add_notification(
                 recipient_id=recipient_id,
                 body=body,
@@ -203,7 +210,7 @@ class NotificationController:
         """
         try:
             recipient_id = int(get_jwt_identity())
-            recipients = Trendit3User.query.filter_by(id=recipient_id).first()
+            recipients = get_current_user()
             Notification.add_notification(
                 recipient_id=recipient_id,
                 body=body,
@@ -4,18 +4,22 @@ from sqlalchemy.exc import ( DataError, DatabaseError )
 from flask_jwt_extended import get_jwt_identity
 
 from ...extensions import db
-from ...models import (Trendit3User, BankAccount, Recipient, Payment, Transaction, Withdrawal, TaskPaymentStatus)
+from ...models import (BankAccount, Recipient, Payment, Transaction, Withdrawal, TaskPaymentStatus)
 from ...utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.pagination_helpers import paginate_query, pagination_meta
+from ...exceptions import InvalidCursorError
 from ...utils.helpers.basic_helpers import console_log, log_exception
 from ...utils.helpers.bank_helpers import get_bank_code
 from ...utils.helpers.task_helpers import get_task_by_key
 from ...utils.helpers.mail_helpers import send_other_emails
+from ...utils.helpers.user_helpers import get_current_user
 
 # import payment modules
 from ...utils.payments.utils import initialize_payment
 from ...utils.payments.flutterwave import verify_flutterwave_payment, flutterwave_webhook, flutterwave_initiate_transfer
 from ...utils.payments.exceptions import TransactionMissingError, CreditWalletError, SignatureError
 from config import Config
+from ...utils.serializers.records import serialize_payments
 
 class PaymentController:
     @staticmethod
@@ -55,8 +59,6 @@ class PaymentController:
             # Extract body from request
             data = request.get_json()
             
-            current_user_id = get_jwt_identity()
-            
             result = verify_flutterwave_payment(data)
             
             msg = result['msg']
@@ -136,28 +138,30 @@ class PaymentController:
             per_page = 15
             
             # Check if user exists
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             if user is None:
                 return error_response('User not found', 404)
             
             # Fetch payment records from the database
-            pagination = Payment.query.filter_by(trendit3_user_id=current_user_id) \
-                .order_by(Payment.created_at.desc()) \
-                .paginate(page=page, per_page=per_page, error_out=False)
+            query = Payment.query.filter_by(trendit3_user_id=current_user_id)
+            pagination = paginate_query(query, Payment.created_at, page, per_page)
             
             payments = pagination.items
-            current_payments = [payment.to_dict() for payment in payments]
+            current_payments = serialize_payments(payments, user.wallet.currency_code)
             extra_data = {
                 'total': pagination.total,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
                 "payment_history": current_payments,
+                **pagination_meta(pagination),
             }
             
             if not payments:
                 return success_response(f'No payments has been made', 200, extra_data)
             
             return success_response('Payment history fetched successfully', 200, extra_data)
+        except InvalidCursorError as e:
+            return error_response(f'{e}', 400)
         except Exception as e:
             logging.exception(f"An exception occurred during fetching payment history. {str(e)}") # Log the error details for debugging
             return error_response('An unexpected error. Our developers are already looking into it.', 500)
@@ -172,8 +176,7 @@ class PaymentController:
             json: A JSON object containing the status of the withdrawal, a status code, and a message.
         """
         try:
-            current_user_id = int(get_jwt_identity())
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             
             data = request.get_json()
             amount = float(str(data.get('amount')).replace(',', ''))
@@ -216,8 +219,7 @@ class PaymentController:
     def verify_withdraw():
         error = False
         try:
-            current_user_id = get_jwt_identity()
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             user_wallet = user.wallet
             
             data = request.get_json()
@@ -325,8 +327,7 @@ class PaymentController:
         @al-chris
         """
         try:
-            current_user_id = int(get_jwt_identity())
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             user_wallet = user.wallet
             
             user_wallet_dict = user_wallet.to_dict()
@@ -11,7 +11,7 @@ from ...models import Trendit3User, Profile, BankAccount, Wallet
 from ...models.user import Trendit3User, Profile
 from ...utils.helpers.location_helpers import get_currency_info
 from ...utils.helpers.basic_helpers import console_log, log_exception
-from ...utils.helpers.user_helpers import get_user_info
+from ...utils.helpers.user_helpers import get_user_info, get_current_user
 from ...utils.helpers.media_helpers import save_media
 from ...utils.helpers.user_helpers import is_username_exist, is_email_exist, save_profile_pic
 from ...utils.helpers.auth_helpers import send_code_to_email, generate_six_digit_code
@@ -23,8 +23,7 @@ class ProfileController:
     def get_profile():
         
         try:
-            current_user_id = get_jwt_identity()
-            user: Trendit3User = Trendit3User.query.get(current_user_id)
+            user: Trendit3User = get_current_user()
             
             if not user:
                 return error_response("user not found", 400)
@@ -47,9 +46,7 @@ class ProfileController:
     @staticmethod
     def edit_profile():
         try:
-            current_user_id = int(get_jwt_identity())
-            
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             
             if not current_user:
                 return error_response(f"user not found", 404)
@@ -190,8 +187,7 @@ class ProfileController:
     @staticmethod
     def user_email_edit():
         try:
-            current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             data = request.get_json()
             new_email = data.get('new_email')
             
@@ -238,7 +234,7 @@ class ProfileController:
             user_info = decoded_token['sub']
             new_email = user_info['new_email']
             
-            current_user = Trendit3User.query.get(get_jwt_identity())
+            current_user = get_current_user()
             
             if int(entered_code) == int(user_info['verification_code']):
                 current_user.email = new_email
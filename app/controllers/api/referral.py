@@ -3,10 +3,12 @@ from flask import request, abort, jsonify, make_response
 from flask_jwt_extended import get_jwt_identity
 
 from app.extensions import db
-from app.models.user import Trendit3User, Profile, ReferralHistory
+from app.models.user import Profile, ReferralHistory
 from app.utils.helpers.basic_helpers import console_log
-from app.utils.helpers.user_helpers import generate_referral_code
+from app.utils.helpers.user_helpers import generate_referral_code, get_current_user
 from app.utils.helpers.response_helpers import *
+from app.utils.helpers.pagination_helpers import paginate_query, pagination_meta
+from app.exceptions import InvalidCursorError
 
 
 class ReferralController:
@@ -15,8 +17,7 @@ class ReferralController:
         error = False
         
         try:
-            current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             current_user_profile = current_user.profile
             
             # generate unique referral code for current user
@@ -51,7 +52,8 @@ class ReferralController:
             items_per_page = int(10)
             
             current_user_id = get_jwt_identity()
-            pagination = ReferralHistory.query.filter_by(trendit3_user_id=current_user_id).order_by(ReferralHistory.date_joined.desc()).paginate(page=page, per_page=items_per_page, error_out=False)
+            query = ReferralHistory.query.filter_by(trendit3_user_id=current_user_id)
+            pagination = paginate_query(query, ReferralHistory.date_joined, page, items_per_page)
             
             referral_history = pagination.items
             current_referral_history = [rh.to_dict() for rh in referral_history]
@@ -60,6 +62,7 @@ class ReferralController:
                 "referral_history": current_referral_history,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
+                **pagination_meta(pagination),
             }
             
             if not referral_history:
@@ -68,6 +71,10 @@ class ReferralController:
             msg = 'Referral history fetched successfully'
             status_code = 200
             
+        except InvalidCursorError as e:
+            error = True
+            msg = f'{e}'
+            status_code = 400
         except Exception as e:
             error = True
             msg = 'Error getting all referral history'
@@ -14,12 +14,13 @@ from werkzeug.security import generate_password_hash
 from werkzeug.exceptions import UnsupportedMediaType
 
 from ...extensions import db
-from ...models import Trendit3User, UserSettings, NotificationPreference, UserPreference, SecuritySetting
+from ...models import UserSettings, NotificationPreference, UserPreference, SecuritySetting
 from ...exceptions import InvalidTwoFactorMethod
 from ...utils.helpers.basic_helpers import console_log, log_exception
 from ...utils.helpers.settings_helpers import set_2fa_method, generate_google_authenticator_secret_key, generate_google_authenticator_qr_code
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.settings_helpers import update_notification_preferences, update_user_preferences, update_user_security_settings
+from ...utils.helpers.user_helpers import get_current_user
 
 
 class ManageSettingsController:
@@ -27,7 +28,7 @@ class ManageSettingsController:
     def get_notification_settings():
         try:
             current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -66,7 +67,7 @@ class ManageSettingsController:
     def get_preference_settings():
         try:
             current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -106,7 +107,7 @@ class ManageSettingsController:
     def get_security_settings():
         try:
             current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -147,7 +148,7 @@ class ManageSettingsController:
     def update_settings():
         try:
             current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -207,7 +208,7 @@ class ManageSettingsController:
     def update_notification_settings():
         try:
             current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -255,7 +256,7 @@ class ManageSettingsController:
     def update_preference_settings():
         try:
             current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -299,7 +300,7 @@ class ManageSettingsController:
     def update_security_settings():
         try:
             current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -344,7 +345,7 @@ class ManageSettingsController:
     def update_two_fa_method():
         try:
             current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -392,8 +393,7 @@ class ManageSettingsController:
     @staticmethod
     def update_password():
         try:
-            current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -433,7 +433,7 @@ class ManageSettingsController:
     def save_notification_settings():
         try:
             current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -476,7 +476,7 @@ class ManageSettingsController:
     def save_preference_settings():
         try:
             current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -519,7 +519,7 @@ class ManageSettingsController:
     def save_security_settings():
         try:
             current_user_id = get_jwt_identity()
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if not current_user:
                 return error_response(f"user not found", 404)
             
@@ -562,8 +562,7 @@ class ManageSettingsController:
     @staticmethod
     def activate_google_2fa():
         try:
-            current_user_id = get_jwt_identity()
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             
             # Generate a secret key
             secret_key = user.two_fa_secret
@@ -592,7 +591,7 @@ class ManageSettingsController:
     def complete_google_2fa_activation():
         try:
             current_user_id = get_jwt_identity()
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             
             if not user:
                 return error_response('user not found', 404)
@@ -624,7 +623,7 @@ class ManageSettingsController:
     def deactivate_google_2fa():
         try:
             current_user_id = get_jwt_identity()
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             
             user.two_fa_secret = None
             two_fa_method = set_2fa_method(method=None, user_id=current_user_id)
@@ -11,7 +11,7 @@ from ...models.social import SocialLinks, SocialLinkStatus, SocialMediaProfile
 from ...models.user import Trendit3User
 from ...utils.helpers.mail_helpers import send_other_emails
 from ...utils.helpers.basic_helpers import log_exception, console_log
-from ...utils.helpers.user_helpers import get_social_profile
+from ...utils.helpers.user_helpers import get_social_profile, get_current_user
 
 def is_valid_social_url(url, platform):
     patterns = {
@@ -30,9 +30,7 @@ class SocialProfileController:
     @staticmethod
     def get_social_profiles():
         try:
-            user_id = int(get_jwt_identity())
-
-            user = Trendit3User.query.filter_by(id=user_id).first()
+            user = get_current_user()
             if not user:
                 return error_response("User not found", 404)
             
@@ -62,7 +60,7 @@ class SocialProfileController:
         try:
             user_id = int(get_jwt_identity())
             
-            user: Trendit3User = Trendit3User.query.filter_by(id=user_id).first()
+            user: Trendit3User = get_current_user()
             if not user:
                 return error_response("User not found", 404)
             
@@ -138,7 +136,7 @@ class SocialProfileController:
         try:
             user_id = int(get_jwt_identity())
 
-            user:Trendit3User = Trendit3User.query.filter_by(id=user_id).first()
+            user:Trendit3User = get_current_user()
             if not user:
                 return error_response("User not found", 404)
             
@@ -174,7 +172,7 @@ class SocialProfileController:
             # user_id = data.get('userId')
             user_id = int(get_jwt_identity())
             
-            user = Trendit3User.query.filter_by(id=user_id).first()
+            user = get_current_user()
 
             msg = "verified social media fetched successfully"
 
@@ -229,7 +227,7 @@ class SocialProfileController:
             recipient_id = int(get_jwt_identity())
 
             # Fetch the user
-            user = Trendit3User.query.filter_by(id=recipient_id).first()
+            user = get_current_user()
             if not user:
                 return error_response('User not found', 404)
 
@@ -293,10 +291,8 @@ class SocialProfileController:
     @staticmethod
     def delete_socials(platform):
         try:
-            user_id = int(get_jwt_identity())
-
             # Fetch the user
-            user = Trendit3User.query.filter_by(id=user_id).first()
+            user = get_current_user()
             if not user:
                 return error_response('User not found', 404)
             
@@ -1,19 +1,16 @@
 import logging
-from flask_jwt_extended import get_jwt_identity
 
-from ...models import Trendit3User, TaskPerformance, Item
+from ...models import TaskPerformance, Item
 from ...utils.helpers.response_helpers import success_response, error_response
+from ...utils.helpers.user_helpers import get_current_user
 
 
 class StatsController():
     @staticmethod
     def get_stats():
         try:
-            # get the current user's ID
-            current_user_id = get_jwt_identity()
-            
             # get the user's wallet balance
-            wallet_balance = Trendit3User.query.filter_by(id=current_user_id).first().wallet_balance
+            wallet_balance = get_current_user().wallet_balance
             
             # get the total task performed
             total_task_done = TaskPerformance.query.filter_by(status='completed').count()
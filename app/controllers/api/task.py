@@ -5,11 +5,19 @@ from sqlalchemy.exc import ( DataError, DatabaseError, )
 
 from config import Config
 from ...extensions import db
-from ...models import Task, AdvertTask, EngagementTask, TaskPaymentStatus, TaskStatus, TaskPerformance, Trendit3User
-from ...utils.helpers.task_helpers import save_task, get_tasks_dict_grouped_by_field, fetch_task, get_aggregated_task_counts_by_field, fetch_performed_task
-from ...utils.helpers.response_helpers import error_response, success_response
+from ...models import Task, AdvertTask, EngagementTask, TaskPaymentStatus, TaskStatus, TaskPerformance
+from ...utils.helpers.task_helpers import save_task, count_task_groups, iter_task_groups, get_task_group_page, fetch_task, get_aggregated_task_counts_by_field, fetch_performed_task, get_ranked_tasks
+from ...utils.helpers.response_helpers import error_response, success_response, streamed_success_response
+from ...utils.helpers.pagination_helpers import paginate_query, pagination_meta
+from ...exceptions import InvalidCursorError
 from ...utils.helpers.basic_helpers import console_log, log_exception
 from ...utils.helpers.telegram_bot import notify_telegram_admins_new_task
+from ...utils.helpers.user_helpers import get_current_user
+from ...utils.tasks.activity import get_advertiser_activities
+from ...utils.tasks.reservation import release_task_slot
+from ...utils.serializers.fields import requested_fields
+from ...utils.serializers.tasks import task_load_options, load_task_relations, serialize_tasks
+from ...utils.serializers.performances import performance_load_options, serialize_performances
 from ...utils.payments.utils import initialize_payment
 from ...utils.payments.wallet import debit_wallet, credit_wallet
 from ...utils.mailing import send_task_order_review_email
@@ -55,24 +63,28 @@ class TaskController:
         try:
             current_user_id = int(get_jwt_identity())
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             tasks_per_page = int(Config.TASKS_PER_PAGE)
-            pagination = Task.query.filter_by(trendit3_user_id=current_user_id) \
-                .order_by(Task.date_created.desc()) \
-                .paginate(page=page, per_page=tasks_per_page, error_out=False)
+            query = Task.query.filter_by(trendit3_user_id=current_user_id) \
+                .options(*task_load_options(Task, fields))
+            pagination = paginate_query(query, Task.date_created, page, tasks_per_page)
             
             tasks = pagination.items
-            current_tasks = [task.to_dict() for task in tasks]
+            current_tasks = serialize_tasks(tasks, fields)
             extra_data = {
                 'total': pagination.total,
                 "all_tasks": current_tasks,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
+                **pagination_meta(pagination),
             }
             
             if not tasks:
                 return success_response(f'No task has been created yet', 200, extra_data)
             
             api_response = success_response('All Tasks fetched successfully', 200, extra_data)
+        except InvalidCursorError as e:
+            api_response = error_response(f'{e}', 400)
         except Exception as e:
             log_exception("An exception trying to get all Tasks by current user", e)
             api_response = error_response('Error getting all tasks', 500)
@@ -85,10 +97,11 @@ class TaskController:
         try:
             current_user_id = int(get_jwt_identity())
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             tasks_per_page = int(5)
             
             # Check if user exists
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             if user is None:
                 return error_response('User not found', 404)
             
@@ -101,17 +114,18 @@ class TaskController:
             except ValueError:
                 return error_response(f'Invalid status provided: {status}', 400)
             
-            pagination = Task.query.filter_by(trendit3_user_id=current_user_id, status=status_enum) \
-                .order_by(Task.date_created.desc()) \
-                .paginate(page=page, per_page=tasks_per_page, error_out=False)
+            query = Task.query.filter_by(trendit3_user_id=current_user_id, status=status_enum) \
+                .options(*task_load_options(Task, fields))
+            pagination = paginate_query(query, Task.date_created, page, tasks_per_page)
             
             tasks = pagination.items
-            current_tasks = [task.to_dict() for task in tasks]
+            current_tasks = serialize_tasks(tasks, fields)
             extra_data = {
                 'total': pagination.total,
                 "all_tasks": current_tasks,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
+                **pagination_meta(pagination),
             }
             
             if not tasks:
@@ -119,6 +133,8 @@ class TaskController:
             
             msg = f"All {status} Tasks fetched successfully"
             api_response = success_response(msg, 200, extra_data)
+        except InvalidCursorError as e:
+            api_response = error_response(f'{e}', 400)
         except Exception as e:
             log_exception(f"An exception occurred trying to get all {status} tasks", e)
             api_response = error_response(f"Error getting all {status} tasks", 500)
@@ -132,19 +148,21 @@ class TaskController:
         
         try:
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             tasks_per_page = int(Config.TASKS_PER_PAGE)
-            pagination = Task.query.filter_by(payment_status=TaskPaymentStatus.COMPLETE) \
-                .order_by(Task.date_created.desc()) \
-                .paginate(page=page, per_page=tasks_per_page, error_out=False)
+            query = Task.query.filter_by(payment_status=TaskPaymentStatus.COMPLETE) \
+                .options(*task_load_options(Task, fields))
+            pagination = paginate_query(query, Task.date_created, page, tasks_per_page)
             
             
             tasks = pagination.items
-            current_tasks = [task.to_dict() for task in tasks]
+            current_tasks = serialize_tasks(tasks, fields)
             extra_data = {
                 'total': pagination.total,
                 "all_tasks": current_tasks,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
+                **pagination_meta(pagination),
             }
             
             if not tasks:
@@ -153,6 +171,10 @@ class TaskController:
             msg = 'All Tasks fetched successfully'
             status_code = 200
             
+        except InvalidCursorError as e:
+            error = True
+            msg = f'{e}'
+            status_code = 400
         except Exception as e:
             error = True
             msg = 'Error getting all tasks'
@@ -195,7 +217,7 @@ class TaskController:
     def get_advertiser_single_task(task_id_key):
         try:
             current_user_id = int(get_jwt_identity())
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             
             if not current_user:
                 return error_response(f"user not found", 404)
@@ -222,7 +244,7 @@ class TaskController:
     def advertiser_delete_task(task_id_key):
         try:
             current_user_id = int(get_jwt_identity())
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             
             if not current_user:
                 return error_response(f"user not found", 404)
@@ -247,38 +269,30 @@ class TaskController:
     def get_advertisers_tasks_activities():
         try:
             current_user_id = int(get_jwt_identity())
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             
             if not current_user:
                 return error_response(f"user not found", 404)
             
-            page = request.args.get("page", 1, type=int)
+            cursor = request.args.get("cursor", None)
+            per_page = max(1, min(request.args.get("per_page", 10, type=int), 50))
             
-            pagination = Task.query.filter_by(trendit3_user_id=current_user_id) \
-                .order_by(Task.date_created.desc()) \
-                .paginate(page=page, per_page=10, error_out=False)
-                
-            for task in pagination.items:
-                pagination = TaskPerformance.query.filter_by(task_id=task.id) \
-                .order_by(TaskPerformance.started_at.desc()) \
-                .paginate(page=page, per_page=10, error_out=False)
-            
-            task_performances = pagination.items
-            current_activities = []
+            activities, next_cursor = get_advertiser_activities(current_user_id, cursor=cursor, per_page=per_page)
             extra_data = {
-                'total': pagination.total,
-                "current_page": pagination.page,
-                "total_pages": pagination.pages,
-                "activities": current_activities,
+                "activities": activities,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
             }
             
-            if not task_performances:
-                return success_response(f'No one has performed this task yet', 200, extra_data)
-            
+            if not activities:
+                return success_response(f'No one has performed your tasks yet', 200, extra_data)
             
+            api_response = success_response("Task activities fetched successfully", 200, extra_data)
+        except ValueError as e:
+            api_response = error_response(f'{e}', 400)
         except Exception as e:
             api_response = error_response("An unexpected error occurred. Our developers are looking into this.", 500)
-            log_exception("An exception occurred trying to get task:", e)
+            log_exception("An exception occurred trying to get tasks activities:", e)
         
         return api_response
     
@@ -286,17 +300,12 @@ class TaskController:
     def get_advertiser_total_task():
         try:
             current_user_id = int(get_jwt_identity())
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             
             if not current_user:
                 return error_response(f"user not found", 404)
             
-            pagination = Task.query.filter_by(trendit3_user_id=current_user_id, payment_status=TaskPaymentStatus.COMPLETE) \
-                .order_by(Task.date_created.desc()) \
-                .paginate(page=1, per_page=5, error_out=False)
-            
-            
-            total_tasks = pagination.total
+            total_tasks = Task.query.filter_by(trendit3_user_id=current_user_id, payment_status=TaskPaymentStatus.COMPLETE).count()
             extra_data = {
                 'total': total_tasks
             }
@@ -313,7 +322,7 @@ class TaskController:
     def get_task_performances(task_id_key):
         try:
             current_user_id = int(get_jwt_identity())
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             
             if not current_user:
                 return error_response(f"user not found", 404)
@@ -326,18 +335,21 @@ class TaskController:
                 return error_response("You are not authorized to view performances of this task", 401)
             
             page = request.args.get("page", 1, type=int)
+            
+            fields = requested_fields()
             per_page = 5
-            pagination = TaskPerformance.query.filter_by(task_id=task.id, status="in_review") \
-                .order_by(TaskPerformance.started_at.desc()) \
-                .paginate(page=page, per_page=per_page, error_out=False)
+            query = TaskPerformance.query.filter_by(task_id=task.id, status="in_review") \
+                .options(*performance_load_options(add_task=False, fields=fields))
+            pagination = paginate_query(query, TaskPerformance.started_at, page, per_page)
             
             task_performances = pagination.items
-            current_task_performances = [task_performance.to_dict(add_task=False) for task_performance in task_performances]
+            current_task_performances = serialize_performances(task_performances, add_task=False, fields=fields)
             extra_data = {
                 'total': pagination.total,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
                 "task_performances": current_task_performances,
+                **pagination_meta(pagination),
             }
             
             if not task_performances:
@@ -345,6 +357,8 @@ class TaskController:
             
             api_response = success_response("Task performances fetched successfully", 200, extra_data)
         
+        except InvalidCursorError as e:
+            api_response = error_response(f'{e}', 400)
         except Exception as e:
             api_response = error_response("An unexpected error occurred. Our developers are looking into this.", 500)
             log_exception("An exception occurred trying to get task:", e)
@@ -356,7 +370,7 @@ class TaskController:
     def verify_performed_task():
         try:
             current_user_id = int(get_jwt_identity())
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             
             if not current_user:
                 return error_response(f"user not found", 404)
@@ -380,7 +394,8 @@ class TaskController:
             
             status_val = "completed" if status == "accept" else "rejected"
             
-            performed_task.update(status=status_val)
+            release_task_slot(performed_task, status_val) # a rejection gives the slot back to the task
+            db.session.commit()
             
             if status_val == "completed":
                 user_id = performed_task.user_id
@@ -408,18 +423,20 @@ class TaskController:
         try:
             current_user_id = int(get_jwt_identity())
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             tasks_per_page = int(Config.TASKS_PER_PAGE)
-            pagination = AdvertTask.query.filter_by(trendit3_user_id=current_user_id) \
-                .order_by(AdvertTask.date_created.desc()) \
-                .paginate(page=page, per_page=tasks_per_page, error_out=False)
+            query = AdvertTask.query.filter_by(trendit3_user_id=current_user_id) \
+                .options(*task_load_options(AdvertTask, fields))
+            pagination = paginate_query(query, AdvertTask.date_created, page, tasks_per_page)
             
             tasks = pagination.items
-            current_tasks = [task.to_dict() for task in tasks]
+            current_tasks = serialize_tasks(tasks, fields)
             extra_data = {
                 'total': pagination.total,
                 "advert_tasks": current_tasks,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
+                **pagination_meta(pagination),
             }
             
             if not tasks:
@@ -428,6 +445,10 @@ class TaskController:
             msg = 'All Advert Tasks fetched successfully'
             status_code = 200
             
+        except InvalidCursorError as e:
+            error = True
+            msg = f'{e}'
+            status_code = 400
         except Exception as e:
             error = True
             msg = 'Error getting all advert tasks'
@@ -439,24 +460,53 @@ class TaskController:
             return success_response(msg, status_code, extra_data)
 
 
+    @staticmethod
+    def get_task_feed():
+        """Retrieves the best open tasks of a type and platform/goal for the current earner, best first."""
+        try:
+            task_type = request.args.get("task_type", 'advert')
+            filter_value = request.args.get("platform") or request.args.get("goal", '')
+            count = max(1, min(request.args.get("count", int(Config.TASKS_PER_PAGE), type=int), 50))
+            fields = requested_fields()
+            
+            tasks = get_ranked_tasks(task_type, filter_value, count)
+            extra_data = {
+                'tasks': serialize_tasks(load_task_relations(tasks, fields), fields),
+            }
+            
+            if not tasks:
+                return success_response(f'There are no {task_type} tasks for {filter_value} yet', 200, extra_data)
+            
+            api_response = success_response("Task feed fetched successfully", 200, extra_data)
+        except ValueError as e:
+            api_response = error_response(f'{e}', 400)
+        except Exception as e:
+            api_response = error_response("Error getting task feed", 500)
+            log_exception("An exception occurred trying to get task feed:", e)
+        
+        return api_response
+    
+    
     @staticmethod
     def get_advert_tasks():
         error = False
         
         try:
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             tasks_per_page = int(Config.TASKS_PER_PAGE)
-            pagination = AdvertTask.query.filter_by(payment_status=TaskPaymentStatus.COMPLETE, status=TaskStatus.APPROVED) \
-                .order_by(AdvertTask.date_created.desc()) \
-                .paginate(page=page, per_page=tasks_per_page, error_out=False)
+            query = AdvertTask.query.filter_by(payment_status=TaskPaymentStatus.COMPLETE, status=TaskStatus.APPROVED) \
+                .options(*task_load_options(AdvertTask, fields))
+            pagination = paginate_query(query, AdvertTask.date_created, page, tasks_per_page)
             
             tasks = pagination.items
-            current_tasks = [task.to_dict() for task in tasks]
+            current_tasks = serialize_tasks(tasks, fields)
             extra_data = {
                 'total': pagination.total,
                 "advert_tasks": current_tasks,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
+                **pagination_meta(pagination),
             }
             
             if not tasks:
@@ -465,6 +515,10 @@ class TaskController:
             msg = 'All Advert Tasks fetched successfully'
             status_code = 200
             
+        except InvalidCursorError as e:
+            error = True
+            msg = f'{e}'
+            status_code = 400
         except Exception as e:
             error = True
             msg = 'Error getting all advert tasks'
@@ -482,18 +536,20 @@ class TaskController:
         
         try:
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             tasks_per_page = int(Config.TASKS_PER_PAGE)
-            pagination = AdvertTask.query.filter_by(payment_status=TaskPaymentStatus.COMPLETE, status=TaskStatus.APPROVED, platform=platform) \
-                .order_by(AdvertTask.date_created.desc()) \
-                .paginate(page=page, per_page=tasks_per_page, error_out=False)
+            query = AdvertTask.query.filter_by(payment_status=TaskPaymentStatus.COMPLETE, status=TaskStatus.APPROVED, platform=platform) \
+                .options(*task_load_options(AdvertTask, fields))
+            pagination = paginate_query(query, AdvertTask.date_created, page, tasks_per_page)
             
             tasks = pagination.items
-            current_tasks = [task.to_dict() for task in tasks]
+            current_tasks = serialize_tasks(tasks, fields)
             extra_data = {
                 'total': pagination.total,
                 "advert_tasks": current_tasks,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
+                **pagination_meta(pagination),
             }
             
             if not tasks:
@@ -502,6 +558,10 @@ class TaskController:
             msg = f'All Advert Tasks for {platform} fetched successfully'
             status_code = 200
             
+        except InvalidCursorError as e:
+            error = True
+            msg = f'{e}'
+            status_code = 400
         except Exception as e:
             error = True
             status_code = 500
@@ -519,16 +579,31 @@ class TaskController:
         error = False
         
         try:
-            tasks_by_field = get_tasks_dict_grouped_by_field(field, 'advert')
-            
-            if len(tasks_by_field) < 1:
+            fields = requested_fields()
+            per_group = max(1, min(request.args.get("per_group", int(Config.TASKS_PER_PAGE), type=int), 50))
+            
+            if 'group' in request.args:
+                # "load more" of a single group
+                group = request.args.get('group')
+                pagination = get_task_group_page(field, 'advert', group, per_group, request.args.get('cursor'), fields)
+                extra_data = {
+                    'group': group,
+                    'tasks': serialize_tasks(pagination.items, fields),
+                    **pagination_meta(pagination),
+                }
+                return success_response(f'Advert tasks with {field} {group} fetched successfully.', 200, extra_data)
+            
+            group_totals = count_task_groups(field, 'advert')
+            
+            if len(group_totals) < 1:
                 return success_response('There are no advert tasks yet', 200)
             
-            msg = f'Advert tasks grouped by {field} fetched successfully.'
-            status_code = 200
-            extra_data = {
-                f'tasks_by_{field}': tasks_by_field,
-            }
+            tasks_by_field = iter_task_groups(field, 'advert', group_totals, per_group, fields)
+            return streamed_success_response(f'Advert tasks grouped by {field} fetched successfully.', 200, f'tasks_by_{field}', tasks_by_field)
+        except InvalidCursorError as e:
+            error = True
+            msg = f'{e}'
+            status_code = 400
         except ValueError as e:
             error = True
             msg = f'{e}'
@@ -603,18 +678,20 @@ class TaskController:
         error = False
         try:
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             tasks_per_page = int(Config.TASKS_PER_PAGE)
-            pagination = EngagementTask.query.filter_by(payment_status=TaskPaymentStatus.COMPLETE, status=TaskStatus.APPROVED) \
-                .order_by(EngagementTask.date_created.desc()) \
-                .paginate(page=page, per_page=tasks_per_page, error_out=False)
+            query = EngagementTask.query.filter_by(payment_status=TaskPaymentStatus.COMPLETE, status=TaskStatus.APPROVED) \
+                .options(*task_load_options(EngagementTask, fields))
+            pagination = paginate_query(query, EngagementTask.date_created, page, tasks_per_page)
             
             tasks = pagination.items
-            current_tasks = [task.to_dict() for task in tasks]
+            current_tasks = serialize_tasks(tasks, fields)
             extra_data = {
                 'total': pagination.total,
                 "engagement_tasks": current_tasks,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
+                **pagination_meta(pagination),
             }
             
             if not tasks:
@@ -623,6 +700,10 @@ class TaskController:
             msg = 'All Engagement Tasks fetched successfully'
             status_code = 200
             
+        except InvalidCursorError as e:
+            error = True
+            msg = f'{e}'
+            status_code = 400
         except Exception as e:
             error = True
             msg = 'Error getting all engagement tasks'
@@ -639,16 +720,31 @@ class TaskController:
         error = False
         
         try:
-            tasks_by_field = get_tasks_dict_grouped_by_field(field, 'engagement')
-            
-            if len(tasks_by_field) < 1:
+            fields = requested_fields()
+            per_group = max(1, min(request.args.get("per_group", int(Config.TASKS_PER_PAGE), type=int), 50))
+            
+            if 'group' in request.args:
+                # "load more" of a single group
+                group = request.args.get('group')
+                pagination = get_task_group_page(field, 'engagement', group, per_group, request.args.get('cursor'), fields)
+                extra_data = {
+                    'group': group,
+                    'tasks': serialize_tasks(pagination.items, fields),
+                    **pagination_meta(pagination),
+                }
+                return success_response(f'Engagement tasks with {field} {group} fetched successfully.', 200, extra_data)
+            
+            group_totals = count_task_groups(field, 'engagement')
+            
+            if len(group_totals) < 1:
                 return success_response('There are no Engagement tasks yet', 200)
             
-            msg = f'Engagement tasks grouped by {field} fetched successfully.'
-            status_code = 200
-            extra_data = {
-                f'tasks_by_{field}': tasks_by_field,
-            }
+            tasks_by_field = iter_task_groups(field, 'engagement', group_totals, per_group, fields)
+            return streamed_success_response(f'Engagement tasks grouped by {field} fetched successfully.', 200, f'tasks_by_{field}', tasks_by_field)
+        except InvalidCursorError as e:
+            error = True
+            msg = f'{e}'
+            status_code = 400
         except ValueError as e:
             error = True
             msg = f'{e}'
@@ -785,10 +881,8 @@ class TaskController:
     @staticmethod
     def get_task_metrics():
         try:
-            current_user_id = int(get_jwt_identity())
-            
             # Check if user exists
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             if user is None:
                 return error_response('User not found', 404)
             
@@ -1,12 +1,13 @@
 from flask import request
 from sqlalchemy.exc import ( DataError, DatabaseError, )
-from flask_jwt_extended import get_jwt_identity
 
 from config import Config
 from ...extensions import db
-from ...models import TaskOption, Trendit3User
+from ...models import TaskOption
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.basic_helpers import console_log, log_exception
+from ...utils.helpers.user_helpers import get_current_user
+from ...utils.serializers.records import serialize_task_options
 
 
 class TaskOptionsController:
@@ -14,9 +15,7 @@ class TaskOptionsController:
     @staticmethod
     def get_task_options():
         try:
-            user_id = int(get_jwt_identity())
-
-            current_user = Trendit3User.query.filter_by(id=user_id).first()
+            current_user = get_current_user()
             if not current_user:
                 return error_response("User not found", 404)
             
@@ -34,7 +33,7 @@ class TaskOptionsController:
             currency_code = user_wallet.currency_code
             
             extra_data = {
-                "options": [option.to_dict(user_type, currency_code) for option in task_options]
+                "options": serialize_task_options(task_options, user_type, currency_code)
             }
             
             api_response = success_response("Task options fetched successfully", 200, extra_data)
@@ -1,16 +1,24 @@
-from flask import request
+from flask import request, current_app
 from sqlalchemy import not_
 from flask_jwt_extended import get_jwt_identity
 from psycopg2.errors import StringDataRightTruncation
 
 from ...extensions import db
-from ...models import Trendit3User, Notification, NotificationType
+from ...models import Notification, NotificationType
 from ...models.task import TaskPerformance, Task, AdvertTask, EngagementTask
-from ...utils.helpers.task_helpers import update_performed_task, fetch_task, generate_random_task, initiate_task, fetch_performed_task
+from ...utils.helpers.task_helpers import update_performed_task, fetch_task, generate_random_task, generate_random_tasks, initiate_task, reserve_tasks, fetch_performed_task
 from ...utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.pagination_helpers import paginate_query, pagination_meta
+from ...exceptions import InvalidCursorError
 from ...utils.helpers.basic_helpers import console_log, log_exception
 from ...utils.helpers.telegram_bot import notify_telegram_admins_new_performed_task
-from ...exceptions import PendingTaskError, NoUnassignedTaskError
+from ...utils.helpers.user_helpers import get_current_user
+from ...utils.tasks.reservation import release_task_slot
+from ...utils.serializers.fields import requested_fields
+from ...utils.serializers.performances import performance_load_options, serialize_performances
+from ...exceptions import PendingTaskError, NoUnassignedTaskError, TaskSlotsFilledError, PrefetchLimitError
+
+MAX_TASK_DRAW_ATTEMPTS = 3 # times to draw a new task when the drawn one fills up before we claim it
 
 
 class TaskPerformanceController:
@@ -34,10 +42,15 @@ class TaskPerformanceController:
             task_type = data.get('task_type')
             filter_value = data.get('platform') or data.get('goal', '')
             
-            random_task = generate_random_task(task_type, filter_value)
-            
-            # Initiate task performance
-            initiated_task = initiate_task(random_task)
+            # Initiate task performance. If another earner fills up the drawn task first, draw again.
+            for attempt in range(MAX_TASK_DRAW_ATTEMPTS):
+                random_task = generate_random_task(task_type, filter_value)
+                try:
+                    initiated_task = initiate_task(random_task)
+                    break
+                except TaskSlotsFilledError:
+                    if attempt == MAX_TASK_DRAW_ATTEMPTS - 1:
+                        raise
             
             
             if initiated_task:
@@ -47,7 +60,7 @@ class TaskPerformanceController:
             extra_data = {'generated_task': initiated_task}
             
             api_response = success_response(msg, 200, extra_data)
-        except PendingTaskError as e:
+        except (PendingTaskError, PrefetchLimitError) as e:
             api_response = error_response(f'{e}', 409)
         except NoUnassignedTaskError as e:
             api_response = error_response(f'{e}', 206)
@@ -66,6 +79,77 @@ class TaskPerformanceController:
         return api_response
     
     
+    @staticmethod
+    def generate_tasks():
+        """Retrieves and reserves a batch of random tasks of the specified type and platform/goal.
+
+        The tasks are reserved for the user for a short while (`TASK_RESERVATION_TTL`),
+        so the client can keep a local queue of tasks. Reservations that aren't performed in time are released.
+
+        requests json data:
+            task_type (str): The type of tasks to retrieve ('advert' or 'engagement').
+            platform (str): The platform to filter tasks by.
+            goal (str): The goal to filter tasks by (for engagement tasks).
+            count (int): The number of tasks to retrieve.
+
+        Returns:
+            JSON: A JSON object containing the reserved tasks and when the reservations expire.
+        """
+        try:
+            data = request.get_json()
+            task_type = data.get('task_type')
+            filter_value = data.get('platform') or data.get('goal', '')
+            
+            try:
+                count = int(data.get('count', 5))
+            except (TypeError, ValueError):
+                return error_response("count must be a number", 400)
+            
+            prefetch_limit = current_app.config['TASK_PREFETCH_LIMIT']
+            if count < 1 or count > prefetch_limit:
+                return error_response(f"count must be between 1 and {prefetch_limit}", 400)
+            
+            # If other earners fill up some of the drawn tasks first, draw again for the rest.
+            # Tasks still held in reserve count towards the limit, which reserve_tasks enforces.
+            reserved_tasks = []
+            for attempt in range(MAX_TASK_DRAW_ATTEMPTS):
+                try:
+                    random_tasks = generate_random_tasks(task_type, filter_value, count=count - len(reserved_tasks))
+                    reserved_tasks += reserve_tasks(random_tasks, limit=prefetch_limit)
+                except PrefetchLimitError:
+                    if reserved_tasks:
+                        break # the limit was reached with this request's reservations
+                    raise
+                except NoUnassignedTaskError as e:
+                    if reserved_tasks:
+                        break # return the tasks reserved so far
+                    if not isinstance(e, TaskSlotsFilledError) or attempt == MAX_TASK_DRAW_ATTEMPTS - 1:
+                        raise
+                if len(reserved_tasks) >= count:
+                    break
+            
+            msg = f'{len(reserved_tasks)} {task_type.capitalize()} tasks for {filter_value} reserved successfully.'
+            extra_data = {
+                'generated_tasks': reserved_tasks,
+                'reservation_ttl': int(current_app.config['TASK_RESERVATION_TTL'].total_seconds()),
+            }
+            
+            api_response = success_response(msg, 200, extra_data)
+        except PendingTaskError as e:
+            api_response = error_response(f'{e}', 409)
+        except NoUnassignedTaskError as e:
+            api_response = error_response(f'{e}', 206)
+        except ValueError as e:
+            db.session.rollback()
+            api_response = error_response(f'{e}', 400)
+        except Exception as e:
+            db.session.rollback()
+            log_exception("An exception occurred generating random tasks for the user", e)
+            api_response = error_response(f'An error occurred generating random tasks: {e}', 500)
+        
+        return api_response
+    
+    
     @staticmethod
     def perform_task():
         try:
@@ -88,7 +172,7 @@ class TaskPerformanceController:
             console_log('current_user_id', current_user_id)
             
             # check if user has a performed task already done
-            performedTask = TaskPerformance.query.filter_by(user_id=current_user_id, task_id=task_id).filter(not_(TaskPerformance.status == 'pending')).first()
+            performedTask = TaskPerformance.query.filter_by(user_id=current_user_id, task_id=task_id).filter(TaskPerformance.status.notin_(('pending', 'reserved'))).first()
             
             console_log('performedTask', performedTask)
             
@@ -140,25 +224,27 @@ class TaskPerformanceController:
         try:
             current_user_id = int(get_jwt_identity())
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             per_page = 10
             
             # Check if user exists
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             if user is None:
                 return error_response('User not found', 404)
             
             # Fetch all performed tasks for current user
-            pagination = TaskPerformance.query.filter_by(user_id=current_user_id) \
-                .order_by(TaskPerformance.started_at.desc()) \
-                .paginate(page=page, per_page=per_page, error_out=False)
+            query = TaskPerformance.query.filter_by(user_id=current_user_id) \
+                .options(*performance_load_options(fields=fields))
+            pagination = paginate_query(query, TaskPerformance.started_at, page, per_page)
             
             performed_tasks = pagination.items
-            current_performed_tasks = [performed_task.to_dict() for performed_task in performed_tasks]
+            current_performed_tasks = serialize_performances(performed_tasks, fields=fields)
             extra_data = {
                 'total': pagination.total,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
                 "performed_tasks": current_performed_tasks,
+                **pagination_meta(pagination),
             }
             
             if not performed_tasks:
@@ -166,6 +252,8 @@ class TaskPerformanceController:
             
             msg = 'All performed tasks fetched successfully'
             api_response = success_response(msg, 200, extra_data)
+        except InvalidCursorError as e:
+            return error_response(f'{e}', 400)
         except Exception as e:
             log_exception("An exception occurred trying to get all performed tasks", e)
             return error_response("Error getting all performed tasks", 500)
@@ -180,10 +268,11 @@ class TaskPerformanceController:
             platform = request.args.get('platform', '')
             goal = request.args.get('goal', '')
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             tasks_per_page = int(6)
             
             # Check if user exists
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             if user is None:
                 return error_response('User not found', 404)
             
@@ -199,21 +288,22 @@ class TaskPerformanceController:
             if goal:
                 query = query.filter(task_model.goal == goal)
             
-            pagination = query.order_by(TaskPerformance.started_at.desc()) \
-                .paginate(page=page, per_page=tasks_per_page, error_out=False)
+            query = query.options(*performance_load_options(fields=fields))
+            pagination = paginate_query(query, TaskPerformance.started_at, page, tasks_per_page)
             
             console_log("pagination", pagination)
             
             performed_tasks = pagination.items
             console_log(f"{status} Task", performed_tasks)
             
-            current_performed_tasks = [performed_task.to_dict() for performed_task in performed_tasks]
+            current_performed_tasks = serialize_performances(performed_tasks, fields=fields)
             console_log("current_performed_tasks", current_performed_tasks)
             extra_data = {
                 'total': pagination.total,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
                 "performed_tasks": current_performed_tasks,
+                **pagination_meta(pagination),
             }
             
             if not performed_tasks:
@@ -221,6 +311,8 @@ class TaskPerformanceController:
             
             msg = f"All {status} Performed Tasks fetched successfully"
             api_response = success_response(msg, 200, extra_data)
+        except InvalidCursorError as e:
+            return error_response(f'{e}', 400)
         except Exception as e:
             msg = f"Error getting all {status} performed tasks"
             log_exception(f"An exception occurred trying to get all {status} performed tasks", e)
@@ -236,7 +328,7 @@ class TaskPerformanceController:
             current_user_id = int(get_jwt_identity())
             
             # Check if user exists
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             if user is None:
                 return error_response('User not found', 404)
             
@@ -267,7 +359,7 @@ class TaskPerformanceController:
             current_user_id = int(get_jwt_identity())
             
             # Check if user exists
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             if user is None:
                 return error_response('User not found', 404)
             
@@ -304,7 +396,7 @@ class TaskPerformanceController:
             current_user_id = int(get_jwt_identity())
             
             # Check if user exists
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             if user is None:
                 return error_response('User not found', 404)
             
@@ -316,6 +408,7 @@ class TaskPerformanceController:
             if performed_task.user_id != current_user_id:
                 return error_response('You are not authorized to update this performed task', 401)
             
+            release_task_slot(performed_task, 'cancelled')
             performed_task.delete()
             msg = 'Performed task deleted successfully'
             api_response = success_response(msg, 200)
@@ -334,7 +427,7 @@ class TaskPerformanceController:
             current_user_id = int(get_jwt_identity())
             
             # Check if user exists
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             if user is None:
                 return error_response('User not found', 404)
             
@@ -346,7 +439,8 @@ class TaskPerformanceController:
             if performed_task.user_id != current_user_id:
                 return error_response('You are not authorized to cancel this performed task', 401)
             
-            performed_task.update(status='cancelled')
+            release_task_slot(performed_task, 'cancelled')
+            db.session.commit()
             msg = 'Performed task canceled successfully'
             api_response = success_response(msg, 200)
         except Exception as e:
@@ -12,10 +12,15 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Image, Spacer
 from io import BytesIO
 
-from ...models import Trendit3User, Payment, Transaction, TransactionType
+from ...models import Payment, Transaction, TransactionType
 from ...utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.pagination_helpers import paginate_query, pagination_meta
+from ...exceptions import InvalidCursorError
 from ...utils.helpers.basic_helpers import console_log, log_exception
 from ...utils.helpers.payment_helpers import get_total_amount_earned, get_total_amount_spent
+from ...utils.helpers.user_helpers import get_current_user
+from ...utils.serializers.fields import requested_fields
+from ...utils.serializers.records import serialize_transactions, serialize_payments
 
 
 class TransactionController:
@@ -33,10 +38,11 @@ class TransactionController:
         try:
             current_user_id = int(get_jwt_identity())
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             per_page = 15
             
             # Check if user exists
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             if user is None:
                 return error_response('User not found', 404)
             
@@ -65,22 +71,24 @@ class TransactionController:
                     query = query.filter_by(transaction_type=transaction_types[transaction_type])
                 
             
-            pagination = query.order_by(Transaction.created_at.desc()) \
-                .paginate(page=page, per_page=per_page, error_out=False)
+            pagination = paginate_query(query, Transaction.created_at, page, per_page)
             
             transactions = pagination.items
-            current_transactions = [transaction.to_dict() for transaction in transactions]
+            current_transactions = serialize_transactions(transactions, fields, user.wallet.currency_code)
             extra_data = {
                 'total': pagination.total,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
                 "transactions_history": current_transactions,
+                **pagination_meta(pagination),
             }
             
             if not transactions:
                 return success_response(f'No transactions has been made', 200, extra_data)
             
             api_response = success_response('Transaction history fetched successfully', 200, extra_data)
+        except InvalidCursorError as e:
+            api_response = error_response(f'{e}', 400)
         except ValueError:
             log_exception("A ValueError occurred fetching transaction history")
             return error_response("Invalid user ID", 400)
@@ -108,28 +116,30 @@ class TransactionController:
             per_page = 15
             
             # Check if user exists
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             if user is None:
                 return error_response('User not found', 404)
             
             # Fetch transaction records from the database
-            pagination = Payment.query.filter_by(trendit3_user_id=current_user_id, payment_type='credit-wallet') \
-                .order_by(Payment.created_at.desc()) \
-                .paginate(page=page, per_page=per_page, error_out=False)
+            query = Payment.query.filter_by(trendit3_user_id=current_user_id, payment_type='credit-wallet')
+            pagination = paginate_query(query, Payment.created_at, page, per_page)
             
             wallet_credits = pagination.items
-            current_wallet_credit = [wallet_credit.to_dict() for wallet_credit in wallet_credits]
+            current_wallet_credit = serialize_payments(wallet_credits, user.wallet.currency_code)
             extra_data = {
                 'total': pagination.total,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
                 "funding_history": current_wallet_credit,
+                **pagination_meta(pagination),
             }
             
             if not wallet_credits:
                 return success_response(f'You have no history funding your wallet', 200, extra_data)
             
             api_response = success_response('Funding history fetched successfully', 200, extra_data)
+        except InvalidCursorError as e:
+            api_response = error_response(f'{e}', 400)
         except Exception as e:
             log_exception(f"An exception occurred fetching Funding history", e)
             api_response = error_response("An unexpected error occurred", 500)
@@ -144,7 +154,7 @@ class TransactionController:
             current_user_id = get_jwt_identity()
             
             # Check if user exists
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             if current_user is None:
                 return error_response('User not found', 404)
             
@@ -182,7 +192,7 @@ class TransactionController:
     def fetch_transactions(start_date=None, end_date=None):
         # Check if user exists
         user_id = int(get_jwt_identity())
-        user = Trendit3User.query.get(user_id)
+        user = get_current_user()
         if user is None:
             return None, 'User not found', 404
 
@@ -194,7 +204,7 @@ class TransactionController:
             query = query.filter(Transaction.created_at <= end_date)
 
         transactions = query.order_by(Transaction.created_at.desc()).all()
-        current_transactions = [transaction.to_dict() for transaction in transactions]
+        current_transactions = serialize_transactions(transactions, currency_code=user.wallet.currency_code)
 
         if not transactions:
             return None, 'No transactions found for the specified date range', 200
@@ -6,6 +6,8 @@ from flask_jwt_extended import get_jwt_identity
 from ...extensions import db
 from ...utils.helpers import log_exception, console_log
 from ...utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.pagination_helpers import paginate_query, pagination_meta
+from ...exceptions import InvalidCursorError
 from ...utils.helpers.mail_helpers import send_social_profile_status_email
 from ...models import SocialLinkStatus, SocialLinks, SocialMediaProfile
 from ...models.notification import SocialVerification, SocialVerificationStatus, Notification, NotificationType
@@ -20,7 +22,8 @@ class AdminSocialProfileController:
             try:
                 page = request.args.get("page", 1, type=int)
                 items_per_page = int("10")
-                pagination = SocialMediaProfile.query.order_by(SocialMediaProfile.trendit3_user_id.desc()).paginate(page=page, per_page=items_per_page, error_out=False)
+                query = SocialMediaProfile.query
+                pagination = paginate_query(query, SocialMediaProfile.trendit3_user_id, page, items_per_page, estimate_total=True)
                 
                 profiles = pagination.items
                 current_items = [profile.to_dict() for profile in profiles]
@@ -30,9 +33,12 @@ class AdminSocialProfileController:
                     "all_profiles": current_items,
                     "current_page": pagination.page,
                     "total_pages": pagination.pages,
+                    **pagination_meta(pagination),
                 }
                 
                 api_response = success_response('Social media profiles fetched successfully', 200, extra_data)
+            except InvalidCursorError as e:
+                api_response = error_response(f'{e}', 400)
             except (DataError, DatabaseError) as e:
                 db.session.rollback()
                 log_exception('Database error:', e)
@@ -137,18 +143,22 @@ class AdminSocialProfileController:
                 page = request.args.get('page', default=1, type=int)
                 per_page = request.args.get('per_page', default=20, type=int)
                 
-                social_verification_requests = SocialVerification.query.order_by(SocialVerification.createdAt.desc()).paginate(page=page, per_page=per_page, error_out=False)
+                query = SocialVerification.query
+                social_verification_requests = paginate_query(query, SocialVerification.createdAt, page, per_page)
                 social_verification_list = [social_verification.to_dict() for social_verification in social_verification_requests.items]
                 
                 extra_data = {
                     'total': social_verification_requests.total,
                     'pages': social_verification_requests.pages,
                     'current_page': social_verification_requests.page,
-                    'social_verification_requests': social_verification_list
+                    'social_verification_requests': social_verification_list,
+                    **pagination_meta(social_verification_requests),
                 }
     
                 return success_response('All social verification requests fetched successfully', 200, extra_data)
             
+            except InvalidCursorError as e:
+                return error_response(f'{e}', 400)
             except Exception as e:
                 logging.exception("An exception occurred trying to get all social verification requests:\n", str(e))
                 return error_response('Error getting all social verification requests', 500)
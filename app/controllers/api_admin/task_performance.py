@@ -8,6 +8,9 @@ from ...utils.helpers.mail_helpers import send_task_performance_email
 from ...utils.helpers.basic_helpers import log_exception, console_log
 from ...utils.helpers.task_helpers import update_performed_task, fetch_performed_task
 from ...utils.payments.wallet import credit_wallet
+from ...utils.tasks.reservation import release_task_slot
+from ...utils.serializers.fields import requested_fields
+from ...utils.serializers.performances import performance_load_options, serialize_performances
 from ...utils.helpers.response_helpers import error_response, success_response
 
 
@@ -17,8 +20,9 @@ class AdminTaskPerformanceController:
         error = False
         
         try:
-            performed_tasks = TaskPerformance.query.all()
-            pt_dict = [pt.to_dict() for pt in performed_tasks]
+            fields = requested_fields()
+            performed_tasks = TaskPerformance.query.options(*performance_load_options(fields=fields)).all()
+            pt_dict = serialize_performances(performed_tasks, fields=fields)
             msg = 'All Performed Tasks fetched successfully'
             status_code = 200
             extra_data = {
@@ -106,6 +110,7 @@ class AdminTaskPerformanceController:
             if performed_task is None:
                 return error_response('Performed task not found', 404)
             
+            release_task_slot(performed_task, 'cancelled')
             performed_task.delete()
             msg = 'Performed task deleted successfully'
             status_code = 200
@@ -1,16 +1,22 @@
 import logging
 from flask import request
-from flask_jwt_extended import get_jwt_identity
 from sqlalchemy.exc import ( DataError, DatabaseError, )
 
 from app.extensions import db
 from app.models.task import TaskPerformance, Task, AdvertTask, EngagementTask, TaskPaymentStatus, TaskStatus
 from ...utils.helpers.task_helpers import fetch_task, fetch_performed_task
 from app.utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.pagination_helpers import paginate_query, is_past_last_page, pagination_meta
+from ...exceptions import InvalidCursorError
 from app.utils.helpers.basic_helpers import console_log, log_exception
 from app.models.user import Trendit3User
 from ...utils.helpers.mail_helpers import send_other_emails
+from ...utils.helpers.user_helpers import get_current_user
 from ...utils.payments.wallet import credit_wallet, refund_to_wallet
+from ...utils.tasks.reservation import release_task_slot
+from ...utils.serializers.fields import requested_fields
+from ...utils.serializers.tasks import task_load_options, serialize_tasks
+from ...utils.serializers.performances import performance_load_options, serialize_performances
 
 
 class AdminTaskController:
@@ -18,22 +24,27 @@ class AdminTaskController:
     def get_all_tasks():
         try:
             page = request.args.get('page', 1, type=int)
+            fields = requested_fields()
             per_page = request.args.get('per_page', 15, type=int)
             
-            tasks = Task.query.order_by(Task.date_created.desc()).paginate(page=page, per_page=per_page, error_out=False)
+            query = Task.query.options(*task_load_options(Task, fields))
+            tasks = paginate_query(query, Task.date_created, page, per_page, estimate_total=True)
             
-            if page > tasks.pages:
+            if is_past_last_page(tasks):
                 return success_response('No content', 204, {'tasks': []})
             
-            task_list = [task.to_dict() for task in tasks.items]
+            task_list = serialize_tasks(tasks.items, fields)
             
             extra_data = {
                 'total': tasks.total,
                 'pages': tasks.pages,
-                'tasks': task_list
+                'tasks': task_list,
+                **pagination_meta(tasks),
             }
 
             return success_response('All tasks fetched successfully', 200, extra_data)
+        except InvalidCursorError as e:
+            return error_response(f'{e}', 400)
         except Exception as e:
             logging.exception("An exception occurred trying to get all tasks:\n", str(e))
             return error_response('Error getting all tasks', 500)
@@ -42,22 +53,27 @@ class AdminTaskController:
     def get_all_failed_tasks():
         try:
             page = request.args.get('page', 1, type=int)
+            fields = requested_fields()
             per_page = request.args.get('per_page', 15, type=int)
             
-            tasks = Task.query.filter_by(status=TaskStatus.DECLINED).paginate(page=page, per_page=per_page, error_out=False)
+            query = Task.query.filter_by(status=TaskStatus.DECLINED).options(*task_load_options(Task, fields))
+            tasks = paginate_query(query, Task.date_created, page, per_page, estimate_total=True)
             
-            if page > tasks.pages:
+            if is_past_last_page(tasks):
                 return success_response('No content', 204, {'tasks': []})
             
-            task_list = [task.to_dict() for task in tasks.items]
+            task_list = serialize_tasks(tasks.items, fields)
             
             extra_data = {
                 'total': tasks.total,
                 'pages': tasks.pages,
-                'tasks': task_list
+                'tasks': task_list,
+                **pagination_meta(tasks),
             }
 
             return success_response('All failed tasks fetched successfully', 200, extra_data)
+        except InvalidCursorError as e:
+            return error_response(f'{e}', 400)
         except Exception as e:
             logging.exception("An exception occurred trying to get all failed tasks:\n", str(e))
             return error_response('Error getting all failed tasks', 500)
@@ -67,22 +83,27 @@ class AdminTaskController:
     def get_all_approved_tasks():
         try:
             page = request.args.get('page', 1, type=int)
+            fields = requested_fields()
             per_page = request.args.get('per_page', 15, type=int)
             
-            tasks = Task.query.filter_by(status=TaskStatus.APPROVED).paginate(page=page, per_page=per_page, error_out=False)
+            query = Task.query.filter_by(status=TaskStatus.APPROVED).options(*task_load_options(Task, fields))
+            tasks = paginate_query(query, Task.date_created, page, per_page, estimate_total=True)
             
-            if page > tasks.pages:
+            if is_past_last_page(tasks):
                 return success_response('No content', 204, {'tasks': []})
             
-            task_list = [task.to_dict() for task in tasks.items]
+            task_list = serialize_tasks(tasks.items, fields)
             
             extra_data = {
                 'total': tasks.total,
                 'pages': tasks.pages,
-                'tasks': task_list
+                'tasks': task_list,
+                **pagination_meta(tasks),
             }
 
             return success_response('All approved tasks fetched successfully', 200, extra_data)
+        except InvalidCursorError as e:
+            return error_response(f'{e}', 400)
         except Exception as e:
             logging.exception("An exception occurred trying to get all approved tasks:\n", str(e))
             return error_response('Error getting all approved tasks', 500)
@@ -92,22 +113,27 @@ class AdminTaskController:
     def get_all_pending_tasks():
         try:
             page = request.args.get('page', 1, type=int)
+            fields = requested_fields()
             per_page = request.args.get('per_page', 15, type=int)
             
-            tasks = Task.query.filter_by(status=TaskStatus.PENDING).paginate(page=page, per_page=per_page, error_out=False)
+            query = Task.query.filter_by(status=TaskStatus.PENDING).options(*task_load_options(Task, fields))
+            tasks = paginate_query(query, Task.date_created, page, per_page, estimate_total=True)
             
-            if page > tasks.pages:
+            if is_past_last_page(tasks):
                 return success_response('No content', 204, {'tasks': []})
             
-            task_list = [task.to_dict() for task in tasks.items]
+            task_list = serialize_tasks(tasks.items, fields)
             
             extra_data = {
                 'total': tasks.total,
                 'pages': tasks.pages,
-                'tasks': task_list
+                'tasks': task_list,
+                **pagination_meta(tasks),
             }
 
             return success_response('All pending tasks fetched successfully', 200, extra_data)
+        except InvalidCursorError as e:
+            return error_response(f'{e}', 400)
         except Exception as e:
             logging.exception("An exception occurred trying to get all pending tasks:\n", str(e))
             return error_response('Error getting all pending tasks', 500)
@@ -190,25 +216,28 @@ class AdminTaskController:
     @staticmethod
     def get_task_performances(task_id_key):
         try:
-            
             task = fetch_task(task_id_key)
             if not task:
                 return error_response("Task not found", 404)
             
             
             page = request.args.get("page", 1, type=int)
+            
+            
+            fields = requested_fields()
             per_page = 5
-            pagination = TaskPerformance.query.filter_by(task_id=task.id) \
-                .order_by(TaskPerformance.started_at.desc()) \
-                .paginate(page=page, per_page=per_page, error_out=False)
+            query = TaskPerformance.query.filter_by(task_id=task.id) \
+                .options(*performance_load_options(fields=fields))
+            pagination = paginate_query(query, TaskPerformance.started_at, page, per_page)
             
             task_performances = pagination.items
-            current_task_performances = [task_performance.to_dict() for task_performance in task_performances]
+            current_task_performances = serialize_performances(task_performances, fields=fields)
             extra_data = {
                 'total': pagination.total,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
                 "task_performances": current_task_performances,
+                **pagination_meta(pagination),
             }
             
             if not task_performances:
@@ -216,6 +245,8 @@ class AdminTaskController:
             
             api_response = success_response("Task performances fetched successfully", 200, extra_data)
         
+        except InvalidCursorError as e:
+            api_response = error_response(f'{e}', 400)
         except Exception as e:
             api_response = error_response("An unexpected error occurred. Our developers are looking into this.", 500)
             log_exception("An exception occurred trying to get task:", e)
@@ -226,8 +257,7 @@ class AdminTaskController:
     @staticmethod
     def verify_performed_task():
         try:
-            current_user_id = int(get_jwt_identity())
-            current_user = Trendit3User.query.get(current_user_id)
+            current_user = get_current_user()
             
             if not current_user:
                 return error_response(f"user not found", 404)
@@ -249,7 +279,8 @@ class AdminTaskController:
             
             status_val = "completed" if status == "accept" else "rejected"
             
-            performed_task.update(status=status_val)
+            release_task_slot(performed_task, status_val) # a rejection gives the slot back to the task
+            db.session.commit()
             
             if status_val == "completed":
                 user_id = performed_task.user_id
@@ -6,6 +6,8 @@ from flask_jwt_extended import get_jwt_identity
 from ...extensions import db
 from ...utils.helpers.telegram_bot import notify_telegram_admins_new_profile
 from ...utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.pagination_helpers import paginate_query, pagination_meta
+from ...exceptions import InvalidCursorError
 from ...models.notification import SocialVerification, SocialVerificationStatus, Notification, MessageType
 from ...models.social import SocialLinks, SocialLinkStatus, SocialMediaProfile
 from ...models.user import Trendit3User
@@ -23,8 +25,8 @@ class TelegramController:
             per_page = 15
             social_profiles = SocialMediaProfile.query.all()
             
-            pagination = SocialMediaProfile.query.filter_by(status=SocialLinkStatus.PENDING) \
-                .paginate(page=page, per_page=per_page, error_out=False)
+            query = SocialMediaProfile.query.filter_by(status=SocialLinkStatus.PENDING)
+            pagination = paginate_query(query, SocialMediaProfile.id, page, per_page)
             
             social_profiles = pagination.items
             
@@ -42,10 +44,13 @@ class TelegramController:
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
                 "transactions_history": current_social_profiles,
+                **pagination_meta(pagination),
             }
             
             
             api_response = success_response('Pending social media profiles fetched successfully', 200, extra_data)
+        except InvalidCursorError as e:
+            api_response = error_response(f'{e}', 400)
         except (DataError, DatabaseError) as e:
             db.session.rollback()
             log_exception('Database error:', e)
@@ -4,8 +4,11 @@ from flask_jwt_extended import get_jwt_identity
 
 from app.extensions import db
 from app.utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.pagination_helpers import paginate_query, pagination_meta
+from ...exceptions import InvalidCursorError
 from app.utils.helpers.basic_helpers import generate_random_string, console_log
 from app.models.payment import Transaction, TransactionType
+from app.utils.serializers.records import transaction_load_options, serialize_transactions
 from app.models.user import Trendit3User
 from ...utils.helpers.mail_helpers import send_other_emails
 
@@ -20,18 +23,22 @@ class TransactionController:
             page = request.args.get('page', default=1, type=int)
             per_page = request.args.get('per_page', default=20, type=int)
             
-            transactions = Transaction.query.order_by(Transaction.created_at.desc()).paginate(page=page, per_page=per_page, error_out=False)
-            transaction_list = [transaction.to_dict() for transaction in transactions.items]
+            query = Transaction.query.options(*transaction_load_options())
+            transactions = paginate_query(query, Transaction.created_at, page, per_page, estimate_total=True)
+            transaction_list = serialize_transactions(transactions.items)
             
             extra_data = {
                 'total': transactions.total,
                 'pages': transactions.pages,
                 'current_page': transactions.page,
-                'transactions': transaction_list
+                'transactions': transaction_list,
+                **pagination_meta(transactions),
             }
 
             return success_response('All transactions fetched successfully', 200, extra_data)
         
+        except InvalidCursorError as e:
+            return error_response(f'{e}', 400)
         except Exception as e:
             logging.exception("An exception occurred trying to get all transactions:\n", str(e))
             return error_response('Error getting all tasks', 500)
@@ -46,18 +53,22 @@ class TransactionController:
             page = request.args.get('page', default=1, type=int)
             per_page = request.args.get('per_page', default=20, type=int)
             
-            transactions = Transaction.query.filter_by(id=user_id).order_by(Transaction.created_at.desc()).paginate(page=page, per_page=per_page, error_out=False)
-            transaction_list = [transaction.to_dict() for transaction in transactions.items]
+            query = Transaction.query.filter_by(id=user_id).options(*transaction_load_options())
+            transactions = paginate_query(query, Transaction.created_at, page, per_page)
+            transaction_list = serialize_transactions(transactions.items)
             
             extra_data = {
-            'total': transactions.total,
-            'pages': transactions.pages,
-            'current_page': transactions.page,
-            'transactions': transaction_list
+                'total': transactions.total,
+                'pages': transactions.pages,
+                'current_page': transactions.page,
+                'transactions': transaction_list,
+                **pagination_meta(transactions),
             }
 
             return success_response('User transactions fetched successfully', 200, extra_data)
         
+        except InvalidCursorError as e:
+            return error_response(f'{e}', 400)
         except Exception as e:
             logging.exception("An exception occurred trying to get user transactions:\n", str(e))
             return error_response('Error getting user transactions', 500)
@@ -80,18 +91,22 @@ class TransactionController:
             page = request.args.get('page', default=1, type=int)
             per_page = request.args.get('per_page', default=20, type=int)
             
-            transactions = Transaction.query.filter_by(id=user_id, transaction_type=transaction_map[transaction_type]).order_by(Transaction.created_at.desc()).paginate(page=page, per_page=per_page, error_out=False)
-            transaction_list = [transaction.to_dict() for transaction in transactions.items]
+            query = Transaction.query.filter_by(id=user_id, transaction_type=transaction_map[transaction_type]).options(*transaction_load_options())
+            transactions = paginate_query(query, Transaction.created_at, page, per_page)
+            transaction_list = serialize_transactions(transactions.items)
             
             extra_data = {
                 'total': transactions.total,
                 'pages': transactions.pages,
                 'current_page': transactions.page,
-                'transactions': transaction_list
+                'transactions': transaction_list,
+                **pagination_meta(transactions),
             }
 
             return success_response('User transactions fetched successfully', 200, extra_data)
         
+        except InvalidCursorError as e:
+            return error_response(f'{e}', 400)
         except Exception as e:
             logging.exception("An exception occurred trying to get user transactions by type:\n", str(e))
             return error_response('Error getting user transactions', 500)
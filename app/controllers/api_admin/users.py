@@ -5,7 +5,10 @@ from flask_jwt_extended import get_jwt_identity
 from app.extensions import db
 from app.models.user import TempUser, Trendit3User
 from app.utils.helpers.response_helpers import error_response, success_response
+from app.utils.helpers.pagination_helpers import paginate_query, is_past_last_page, pagination_meta
+from app.exceptions import InvalidCursorError
 from app.utils.helpers.basic_helpers import generate_random_string, console_log
+from app.utils.serializers.users import USER_VIEWS, user_load_options, serialize_users
 
 
 class AdminUsersController:
@@ -14,22 +17,30 @@ class AdminUsersController:
         try:
             page = request.args.get('page', default=1, type=int)
             per_page = request.args.get('per_page', default=10, type=int)
+            view = request.args.get('view', default='full', type=str)
             
-            users = Trendit3User.query.paginate(page=page, per_page=per_page, error_out=False)
+            if view not in USER_VIEWS:
+                return error_response(f"view must be one of {', '.join(USER_VIEWS)}", 400)
             
-            if page > users.pages:
+            query = Trendit3User.query.options(*user_load_options(view))
+            users = paginate_query(query, Trendit3User.date_joined, page, per_page, estimate_total=True)
+            
+            if is_past_last_page(users):
                 return success_response('No content', 204, {'users': []})
             
-            user_list = [user.to_dict() for user in users.items]
+            user_list = serialize_users(users.items, view)
             
             extra_data = {
                 'total': users.total,
                 'pages': users.pages,
-                'users': user_list
+                'users': user_list,
+                **pagination_meta(users),
             }
 
             return success_response('All users fetched successfully', 200, extra_data)
         
+        except InvalidCursorError as e:
+            return error_response(f'{e}', 400)
         except Exception as e:
             logging.exception("An exception occurred trying to get all users:\n", str(e))
             return error_response('Error getting all users', 500)
@@ -5,6 +5,8 @@ from flask_jwt_extended import get_jwt_identity
 from ...extensions import db
 from ...utils.helpers.telegram_bot import notify_telegram_admins_new_profile
 from ...utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.pagination_helpers import paginate_query, pagination_meta
+from ...exceptions import InvalidCursorError
 from ...models.social import SocialLinks, SocialLinkStatus, SocialMediaProfile
 from ...models.user import Trendit3User
 from ...utils.helpers.basic_helpers import log_exception, console_log
@@ -19,8 +21,8 @@ class SocialProfilesTelegramController:
             page = request.args.get("page", 1, type=int)
             per_page = 15
             
-            pagination = SocialMediaProfile.query.filter_by(status=SocialLinkStatus.PENDING) \
-                .paginate(page=page, per_page=per_page, error_out=False)
+            query = SocialMediaProfile.query.filter_by(status=SocialLinkStatus.PENDING)
+            pagination = paginate_query(query, SocialMediaProfile.id, page, per_page)
             
             social_profiles = pagination.items
             
@@ -38,10 +40,13 @@ class SocialProfilesTelegramController:
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
                 "pending_social_profiles": current_social_profiles,
+                **pagination_meta(pagination),
             }
             
             
             api_response = success_response('Pending social media profiles fetched successfully', 200, extra_data)
+        except InvalidCursorError as e:
+            api_response = error_response(f'{e}', 400)
         except (DataError, DatabaseError) as e:
             db.session.rollback()
             log_exception('Database error:', e)
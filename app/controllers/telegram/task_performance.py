@@ -4,8 +4,12 @@ from sqlalchemy.exc import ( DataError, DatabaseError, SQLAlchemyError )
 from ...extensions import db
 from ...utils.helpers.telegram_bot import notify_telegram_admins_new_task
 from ...utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.pagination_helpers import paginate_query, is_past_last_page, pagination_meta
+from ...exceptions import InvalidCursorError
 from ...models.task import Task, TaskStatus
 from ...utils.helpers.basic_helpers import log_exception, console_log
+from ...utils.serializers.fields import requested_fields
+from ...utils.serializers.tasks import task_load_options, serialize_tasks
 
 
 class TaskPerformanceTelegramController:
@@ -14,11 +18,13 @@ class TaskPerformanceTelegramController:
     def get_pending_tasks():
         try:
             page = request.args.get("page", 1, type=int)
+            fields = requested_fields()
             per_page = request.args.get('per_page', 6, type=int)
             
-            pagination = Task.query.filter_by(status=TaskStatus.PENDING).paginate(page=page, per_page=per_page, error_out=False)
+            query = Task.query.filter_by(status=TaskStatus.PENDING).options(*task_load_options(Task, fields))
+            pagination = paginate_query(query, Task.date_created, page, per_page)
             
-            if page > pagination.pages:
+            if is_past_last_page(pagination):
                 return success_response('No content', 204, {'tasks': []})
             
             tasks = pagination.items
@@ -30,17 +36,20 @@ class TaskPerformanceTelegramController:
             for task in  tasks:
                 notify_telegram_admins_new_task(task)
             
-            current_tasks = [task.to_dict() for task in tasks]
+            current_tasks = serialize_tasks(tasks, fields)
             
             extra_data = {
                 'total': pagination.total,
                 "current_page": pagination.page,
                 "total_pages": pagination.pages,
                 "pending_tasks": current_tasks,
+                **pagination_meta(pagination),
             }
             
             
             api_response = success_response('Pending task orders fetched successfully', 200, extra_data)
+        except InvalidCursorError as e:
+            api_response = error_response(f'{e}', 400)
         except (DataError, DatabaseError) as e:
             db.session.rollback()
             log_exception('Database error:', e)
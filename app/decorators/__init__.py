@@ -6,4 +6,6 @@ This package contains the decorators for the Trendit³ Flask application.
 @package: Trendit³
 """
 from .auth import roles_required
-from .membership import membership_required
\ No newline at end of file
+from .membership import membership_required
+from .etag import etag
+from .cache import cached_response
@@ -10,10 +10,10 @@ If the user does not have the required roles, it returns a 403 error.
 @package: Trendit³
 '''
 from functools import wraps
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 
-from app.models import Trendit3User
 from app.utils.helpers.response_helpers import error_response
+from app.utils.helpers.user_helpers import get_current_user
 
 def roles_required(*required_roles):
     """
@@ -35,8 +35,7 @@ def roles_required(*required_roles):
         @wraps(fn)
         @jwt_required()
         def wrapper(*args, **kwargs):
-            current_user_id = get_jwt_identity()
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             
             if user and any(role.name.value in required_roles for role in user.roles):
                 return fn(*args, **kwargs)
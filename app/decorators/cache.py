@@ -0,0 +1,80 @@
+'''
+This module defines the `cached_response` decorator for the Trendit³ Flask application.
+
+Used for serving hot, user-independent listings (like the public task catalog)
+straight from Redis. A cached response is keyed by the endpoint, its URL
+parameters and query string (filters, page, cursor, fields), and the version
+counters of the resources it is built from (see `version_helpers`). Bumping a
+version therefore invalidates every cached page built from it, and a cache hit
+never reaches the view or the database.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import hashlib, json
+from functools import wraps
+from flask import request, current_app, make_response
+from redis.exceptions import RedisError
+
+from app.extensions import redis_client
+from app.utils.helpers.basic_helpers import log_exception
+from app.utils.helpers.version_helpers import get_versions, version_key
+
+
+RESPONSE_CACHE_PREFIX = "response_cache"
+
+
+def _response_cache_key(namespaces) -> str:
+    versions = get_versions([version_key(namespace) for namespace in namespaces])
+    params = [
+        request.endpoint,
+        sorted((request.view_args or {}).items()),
+        sorted(request.args.items(multi=True)),
+        versions,
+    ]
+    digest = hashlib.sha1(json.dumps(params, default=str).encode()).hexdigest()
+    return f"{RESPONSE_CACHE_PREFIX}:{request.endpoint}:{digest}"
+
+
+def cached_response(*namespaces, ttl: int | None = None):
+    """
+    Decorator to serve GET responses from a Redis read-through cache.
+
+    Only use it on views whose response is the same for every user.
+    Only 200 responses are cached.
+
+    Args:
+        *namespaces (str): The resource namespaces the response is built from (e.g. `TASK_LISTINGS`).
+        ttl (int, optional): Seconds a cached response is kept. Defaults to `RESPONSE_CACHE_TTL`.
+
+    Returns:
+        function: The decorated function.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return fn(*args, **kwargs)
+
+            try:
+                key = _response_cache_key(namespaces)
+                cached = redis_client.get(key)
+            except RedisError as e:
+                log_exception("Unable to read cached response", e)
+                return fn(*args, **kwargs)
+
+            if cached is not None:
+                cached = json.loads(cached)
+                return make_response(cached['body'], 200, {'Content-Type': cached['content_type']})
+
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code == 200 and not response.direct_passthrough and not response.is_streamed:
+                payload = json.dumps({'body': response.get_data(as_text=True), 'content_type': response.content_type})
+                try:
+                    redis_client.set(key, payload, ex=ttl or current_app.config['RESPONSE_CACHE_TTL'])
+                except RedisError as e:
+                    log_exception("Unable to cache response", e)
+            return response
+        return wrapper
+    return decorator
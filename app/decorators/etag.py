@@ -0,0 +1,73 @@
+'''
+This module defines the `etag` decorator for the Trendit³ Flask application.
+
+Used for answering conditional GET requests.
+The `etag` decorator tags responses with a weak ETag derived from the version
+counters of the resources they are built from (see `version_helpers`), the
+request URL, for per-user resources, the user and, for responses with converted
+amounts, the exchange rates they were converted with. When the client's
+If-None-Match still matches, a 304 is returned before the view runs, so
+unchanged data is neither re-queried nor re-serialized.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import hashlib, json
+from functools import wraps
+from flask import request
+from flask_jwt_extended import get_jwt_identity
+from redis.exceptions import RedisError
+
+from app.utils.helpers.basic_helpers import log_exception
+from app.utils.helpers.response_helpers import not_modified_response
+from app.utils.helpers.version_helpers import USER, get_versions, version_key
+from app.utils.payments.rates import exchange_rates_version
+
+def etag(*namespaces, per_user=False, exchange_rates=False):
+    """
+    Decorator to serve conditional GET requests from resource version counters.
+
+    Must be placed below `jwt_required` when `per_user` is set.
+
+    Args:
+        *namespaces (str): The resource namespaces the response is built from (e.g. `TASK_CATALOG`).
+        per_user (bool): Whether the response also depends on the current user's own records.
+        exchange_rates (bool): Whether the response has amounts converted to the user's currency.
+
+    Returns:
+        function: The decorated function.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return fn(*args, **kwargs)
+            
+            user_id = get_jwt_identity() if per_user else None
+            keys = [version_key(namespace) for namespace in namespaces]
+            if per_user:
+                keys.append(version_key(USER, user_id))
+            
+            try:
+                versions = get_versions(keys)
+            except RedisError as e:
+                log_exception("Unable to read resource versions", e)
+                return fn(*args, **kwargs)
+            
+            if exchange_rates:
+                versions.append(exchange_rates_version())
+            
+            tag = hashlib.sha1(json.dumps([request.full_path, user_id, versions]).encode()).hexdigest()
+            if request.if_none_match.contains_weak(tag):
+                return not_modified_response(tag)
+            
+            response = fn(*args, **kwargs)
+            if 200 <= response.status_code < 300:
+                response.set_etag(tag, weak=True)
+                response.headers['Cache-Control'] = 'private, no-cache' if per_user else 'no-cache'
+                if per_user:
+                    response.vary.add('Authorization')
+            return response
+        return wrapper
+    return decorator
@@ -10,10 +10,10 @@ If the user hasn't paid, it returns a 403 error.
 @package: Trendit³
 '''
 from functools import wraps
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 
-from app.models import Trendit3User
 from app.utils.helpers.response_helpers import error_response
+from app.utils.helpers.user_helpers import get_current_user
 
 def membership_required():
     """
@@ -29,8 +29,7 @@ def membership_required():
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            current_user_id = get_jwt_identity()
-            user = Trendit3User.query.get(current_user_id)
+            user = get_current_user()
             
             if user and user.membership.membership_fee_paid:
                 return fn(*args, **kwargs)
@@ -2,7 +2,7 @@
 This module defines custom exceptions for the Trendit³ Flask application.
 
 It includes exceptions for handling situations such as when a user still has a pending task, 
-when no unassigned task is found, and when a unique slug cannot be created.
+when no unassigned task is found, when a task's slots are filled, and when a unique slug cannot be created.
 
 Each exception is a class that inherits from the base `Exception` class and includes a message 
 that describes the error condition.
@@ -30,6 +30,22 @@ class NoUnassignedTaskError(Exception):
         self.message = message
 
 
+class TaskSlotsFilledError(NoUnassignedTaskError):
+    """Exception raised when every slot of a task has already been allocated to earners."""
+
+    def __init__(self, message="All slots for this task have been taken.", status_code=200):
+        super().__init__(message, status_code)
+
+
+class PrefetchLimitError(Exception):
+    """Exception raised when an earner already holds as many reserved tasks as allowed."""
+
+    def __init__(self, message="You already have too many tasks reserved. Perform or cancel them first.", status_code=409):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
 class UniqueSlugError(Exception):
     """
     Exception raised when a unique slug cannot be created.
@@ -60,4 +76,12 @@ class InvalidTwoFactorMethod(Exception):
     def __init__(self, message="Invalid 2FA method.", status_code=400):
         super().__init__(message)
         self.status_code = status_code
-        self.message = message
\ No newline at end of file
+        self.message = message
+
+class InvalidCursorError(ValueError):
+    """Exception raised when a pagination cursor is malformed or was tampered with."""
+
+    def __init__(self, message="Invalid cursor", status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
@@ -1,7 +1,7 @@
 '''
 This module initializes the extensions used in the Trendit³ Flask application.
 
-It sets up SQLAlchemy, Flask-Mail, and Celery with the configurations defined in the Config class.
+It sets up SQLAlchemy, Flask-Mail, the rate limiter and the Redis client with the configurations defined in the Config class.
 
 @author: Emmanuel Olowu
 @link: https://github.com/zeddyemy
@@ -11,7 +11,11 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_mail import Mail
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from redis import Redis
+
+from config import Config
 
 db = SQLAlchemy()
 mail = Mail()
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+limiter = Limiter(key_func=get_remote_address)
+redis_client = Redis.from_url(Config.REDIS_URL, decode_responses=True)
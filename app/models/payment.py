@@ -52,12 +52,12 @@ class Payment(db.Model):
         db.session.delete(self)
         db.session.commit()
     
-    def to_dict(self, user=False):
+    def to_dict(self, user=False, converted_amount=None):
         user_info = {'user': self.trendit3_user.to_dict()} if user else {'user_id': self.trendit3_user_id} # optionally include user info in dict
         return {
             'id': self.id,
             'key': self.key,
-            'amount': convert_amount(self.amount, self.currency_code),
+            'amount': converted_amount if converted_amount is not None else convert_amount(self.amount, self.currency_code),
             'payment_type': self.payment_type,
             'payment_method': self.payment_method,
             'status': self.status,
@@ -118,12 +118,12 @@ class Transaction(db.Model):
         db.session.delete(self)
         db.session.commit()
     
-    def to_dict(self, user=False):
+    def to_dict(self, user=False, converted_amount=None):
         user_info = {'user': self.trendit3_user.to_dict(),} if user else {'user_id': self.trendit3_user_id} # optionally include user info in dict
         return {
             'id': self.id,
             'key': self.key,
-            'amount': convert_amount(self.amount, self.currency_code),
+            'amount': converted_amount if converted_amount is not None else convert_amount(self.amount, self.currency_code),
             'transaction_type': str(self.transaction_type.value),
             'description': self.description,
             'status': self.status,
@@ -243,11 +243,11 @@ class Wallet(db.Model):
         db.session.commit()
 
 
-    def to_dict(self, user=False):
+    def to_dict(self, user=False, converted_balance=None):
         user_info = {'user': self.trendit3_user.to_dict(),} if user else {'user_id': self.trendit3_user_id} # optionally include user info in dict
         return {
             'id': self.id,
-            'balance': convert_amount(self.balance, self.currency_code),
+            'balance': converted_balance if converted_balance is not None else convert_amount(self.balance, self.currency_code),
             'currency_name': self.currency_name,
             'currency_code': self.currency_code,
             'currency_symbol': self.currency_symbol,
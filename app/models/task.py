@@ -53,13 +53,17 @@ class Task(db.Model):
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     total_allocated = db.Column(db.Integer, default=0, nullable=True)
-    total_success = db.Column(db.Integer, default=0, nullable=True)
+    total_success = db.Column(db.Integer, default=0, nullable=True) # completed performances
+    total_pending = db.Column(db.Integer, default=0, nullable=True)
+    total_in_review = db.Column(db.Integer, default=0, nullable=True)
+    total_rejected = db.Column(db.Integer, default=0, nullable=True)
+    total_timed_out = db.Column(db.Integer, default=0, nullable=True)
     
     authorization_url = db.Column(db.String(250), nullable=True, default="") # if payment for task is done with payment gateway
     payment_status = db.Column(db.Enum(TaskPaymentStatus), nullable=False)  # complete, pending, failed, abandoned
     status = db.Column(db.Enum(TaskStatus), default=TaskStatus.PENDING, nullable=False)  # approved, pending, declined
     
-    trendit3_user_id = db.Column(db.Integer, db.ForeignKey('trendit3_user.id'), nullable=False)
+    trendit3_user_id = db.Column(db.Integer, db.ForeignKey('trendit3_user.id'), nullable=False, index=True)
     trendit3_user = db.relationship('Trendit3User', backref=db.backref('tasks', lazy='dynamic'))
     
     media = db.relationship('Media', backref='task', lazy=True, cascade="all, delete-orphan", single_parent=True)
@@ -71,8 +75,8 @@ class Task(db.Model):
     
     @property
     def total_performances(self) -> int:
-        """Returns the total number times the task has been performed."""
-        return self.performances.count()
+        """Returns the total number times the task has been performed (excluding cancelled performances)."""
+        return sum(count or 0 for count in (self.total_pending, self.total_in_review, self.total_success, self.total_rejected, self.total_timed_out))
     
     @classmethod
     def create_task(cls, trendit3_user_id, task_type, platform, fee, fee_paid, payment_status, **kwargs):
@@ -114,7 +118,7 @@ class Task(db.Model):
     
     def to_dict(self):
         advert_task_dict = {}
-        advert_task = AdvertTask.query.get(self.id)
+        advert_task = self if isinstance(self, AdvertTask) else None
         if advert_task:
             advert_task_dict.update({
                 'posts_count': advert_task.posts_count,
@@ -123,7 +127,7 @@ class Task(db.Model):
             })
         
         engagement_task_dict = {}
-        engagement_task = EngagementTask.query.get(self.id)
+        engagement_task = self if isinstance(self, EngagementTask) else None
         if engagement_task:
             engagement_task_dict.update({
                 'goal': engagement_task.goal,
@@ -149,6 +153,10 @@ class Task(db.Model):
             'status': str(self.status.value),
             'total_allocated': self.total_allocated,
             'total_success': self.total_success,
+            'total_pending': self.total_pending,
+            'total_in_review': self.total_in_review,
+            'total_rejected': self.total_rejected,
+            'total_timed_out': self.total_timed_out,
             'date_created': self.date_created,
             'updated_at': self.updated_at,
             'creator': {
@@ -198,6 +206,10 @@ class AdvertTask(Task):
             'status': str(self.status.value),
             'total_allocated': self.total_allocated,
             'total_success': self.total_success,
+            'total_pending': self.total_pending,
+            'total_in_review': self.total_in_review,
+            'total_rejected': self.total_rejected,
+            'total_timed_out': self.total_timed_out,
             'posts_count': self.posts_count,
             'target_country': self.target_country,
             'target_state': self.target_state,
@@ -252,6 +264,10 @@ class EngagementTask(Task):
             'status': str(self.status.value),
             'total_allocated': self.total_allocated,
             'total_success': self.total_success,
+            'total_pending': self.total_pending,
+            'total_in_review': self.total_in_review,
+            'total_rejected': self.total_rejected,
+            'total_timed_out': self.total_timed_out,
             'goal': self.goal,
             'account_link': self.account_link,
             'engagements_count': self.engagements_count,
@@ -270,13 +286,19 @@ class EngagementTask(Task):
 
 
 class TaskPerformance(db.Model):
+    __table_args__ = (
+        db.Index('ix_task_performance_user_id_status', 'user_id', 'status'),
+        db.Index('ix_task_performance_status_started_at', 'status', 'started_at'),
+        db.Index('ix_task_performance_task_id_started_at', 'task_id', 'started_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     key = db.Column(db.String(120), unique=True, nullable=False, default=generate_random_string(20))
     task_type = db.Column(db.String(80), nullable=False)  # either 'advert' or 'engagement'
     reward_money = db.Column(db.Numeric(10, 2), nullable=True)
     account_name = db.Column(db.String(255), nullable=True)
     post_link = db.Column(db.String(255), nullable=True)
-    status = db.Column(db.String(80), default='pending') # pending, in_review, timed_out, cancelled, rejected or completed
+    status = db.Column(db.String(80), default='pending') # reserved, pending, in_review, timed_out, cancelled, rejected or completed
     started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     date_completed = db.Column(db.DateTime, nullable=True)
     
@@ -294,7 +316,7 @@ class TaskPerformance(db.Model):
         return f'<ID: {self.id}, User ID: {self.user_id}, Task ID: {self.task_id}, Task Type: {self.task_type}, Status: {self.status}>'
     
     @classmethod
-    def create_task_performance(cls, user_id, task_id, task_type, reward_money, proof_screenshot, account_name, post_link, status):
+    def create_task_performance(cls, user_id, task_id, task_type, reward_money, proof_screenshot, account_name, post_link, status, commit=True):
         the_task_key = f"{generate_random_string(20)}_pt"
         counter = 1
         max_attempts = 6  # maximum number of attempts to create a unique task_key
@@ -308,7 +330,9 @@ class TaskPerformance(db.Model):
         task = cls(user_id=user_id, task_id=task_id, key=the_task_key, task_type=task_type, reward_money=reward_money, proof_screenshot=proof_screenshot, account_name=account_name, post_link=post_link, status=status)
         
         db.session.add(task)
-        db.session.commit()
+        
+        if commit:
+            db.session.commit()
         
         return task
     
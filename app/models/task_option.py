@@ -32,12 +32,12 @@ class TaskOption(db.Model):
         db.session.delete(self)
         db.session.commit()
     
-    def to_dict(self, user_type, currency_code):
+    def to_dict(self, user_type, currency_code, converted_price=None):
         name = self.advertiser_name if user_type == "advertiser" else self.earner_name
         description = self.advertiser_description if user_type == "advertiser" else self.earner_description
         price = self.advertiser_price if user_type == "advertiser" else self.earner_price
         
-        amount = convert_amount(price, currency_code)
+        amount = converted_price if converted_price is not None else convert_amount(price, currency_code)
         
         return {
             "name": name,
@@ -1,12 +1,12 @@
 import logging, requests
 from flask import request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 
 from . import api
-from ...models import Trendit3User
 from ...utils.payments.flutterwave import get_banks, get_bank_code, flutterwave_verify_bank_account
 from ...utils.helpers.basic_helpers import log_exception, console_log
 from ...utils.helpers.response_helpers import error_response, success_response
+from ...utils.helpers.user_helpers import get_current_user
 
 
 @api.route("/banks", methods=['GET'])
@@ -19,8 +19,7 @@ def supported_banks():
         JSON response with a list of banks and their details.
     """
     try:
-        current_user_id = int(get_jwt_identity())
-        user = Trendit3User.query.get(current_user_id)
+        user = get_current_user()
         if user is None:
             return error_response('User not found', 404)
         
@@ -46,8 +45,7 @@ def supported_banks():
 def verify_bank_account():
     try:
         data = request.get_json()
-        current_user_id = get_jwt_identity()
-        current_user = Trendit3User.query.get(current_user_id)
+        current_user = get_current_user()
         if not current_user:
             return error_response(f"user not found", 404)
         
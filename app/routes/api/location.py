@@ -1,6 +1,7 @@
 from flask import request
 
 from . import api
+from app.utils.middleware import static_payload
 from app.controllers.api import LocationController
 
 
@@ -10,9 +11,11 @@ def get_countries():
 
 
 @api.route('/states', methods=['POST'])
+@static_payload
 def get_states():
     return LocationController.get_supported_country_states()
 
 @api.route('/states/lga', methods=['POST'])
+@static_payload
 def naija_states_lga():
     return LocationController.get_naija_state_lga()
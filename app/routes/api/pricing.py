@@ -1,6 +1,9 @@
 from . import api
 from app.controllers.api.pricing import PricingController
+from app.decorators import etag
+from app.utils.helpers.version_helpers import PRICING
 
 @api.route('/pricing', methods=['GET'])
+@etag(PRICING)
 def get_all_pricing():
     return PricingController.get_all_pricing()
@@ -2,10 +2,12 @@ from flask_jwt_extended import jwt_required
 
 from . import api
 from app.controllers.api import ProfileController
+from app.decorators import etag
 
 
 @api.route('/profile', methods=['GET'])
 @jwt_required()
+@etag(per_user=True, exchange_rates=True)
 def get_user_profile():
     return ProfileController.get_profile()
 
@@ -21,6 +23,7 @@ def update_profile():
 
 @api.route('/profile-pic', methods=['GET'])
 @jwt_required()
+@etag(per_user=True)
 def get_profile_pic():
     return ProfileController.get_profile_pic()
 
@@ -42,6 +45,7 @@ def verify_email_edit():
 # bank details
 @api.route("profile/bank", methods=['GET', 'POST'])
 @jwt_required()
+@etag(per_user=True)
 def bank_details():
     return ProfileController.bank_details()
 
@@ -49,5 +53,6 @@ def bank_details():
 # user membership status
 @api.route("profile/membership-status", methods=['GET', 'POST'])
 @jwt_required()
+@etag(per_user=True)
 def membership_status():
     return ProfileController.membership_status()
\ No newline at end of file
@@ -2,6 +2,7 @@ import logging
 from flask import request
 
 from . import api
+from app.utils.middleware import static_payload
 from app.utils.helpers.response_helpers import error_response, success_response
 
 # list of all practiced religions
@@ -64,6 +65,7 @@ religions = [
 
 # RELIGIONS ENDPOINTS
 @api.route("/religions", methods=['GET'])
+@static_payload
 def get_all_religion():
     """
     Get a list of all practiced religions.
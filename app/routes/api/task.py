@@ -3,7 +3,8 @@ from flask_jwt_extended import jwt_required
 
 from . import api
 from ...controllers.api import TaskController
-from ...decorators import roles_required
+from ...decorators import roles_required, etag, cached_response
+from ...utils.helpers.version_helpers import TASK_CATALOG, TASK_LISTINGS
 from ...utils.helpers.response_helpers import success_response
 
 # CREATE NEW TASK
@@ -14,14 +15,22 @@ def create_task():
 
 # ALL TASKS
 @api.route('/tasks', methods=['GET'])
+@etag(TASK_CATALOG)
 def get_all_tasks():
     return TaskController.get_tasks()
 
+@api.route('/tasks/feed', methods=['GET'])
+@jwt_required()
+def get_task_feed():
+    return TaskController.get_task_feed()
+
 @api.route('/tasks/counts/<field>', methods=['GET'])
+@etag(TASK_CATALOG)
 def get_all_aggregated_task_counts(field):
     return TaskController.get_all_aggregated_task_counts(field)
 
 @api.route('/tasks/<task_id_key>', methods=['GET'])
+@etag(TASK_CATALOG)
 def get_single_task(task_id_key):
     return TaskController.get_single_task(task_id_key)
 
@@ -47,8 +56,8 @@ def advertiser_delete_task(task_id_key):
 
 @api.route('/user/tasks/activities', methods=['GET'])
 @jwt_required()
-def get_advertisers_tasks_activities(task_id_key):
-    return TaskController.get_advertisers_tasks_activities(task_id_key)
+def get_advertisers_tasks_activities():
+    return TaskController.get_advertisers_tasks_activities()
 
 @api.route('/user/tasks/<task_id_key>/performances', methods=['GET'])
 @jwt_required()
@@ -76,31 +85,41 @@ def get_advertiser_advert_tasks():
 
 
 @api.route('/tasks/advert', methods=['GET'])
+@etag(TASK_CATALOG)
+@cached_response(TASK_LISTINGS)
 def get_all_advert_tasks():
     return TaskController.get_advert_tasks()
 
 @api.route('/tasks/advert/<platform>', methods=['GET'])
+@etag(TASK_CATALOG)
+@cached_response(TASK_LISTINGS)
 def get_advert_tasks_by_platform(platform):
     return TaskController.get_advert_tasks_by_platform(platform.lower())
 
 @api.route('/tasks/advert/grouped-by/<field>', methods=['GET'])
+@etag(TASK_CATALOG)
 def get_advert_tasks_grouped_by_field(field):
     return TaskController.get_advert_tasks_grouped_by_field(field)
 
 @api.route('/tasks/advert/counts/<field>', methods=['GET'])
+@etag(TASK_CATALOG)
 def get_advert_aggregated_task_counts(field):
     return TaskController.get_advert_aggregated_task_counts(field)
 
 # ENGAGEMENT TASKS
 @api.route('/tasks/engagement', methods=['GET'])
+@etag(TASK_CATALOG)
+@cached_response(TASK_LISTINGS)
 def get_all_engagement_tasks():
     return TaskController.get_engagement_tasks()
 
 @api.route('/tasks/engagement/grouped-by/<field>', methods=['GET'])
+@etag(TASK_CATALOG)
 def get_engagement_tasks_grouped_by_field(field):
     return TaskController.get_engagement_tasks_grouped_by_field(field)
 
 @api.route('/tasks/engagement/counts/<field>', methods=['GET'])
+@etag(TASK_CATALOG)
 def get_engagement_aggregated_task_counts(field):
     return TaskController.get_engagement_aggregated_task_counts(field)
 
@@ -3,10 +3,13 @@ from flask_jwt_extended import jwt_required
 
 from . import api
 from ...controllers.api import TaskOptionsController
+from ...decorators import etag
+from ...utils.helpers.version_helpers import TASK_OPTIONS
 from ...utils.helpers.response_helpers import success_response
 
 # CREATE NEW TASK
 @api.route('/task_options', methods=['GET'])
 @jwt_required()
+@etag(TASK_OPTIONS, per_user=True, exchange_rates=True)
 def get_task_options():
     return TaskOptionsController.get_task_options()
\ No newline at end of file
@@ -13,6 +13,13 @@ def generate_task():
     return TaskPerformanceController.generate_task()
 
 
+@api.route('/generate-tasks', methods=['POST'])
+@jwt_required()
+@membership_required()
+def generate_tasks():
+    return TaskPerformanceController.generate_tasks()
+
+
 @api.route('/perform-task', methods=['POST'])
 @jwt_required()
 @membership_required()
@@ -0,0 +1,180 @@
+'''
+This module defines helper functions for counting the rows of paginated lists in the Trendit³ Flask application.
+
+Page-number responses carry a `total`, which costs a COUNT(*) over the filtered
+list on every page. Totals come from one of three sources instead:
+
+* exact counts cached in Redis for `COUNT_CACHE_TTL` seconds. The cache key
+  includes a version per table, bumped after every commit that inserts,
+  updates or deletes rows of that table (bulk UPDATEs that bypass the ORM
+  queue it with `queue_count_invalidation`), so changes show up right away;
+* Postgres planner estimates (from EXPLAIN), for admin lists over whole tables
+  where an approximate total is good enough;
+* a fresh COUNT(*) when the request sends `?exact_total=1`.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import hashlib, json
+from flask import request
+from redis.exceptions import RedisError
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.sql.util import find_tables
+
+from config import Config
+from ...extensions import db, redis_client
+from .basic_helpers import log_exception
+
+
+COUNT_CACHE_PREFIX = "count_cache"
+COUNT_VERSION_PREFIX = "count_version"
+
+_PENDING_TABLES_KEY = "count_cache_invalidate"
+
+
+def wants_exact_total() -> bool:
+    """Whether the request asked for an exact total with `?exact_total=1`."""
+    return request.args.get('exact_total', '').lower() in ('1', 'true', 'yes')
+
+
+def _list_statement(query):
+    return query.order_by(None).enable_eagerloads(False).statement
+
+
+def _table_names(statement) -> list[str]:
+    return sorted({table.name for table in find_tables(statement, check_columns=True, include_joins=True)})
+
+
+def _cache_key(statement, tables: list[str]) -> str:
+    compiled = statement.compile(dialect=db.engine.dialect)
+    versions = redis_client.mget([f"{COUNT_VERSION_PREFIX}:{table}" for table in tables]) if tables else []
+    digest = hashlib.sha1(json.dumps([str(compiled), compiled.params, versions], default=str).encode()).hexdigest()
+    return f"{COUNT_CACHE_PREFIX}:{digest}"
+
+
+def exact_count(query, use_cache: bool = True) -> int:
+    """Counts the rows of a list query, reading and writing the Redis cache.
+
+    Args:
+        query: The list query. Its ORDER BY and eager loads are ignored.
+        use_cache (bool): False to skip reading the cache; the fresh count is still cached.
+    """
+    statement = _list_statement(query)
+    count_statement = select(func.count()).select_from(statement.subquery())
+
+    key = None
+    try:
+        key = _cache_key(statement, _table_names(statement))
+        if use_cache:
+            cached = redis_client.get(key)
+            if cached is not None:
+                return int(cached)
+    except RedisError as e:
+        log_exception("Unable to read cached count", e)
+
+    total = db.session.execute(count_statement).scalar() or 0
+
+    if key is not None:
+        try:
+            redis_client.set(key, total, ex=Config.COUNT_CACHE_TTL)
+        except RedisError as e:
+            log_exception("Unable to cache count", e)
+
+    return total
+
+
+def estimated_count(query) -> int | None:
+    """Returns the planner's row estimate for a list query, or None if it can't be had.
+
+    Only Postgres is supported. The statement is rendered with literal values,
+    since EXPLAIN takes the query as text.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        return None
+
+    try:
+        statement = _list_statement(query)
+        sql = str(statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+        plan = db.session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    except (SQLAlchemyError, LookupError, TypeError, ValueError) as e:
+        log_exception("Unable to estimate count", e)
+        return None
+
+
+def count_total(query, estimate: bool = False) -> tuple[int, bool]:
+    """Returns the total of a list query, and whether it is an estimate.
+
+    Args:
+        query: The list query.
+        estimate (bool): Whether a planner estimate is acceptable. Estimates
+            below `COUNT_ESTIMATE_THRESHOLD` are replaced by (cached) exact counts,
+            since small lists are cheap to count and estimates for them are poor.
+    """
+    if wants_exact_total():
+        return exact_count(query, use_cache=False), False
+
+    if estimate:
+        total = estimated_count(query)
+        if total is not None and total >= Config.COUNT_ESTIMATE_THRESHOLD:
+            return total, True
+
+    return exact_count(query), False
+
+
+def queue_count_invalidation(session, *tables) -> None:
+    """Invalidates the cached counts of the given tables once the session commits.
+
+    Mapper events already do this for ORM inserts, updates and deletes; call it
+    after Core statements (bulk UPDATEs) that change rows of a table.
+
+    Args:
+        session: The session the statements ran in.
+        *tables: The changed tables, or their names.
+    """
+    names = {table if isinstance(table, str) else table.name for table in tables}
+    session.info.setdefault(_PENDING_TABLES_KEY, set()).update(names)
+
+
+def _queue_invalidation(target) -> None:
+    session = object_session(target)
+    if session is not None:
+        queue_count_invalidation(session, *target.__mapper__.tables)
+
+
+@event.listens_for(db.Model, 'after_insert', propagate=True)
+@event.listens_for(db.Model, 'after_delete', propagate=True)
+def _track_row_count_change(mapper, connection, target):
+    _queue_invalidation(target)
+
+
+@event.listens_for(db.Model, 'after_update', propagate=True)
+def _track_row_change(mapper, connection, target):
+    # an UPDATE can move a row in or out of a filtered list (e.g. a status change)
+    if any(attr.history.has_changes() for attr in inspect(target).attrs):
+        _queue_invalidation(target)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_count_versions(session):
+    tables = session.info.pop(_PENDING_TABLES_KEY, None)
+    if not tables:
+        return
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for table in tables:
+            pipe.incr(f"{COUNT_VERSION_PREFIX}:{table}")
+        pipe.execute()
+    except RedisError as e:
+        log_exception("Unable to invalidate cached counts", e)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_count_invalidation(session):
+    session.info.pop(_PENDING_TABLES_KEY, None)
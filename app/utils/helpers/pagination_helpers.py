@@ -0,0 +1,149 @@
+'''
+This module defines helper functions for cursor (keyset) pagination in the Trendit³ Flask application.
+
+A cursor is an opaque, URL-safe token holding the sort key of the last item of
+a page. The next page is fetched with `WHERE (sort key) < (cursor)` on an index,
+so the cost of a page doesn't grow with how deep into the list it is.
+
+List endpoints use `paginate_query`: when the request carries a `cursor`
+parameter (an empty one asks for the first page) the list is paginated by
+keyset, with no OFFSET and no COUNT; otherwise it falls back to the usual
+page-number pagination, with its total taken from `count_helpers`.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import base64, json
+from datetime import datetime
+from flask import request
+from sqlalchemy import tuple_
+
+from ...exceptions import InvalidCursorError
+from .count_helpers import count_total
+
+
+def encode_cursor(*values) -> str:
+    """Encodes the sort key of the last item of a page into an opaque cursor."""
+    payload = [{'dt': value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decodes a cursor created by `encode_cursor` back into the sort key.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list):
+            raise InvalidCursorError()
+        return tuple(datetime.fromisoformat(value['dt']) if isinstance(value, dict) else value for value in payload)
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError() from e
+
+
+def _sort_key(sort_column, id_column=None) -> tuple:
+    """The columns a list is ordered by: the sort column, then the id as a tiebreaker."""
+    id_column = id_column if id_column is not None else sort_column.class_.id
+    return (sort_column,) if sort_column is id_column else (sort_column, id_column)
+
+
+class CursorPagination:
+    """A page fetched by keyset.
+
+    It exposes the attributes of Flask-SQLAlchemy's `Pagination` that the
+    controllers read. `total`, `page` and `pages` are None, since knowing them
+    would take the COUNT that keyset pagination avoids.
+    """
+    total = None
+    page = None
+    pages = None
+
+    def __init__(self, items: list, per_page: int, next_cursor: str | None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def cursor_paginate(query, sort_column, per_page: int, cursor: str | None = None, id_column=None) -> CursorPagination:
+    """Fetches a page of `query`, newest first, after the given cursor.
+
+    Args:
+        query: The query to paginate, without an ORDER BY.
+        sort_column: The column to sort by, e.g. `Transaction.created_at`.
+        per_page (int): The number of items per page.
+        cursor (str, optional): The `next_cursor` of the previous page; the first page when empty.
+        id_column: The tiebreaker column. Defaults to the `id` of the sorted model.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    sort_key = _sort_key(sort_column, id_column)
+
+    if cursor:
+        cursor_values = decode_cursor(cursor)
+        if len(cursor_values) != len(sort_key):
+            raise InvalidCursorError()
+        query = query.filter(tuple_(*sort_key) < cursor_values)
+
+    items = query.order_by(*(column.desc() for column in sort_key)).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1]
+        next_cursor = encode_cursor(*(getattr(last, column.key) for column in sort_key))
+
+    return CursorPagination(items, per_page, next_cursor)
+
+
+def paginate_query(query, sort_column, page: int = 1, per_page: int = 10, id_column=None, estimate_total: bool = False):
+    """Paginates a list endpoint's query, newest first.
+
+    Requests that send a `cursor` parameter get keyset pagination (see `cursor_paginate`),
+    every other request gets Flask-SQLAlchemy's page-number pagination.
+
+    Args:
+        estimate_total (bool): Whether the total of a page-number request may be
+            a planner estimate (see `count_helpers.count_total`). Meant for admin
+            lists over whole tables.
+
+    Returns:
+        CursorPagination | Pagination: The page. Both expose `items`, `total`, `page` and `pages`.
+    """
+    per_page = max(1, per_page)
+
+    if 'cursor' in request.args:
+        return cursor_paginate(query, sort_column, per_page, request.args.get('cursor'), id_column)
+
+    sort_key = _sort_key(sort_column, id_column)
+    pagination = query.order_by(*(column.desc() for column in sort_key)).paginate(page=page, per_page=per_page, error_out=False, count=False)
+    pagination.total, pagination.total_is_estimate = count_total(query, estimate=estimate_total)
+    return pagination
+
+
+def is_past_last_page(pagination) -> bool:
+    """Whether a page-number request asked for a page beyond the last one.
+
+    An estimated total can be too low, so the last page is then only known to
+    be passed when the page comes back empty.
+    """
+    if pagination.pages is None:
+        return False
+    if getattr(pagination, 'total_is_estimate', False):
+        return not pagination.items
+    return pagination.page > pagination.pages
+
+
+def pagination_meta(pagination) -> dict:
+    """Extra response fields: the next cursor for keyset pages, whether the total is an estimate for numbered pages."""
+    if isinstance(pagination, CursorPagination):
+        return {'next_cursor': pagination.next_cursor, 'has_more': pagination.has_next}
+    return {'total_is_estimate': getattr(pagination, 'total_is_estimate', False)}
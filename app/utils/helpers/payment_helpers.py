@@ -24,6 +24,7 @@ from ...models import Payment, Transaction, TransactionType, Withdrawal, Trendit
 from ...utils.helpers.basic_helpers import console_log, log_exception, generate_random_string
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.mail_helpers import send_other_emails
+from ...utils.helpers.user_helpers import get_current_user
 from config import Config
 
 def construct_payload(amount: int, callback_url: str, meta: dict, user: Trendit3User):
@@ -74,7 +75,7 @@ def initialize_payment(data, payment_type=None, meta_data=None):
     
     try:
         current_user_id = get_jwt_identity()
-        current_user = Trendit3User.query.get(current_user_id)
+        current_user = get_current_user()
         if current_user is None:
             return error_response('User not found', 404)
         
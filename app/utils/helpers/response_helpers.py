@@ -9,7 +9,10 @@ These functions assist with tasks such as generating success and error responses
 
 @app/utils/helpers/response_helpers.py
 """
-from flask import jsonify, make_response, Response
+from typing import Iterable
+from flask import current_app, jsonify, make_response, stream_with_context, Response
+
+from .basic_helpers import log_exception
 
 def error_response(msg: str, status_code: int, extra_data: dict | None = None) -> Response:
     '''
@@ -59,4 +62,63 @@ def success_response(msg: str, status_code: int, extra_data: dict | None = None)
     response: Response = make_response(response)
     response.status_code = status_code
     
-    return response
\ No newline at end of file
+    return response
+
+def not_modified_response(etag: str, weak: bool = True) -> Response:
+    '''
+    Creates an empty 304 Not Modified response for a conditional request.
+
+    Args:
+        etag (str): The ETag of the unchanged resource.
+        weak (bool, optional): Whether the ETag is weak. Defaults to True.
+
+    Returns:
+        flask.Response: An empty response with the 304 status code and the ETag header.
+    '''
+    response: Response = make_response('', 304)
+    response.set_etag(etag, weak=weak)
+    
+    return response
+
+def streamed_success_response(msg: str, status_code: int, key: str, pairs: Iterable[tuple], extra_data: dict | None = None) -> Response:
+    '''
+    Creates a JSON success response whose `key` object is streamed one entry at a time.
+
+    The body has the same shape as `success_response`, but the entries of `key`
+    are serialized as `pairs` yields them, so a large object is never held in
+    memory. Errors raised once streaming has started can't change the status
+    code anymore: they are logged, the object is closed early and the body ends
+    with `"stream_error": true` so clients can tell it was cut short.
+
+    Args:
+        msg (str): The success message to include in the response.
+        status_code (int): The HTTP status code for the response.
+        key (str): The name of the streamed object.
+        pairs (Iterable[tuple]): The (name, value) entries of the streamed object.
+        extra_data (dict, optional): Additional data to include in the response. Defaults to None.
+
+    Returns:
+        flask.Response: A streamed JSON response object.
+    '''
+    head: dict = {
+        'status': 'success',
+        'status_code': status_code,
+        'message': msg
+    }
+    if extra_data:
+        head.update(extra_data)
+    
+    def generate():
+        yield current_app.json.dumps(head)[:-1] + f', {current_app.json.dumps(key)}: {{'
+        try:
+            for index, (name, value) in enumerate(pairs):
+                yield (', ' if index else '') + current_app.json.dumps({name: value})[1:-1]
+        except Exception as e:
+            log_exception(f"An exception occurred streaming {key}", e)
+            yield '}, "stream_error": true}'
+            return
+        yield '}}'
+    
+    response: Response = Response(stream_with_context(generate()), status=status_code, mimetype='application/json')
+    
+    return response
@@ -17,8 +17,9 @@ from PIL import Image
 import pyotp, qrcode, io, base64
 
 from ...extensions import db
-from ...models import Trendit3User, UserSettings, SecuritySetting
+from ...models import UserSettings, SecuritySetting
 from ...exceptions import InvalidTwoFactorMethod
+from .user_helpers import get_current_user
 
 def set_2fa_method(method=None, user_id=None):
     try:
@@ -135,7 +136,7 @@ def update_user_security_settings(security_setting: SecuritySetting, data: dict)
         two_factor_method = data.get('two_fa_method', security_setting.two_factor_method)
         
         if new_password:
-            current_user = Trendit3User.query.get(int(get_jwt_identity()))
+            current_user = get_current_user()
             hashed_pwd = generate_password_hash(new_password, "pbkdf2:sha256")
             current_user.update(thePassword=hashed_pwd)
         
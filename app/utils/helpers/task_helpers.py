@@ -1,20 +1,33 @@
 import sys, os
+from itertools import groupby
+from operator import attrgetter
 from decimal import Decimal
 from threading import Thread
 from flask import request, current_app
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.exc import ( DataError, DatabaseError, )
 from flask_jwt_extended import get_jwt_identity
 from datetime import datetime, timedelta
 
 from ...extensions import db
-from ...models import Task, AdvertTask, EngagementTask, TaskStatus, TaskPaymentStatus, TaskPerformance, RoleNames
+from ...models import Task, AdvertTask, EngagementTask, TaskStatus, TaskPaymentStatus, TaskPerformance, RoleNames, Trendit3User
 from ...utils.helpers.basic_helpers import console_log, log_exception
 from ...utils.helpers.media_helpers import save_media, save_media_files_to_temp
-from ...exceptions import PendingTaskError, NoUnassignedTaskError
+from ...exceptions import PendingTaskError, NoUnassignedTaskError, TaskSlotsFilledError, PrefetchLimitError
+from ..tasks.inventory import draw_task_ids, INVENTORY_SAMPLE_SIZE
+from ..tasks.catalog_counts import get_task_counts, count_open_tasks
+from ..tasks.reservation import reserve_task_slot
+from ..tasks.targeting import get_earner_targeting, targeting_filters
+from ..tasks.ranking import get_ranked_task_ids, personalize_scores, RANKING_TOP_K
+from ..serializers.fields import requested_fields
+from ..serializers.tasks import task_load_options, serialize_tasks
+from ..serializers.performances import performance_load_options, serialize_performances
 from .user_helpers import add_user_role
+from .pagination_helpers import paginate_query, pagination_meta, cursor_paginate, encode_cursor
 
 
+TASK_GROUP_BATCH_SIZE = 100 # tasks fetched per round trip when streaming grouped listings
+
 
 def fetch_task(task_id_key: int | str) -> Task:
     """
@@ -43,37 +56,111 @@ def fetch_task(task_id_key: int | str) -> Task:
         return None
 
 
-def get_tasks_dict_grouped_by_field(field: str, task_type: str) -> dict:
-    tasks_dict = {}
+def _listed_task_model(task_type: str, field: str):
+    """Returns the model of a grouped listing, checking that tasks can be grouped by the field."""
+    if task_type == 'advert':
+        task_model = AdvertTask
+    elif task_type == 'engagement':
+        task_model = EngagementTask
+    else:
+        raise ValueError(f"Invalid task_type: {task_type}")
     
-    try:
-        if task_type == 'advert':
-            tasks = AdvertTask.query.filter_by(payment_status=TaskPaymentStatus.COMPLETE, status=TaskStatus.APPROVED).all()
-        elif task_type == 'engagement':
-            tasks = EngagementTask.query.filter_by(payment_status=TaskPaymentStatus.COMPLETE, status=TaskStatus.APPROVED).all()
-        else:
-            raise ValueError(f"Invalid task_type: {task_type}")
-
-        for task in tasks:
-            key = getattr(task, field)
-            if key not in tasks_dict:
-                tasks_dict[key] = {
-                    'total': 0,
-                    'tasks': [],
-                }
-            tasks_dict[key]['total'] += 1
-            tasks_dict[key]['tasks'].append(task.to_dict())
-    except AttributeError as e:
+    if field not in task_model.__mapper__.columns:
         raise ValueError(f"Invalid field: {field}")
-    except Exception as e:
-        raise e
+    
+    return task_model
+
+
+def _listed_tasks_query(task_model):
+    return task_model.query.filter(task_model.payment_status == TaskPaymentStatus.COMPLETE, task_model.status == TaskStatus.APPROVED)
 
-    return tasks_dict
+
+def count_task_groups(field: str, task_type: str) -> dict:
+    """Counts the approved tasks of each value of a field.
+
+    Returns:
+        dict: maps each field value to the number of tasks having it.
+
+    Raises:
+        ValueError: If an invalid field or task_type is provided.
+    """
+    task_model = _listed_task_model(task_type, field)
+    group_column = getattr(task_model, field)
+    
+    results = _listed_tasks_query(task_model).with_entities(group_column, func.count(task_model.id)) \
+        .group_by(group_column).order_by(group_column).all()
+    
+    return dict(results)
+
+
+def iter_task_groups(field: str, task_type: str, group_totals: dict, per_group: int, fields: set[str] | None = None):
+    """Yields the newest `per_group` approved tasks of each value of a field, one group at a time.
+
+    The top tasks of every group are picked in the database with ROW_NUMBER() over
+    the group, and fetched in batches, so memory stays flat however many tasks
+    or groups there are.
+
+    Args:
+        field (str): The field to group tasks by.
+        task_type (str): The type of tasks to retrieve ('advert' or 'engagement').
+        group_totals (dict): The number of tasks per group, from `count_task_groups`.
+        per_group (int): The maximum number of tasks returned per group.
+        fields (set, optional): The requested task fields (see `serializers.fields`).
+
+    Yields:
+        tuple: the field value, and a dict with the group's 'total', its 'tasks', and
+            the 'next_cursor' to load more of the group (None when all were returned).
+    """
+    task_model = _listed_task_model(task_type, field)
+    group_column = getattr(task_model, field)
+    newest_first = (task_model.date_created.desc(), task_model.id.desc())
+    
+    ranked = _listed_tasks_query(task_model).with_entities(
+        task_model.id.label('id'),
+        func.row_number().over(partition_by=group_column, order_by=newest_first).label('rank'),
+    ).subquery()
+    
+    query = task_model.query.join(ranked, ranked.c.id == task_model.id) \
+        .filter(ranked.c.rank <= per_group) \
+        .order_by(group_column, *newest_first) \
+        .options(*task_load_options(task_model, fields)) \
+        .execution_options(yield_per=TASK_GROUP_BATCH_SIZE)
+    
+    for key, tasks in groupby(query, key=attrgetter(field)):
+        tasks = list(tasks)
+        total = group_totals.get(key, len(tasks))
+        last = tasks[-1]
+        yield key, {
+            'total': total,
+            'tasks': serialize_tasks(tasks, fields),
+            'next_cursor': encode_cursor(last.date_created, last.id) if total > len(tasks) else None,
+        }
+
+
+def get_task_group_page(field: str, task_type: str, group, per_page: int, cursor: str | None = None, fields: set[str] | None = None):
+    """Fetches the next page of a single group of a grouped listing ("load more").
+
+    Raises:
+        ValueError: If an invalid field or task_type is provided.
+        InvalidCursorError: If the cursor is malformed.
+    """
+    task_model = _listed_task_model(task_type, field)
+    group_column = getattr(task_model, field)
+    
+    # the group of tasks without a value is streamed under `null`, and comes back as '' or 'null'
+    group_filter = group_column.is_(None) if group in (None, '', 'null') else group_column == group
+    query = _listed_tasks_query(task_model).filter(group_filter) \
+        .options(*task_load_options(task_model, fields))
+    
+    return cursor_paginate(query, task_model.date_created, per_page, cursor, task_model.id)
 
 
 def get_aggregated_task_counts_by_field(field: str, task_type: None | str =None) -> dict:
-    """Retrieves aggregated task counts grouped by the specified field,
-    optimized using database-level aggregation, and returns results as a dictionary.
+    """Retrieves the counts of open tasks grouped by the specified field,
+    and returns results as a dictionary.
+
+    Counts are read from the incrementally maintained store in Redis (see `catalog_counts`),
+    falling back to a GROUP BY in the database while the store is unavailable.
 
     Args:
         field (str): The field to group tasks by.
@@ -86,77 +173,99 @@ def get_aggregated_task_counts_by_field(field: str, task_type: None | str =None)
     Raises:
         ValueError: If an invalid field or task_type is provided.
     """
+    counts = get_task_counts(field, task_type)
+    if counts is None:
+        counts = count_open_tasks(field, task_type)
+    
+    return {key: {'name': key, 'total': count} for key, count in counts.items()}
 
-    try:
-        task_model = (AdvertTask if task_type == 'advert' else EngagementTask if task_type == 'engagement' else Task)
-        
-        results = db.session.query(getattr(task_model, field), func.count(task_model.id).label('task_count')) \
-                            .filter_by(payment_status=TaskPaymentStatus.COMPLETE, status=TaskStatus.APPROVED) \
-                            .group_by(getattr(task_model, field)) \
-                            .all()
-        
-        return {key: {'name': key, 'total': count} for key, count in results}
 
-    except AttributeError as e:
-        raise ValueError(f"Invalid field: {field}")
-    except Exception as e:
-        raise e
+def _check_pending_task(user_id: int, task_type: str, filter_value: str) -> None:
+    """Raises PendingTaskError if the user is still performing a task of the same type (and goal, for engagements).
 
+    Answered with a single EXISTS query, served by the (user_id, status) index on TaskPerformance.
+    """
+    pending_tasks = TaskPerformance.query.filter_by(user_id=user_id, status='pending', task_type=task_type)
+    if task_type == "engagement":
+        pending_tasks = pending_tasks.join(EngagementTask, EngagementTask.id == TaskPerformance.task_id) \
+            .filter(EngagementTask.goal == filter_value)
+    
+    if db.session.query(pending_tasks.exists()).scalar():
+        raise PendingTaskError
 
-def generate_random_task(task_type:str, filter_value:str) -> AdvertTask | EngagementTask:
-    """Retrieves a random task of the specified type, filtering by platform or goal, ensuring it's not assigned to another user.
+
+def _eligibility_filters(task_model, task_type: str, filter_value: str, user_id: int, earner_targeting: dict) -> list:
+    """Builds the filters matching the open tasks of a platform/goal the user can perform."""
+    # Dynamically filter by platform, goal, posts_count or engagements_count based on task type
+    filter_field = 'platform' if task_type == 'advert' else 'goal'
+    count_field = 'posts_count' if task_type == 'advert' else 'engagements_count'
+    
+    # Filter for unassigned tasks
+    return [
+        getattr(task_model, filter_field) == filter_value,
+        task_model.payment_status == TaskPaymentStatus.COMPLETE,
+        task_model.status == TaskStatus.APPROVED,
+        getattr(task_model, count_field) > func.coalesce(getattr(task_model, 'total_allocated'), 0),
+        task_model.trendit3_user_id != user_id,  # Exclude tasks created by the current user
+        ~TaskPerformance.query.filter(
+            TaskPerformance.task_id == task_model.id,
+            TaskPerformance.user_id == user_id
+        ).exists(),
+        *targeting_filters(task_model, earner_targeting),
+    ]
+
+
+def generate_random_tasks(task_type:str, filter_value:str, count:int = 1) -> list[AdvertTask | EngagementTask]:
+    """Retrieves up to `count` distinct random tasks of the specified type, filtering by platform or goal.
+
+        Only tasks the user can still perform are returned: open tasks they didn't create,
+        haven't performed before and that are targeted at them.
 
         Args:
             task_type (str): The type of task to retrieve ('advert' or 'engagement').
             filter_value (str): The value to filter tasks by (platform for adverts, goal for engagements).
+            count (int): The maximum number of tasks to retrieve.
 
         Returns:
-            Object: A DB object of the randomly selected task.
+            list: DB objects of the randomly selected tasks, in random order.
 
         Raises:
-            LookupError: If no unassigned task was found
+            PendingTaskError: If the user is yet to finish a task of this type.
+            NoUnassignedTaskError: If no unassigned task was found.
             ValueError: If an invalid task type or platform is provided.
             Exception: If an unexpected error occurs during retrieval.
     """
     try:
         current_user_id = int(get_jwt_identity())
-        performed_task = None
-        if task_type == "advert":
-            performed_task = TaskPerformance.query.filter_by(status='pending', task_type=task_type, user_id=current_user_id).first()
-        elif task_type == "engagement":
-            performed_tasks = TaskPerformance.query.filter_by(status='pending', user_id=current_user_id, task_type=task_type).all()
-            for performed_task in performed_tasks:
-                task = EngagementTask.query.filter_by(id=performed_task.task_id, goal=filter_value).first()
-                if task:
-                    raise PendingTaskError
-            
-        
-        if performed_task:
-            raise PendingTaskError
+        _check_pending_task(current_user_id, task_type, filter_value)
         
         task_model = (AdvertTask if task_type == 'advert' else EngagementTask if task_type == 'engagement' else None)
-        
-        # Dynamically filter by platform, goal, posts_count or engagements_count based on task type
         filter_field = 'platform' if task_type == 'advert' else 'goal'
-        count_field = 'posts_count' if task_type == 'advert' else 'engagements_count'
-        
-        # Filter for unassigned tasks
-        random_task = task_model.query.filter(
-            getattr(task_model, filter_field) == filter_value,
-            task_model.payment_status == TaskPaymentStatus.COMPLETE,
-            task_model.status == TaskStatus.APPROVED,
-            getattr(task_model, count_field) > getattr(task_model, 'total_success'),
-            task_model.trendit3_user_id != current_user_id,  # Exclude tasks created by the current user
-            ~TaskPerformance.query.filter(
-                TaskPerformance.task_id == task_model.id,
-                TaskPerformance.user_id == current_user_id
-            ).exists()
-        ).order_by(func.random()).first()
-        
-        if not random_task:
+        
+        # Only tasks targeted at the earner's location and gender (or at everyone)
+        earner_targeting = get_earner_targeting(current_user_id)
+        eligibility_filters = _eligibility_filters(task_model, task_type, filter_value, current_user_id, earner_targeting)
+        
+        # Draw random candidates from the inventory of open tasks, then check them against the user
+        random_tasks = []
+        sample_size = max(INVENTORY_SAMPLE_SIZE, count * 2)
+        candidate_ids = draw_task_ids(task_type, filter_value, count=sample_size, earner_targeting=earner_targeting)
+        if candidate_ids:
+            candidates = task_model.query.filter(task_model.id.in_(candidate_ids), *eligibility_filters).all()
+            candidates_by_id = {candidate.id: candidate for candidate in candidates}
+            random_tasks = [candidates_by_id[task_id] for task_id in candidate_ids if task_id in candidates_by_id][:count]
+
+        # Fall back to the database when the inventory is unavailable,
+        # or when too many of the sampled tasks turned out to be ineligible for this user
+        if len(random_tasks) < count and (candidate_ids is None or len(candidate_ids) >= sample_size):
+            drawn_ids = [task.id for task in random_tasks]
+            random_tasks += task_model.query.filter(*eligibility_filters, task_model.id.notin_(drawn_ids)) \
+                .order_by(func.random()).limit(count - len(random_tasks)).all()
+
+        if not random_tasks:
             raise NoUnassignedTaskError(f"There are no {task_type} tasks for the {filter_field} '{filter_value}'.")
         
-        return random_task  # Return the generated task
+        return random_tasks
 
     except AttributeError as e:
         raise ValueError(f"Invalid Task Type or Filter: {task_type}/{filter_value}")
@@ -164,6 +273,80 @@ def generate_random_task(task_type:str, filter_value:str) -> AdvertTask | Engage
         raise e
 
 
+def generate_random_task(task_type:str, filter_value:str) -> AdvertTask | EngagementTask:
+    """Retrieves a random task of the specified type, filtering by platform or goal, ensuring it's not assigned to another user.
+
+        Args:
+            task_type (str): The type of task to retrieve ('advert' or 'engagement').
+            filter_value (str): The value to filter tasks by (platform for adverts, goal for engagements).
+
+        Returns:
+            Object: A DB object of the randomly selected task.
+
+        Raises:
+            LookupError: If no unassigned task was found
+            ValueError: If an invalid task type or platform is provided.
+            Exception: If an unexpected error occurs during retrieval.
+    """
+    return generate_random_tasks(task_type, filter_value, count=1)[0]
+
+
+def get_ranked_tasks(task_type:str, filter_value:str, count:int = 10) -> list[AdvertTask | EngagementTask]:
+    """Retrieves the best tasks of the specified type and platform/goal for the current user.
+
+        Tasks are read from the precomputed ranking of the segment, filtered down to the
+        ones the user can perform and personalised for them. Tasks are only sorted in
+        the database when the ranking is unavailable.
+
+        Args:
+            task_type (str): The type of task to retrieve ('advert' or 'engagement').
+            filter_value (str): The value to filter tasks by (platform for adverts, goal for engagements).
+            count (int): The maximum number of tasks to retrieve.
+
+        Returns:
+            list: DB objects of the tasks, best first.
+
+        Raises:
+            ValueError: If an invalid task type or platform is provided.
+    """
+    if task_type not in ('advert', 'engagement'):
+        raise ValueError(f"Invalid Task Type: {task_type}")
+    
+    current_user_id = int(get_jwt_identity())
+    task_model = AdvertTask if task_type == 'advert' else EngagementTask
+    
+    earner_targeting = get_earner_targeting(current_user_id)
+    eligibility_filters = _eligibility_filters(task_model, task_type, filter_value, current_user_id, earner_targeting)
+    
+    # Read more than needed from the ranking, as some tasks won't be eligible for this user
+    window = count * 3
+    ranked = get_ranked_task_ids(task_type, filter_value, window)
+    if ranked is None:
+        # The ranking is unavailable, so rank in the database
+        return task_model.query.filter(*eligibility_filters) \
+            .order_by(task_model.reward_money.desc(), task_model.date_created.desc()) \
+            .limit(count).all()
+    
+    # Read further down the ranking while too few of the ranked tasks are eligible for this user
+    scores, eligible = {}, []
+    while ranked:
+        scores.update(ranked)
+        eligible += task_model.query.filter(task_model.id.in_([task_id for task_id, _ in ranked]), *eligibility_filters).all()
+        if len(eligible) >= count or len(ranked) < window:
+            break
+        ranked = get_ranked_task_ids(task_type, filter_value, window, offset=len(scores)) or []
+    
+    tasks = personalize_scores(eligible, scores, current_user_id, earner_targeting)[:count] if eligible else []
+    
+    # A full segment only keeps its top tasks. If the user can't perform enough of them,
+    # add eligible tasks from below the cut, which rank after every ranked task anyway.
+    if len(tasks) < count and len(scores) >= RANKING_TOP_K:
+        tasks += task_model.query.filter(*eligibility_filters, task_model.id.notin_(scores.keys())) \
+            .limit(count - len(tasks)).all()
+    
+    return tasks
+
+
 def initiate_task(task: Task, status='pending') -> dict:
     try:
         current_user_id = int(get_jwt_identity())
@@ -175,20 +358,15 @@ def initiate_task(task: Task, status='pending') -> dict:
         if task.payment_status != TaskPaymentStatus.COMPLETE:
             raise ValueError("This task is not available for performance")
         
-        reward_money = task.reward_money
-        
-        # Create a new TaskPerformance instance
-        initiated_task = TaskPerformance.create_task_performance(user_id=current_user_id, task_id=task.id, task_type=task.task_type, reward_money=reward_money, proof_screenshot=None, account_name='', post_link='', status=status)
+        # Claim a slot of the task and create the TaskPerformance in the same transaction
+        initiated_task = reserve_task_slot(task, current_user_id, status=status)
+        db.session.commit()
         
         add_user_role(RoleNames.EARNER, current_user_id) # Give user role of Earner
         
-        # Mark the task as assigned
-        task.total_allocated += 1
-        db.session.add(task)
-        db.session.commit()
-        
         return initiated_task.to_dict()
-    except ValueError as e:
+    except (ValueError, NoUnassignedTaskError) as e:
+        db.session.rollback()
         raise e
     except Exception as e:
         db.session.rollback()
@@ -196,6 +374,73 @@ def initiate_task(task: Task, status='pending') -> dict:
         raise e
 
 
+def reserve_tasks(tasks: list[Task], limit: int | None = None) -> list[dict]:
+    """Reserves a slot of each task for the current user, for prefetching.
+
+    Reservations hold the slot for `TASK_RESERVATION_TTL` and are released automatically
+    if the user hasn't performed the task by then. Tasks that filled up in the meantime are skipped.
+
+    Args:
+        tasks (list[Task]): The tasks to reserve.
+        limit (int, optional): The most reservations the user may hold, counting the ones they already have.
+
+    Returns:
+        list[dict]: The reserved task performances.
+
+    Raises:
+        PrefetchLimitError: If the user already holds `limit` reservations.
+    """
+    try:
+        current_user_id = int(get_jwt_identity())
+        
+        room = None
+        if limit is not None:
+            # Lock the user's row, so concurrent prefetches count each other's reservations
+            db.session.execute(select(Trendit3User.id).where(Trendit3User.id == current_user_id).with_for_update())
+            reserved_count = TaskPerformance.query.filter_by(user_id=current_user_id, status='reserved').count()
+            if reserved_count >= limit:
+                raise PrefetchLimitError(f"You already have {reserved_count} tasks reserved. Perform or cancel them first.")
+            room = limit - reserved_count
+        
+        reserved_tasks = []
+        for task in tasks:
+            if room is not None and len(reserved_tasks) >= room:
+                break
+            if task.payment_status != TaskPaymentStatus.COMPLETE:
+                continue
+            try:
+                reserved_tasks.append(reserve_task_slot(task, current_user_id, status='reserved'))
+            except TaskSlotsFilledError:
+                continue # the conditional UPDATE didn't change anything, so the rest of the batch is unaffected
+        
+        if not reserved_tasks:
+            raise TaskSlotsFilledError()
+        
+        db.session.commit()
+    except (NoUnassignedTaskError, PrefetchLimitError) as e:
+        db.session.rollback()
+        raise e
+    except Exception as e:
+        db.session.rollback()
+        log_exception("An exception occurred trying to reserve tasks", e)
+        raise e
+    
+    add_user_role(RoleNames.EARNER, current_user_id) # Give user role of Earner
+    
+    # Release whatever the user doesn't get to once the reservations expire. They are
+    # committed already, so if the broker is down the periodic sweep releases them instead.
+    try:
+        from ...celery.jobs.tasks import release_expired_reservations
+        release_expired_reservations.apply_async(
+            args=[[performance.id for performance in reserved_tasks]],
+            countdown=current_app.config['TASK_RESERVATION_TTL'].total_seconds()
+        )
+    except Exception as e:
+        log_exception("Unable to schedule the release of reserved tasks", e)
+    
+    return [performance.to_dict() for performance in reserved_tasks]
+
+
 def get_task_by_key(task_key) -> Task | AdvertTask | EngagementTask:
     task = EngagementTask.query.filter_by(task_key=task_key).first()
 
@@ -339,7 +584,7 @@ def update_performed_task(data, pt_id=None, status='pending'):
         if pt_id:
             performed_task = TaskPerformance.query.get(pt_id)
         else:
-            performed_task = TaskPerformance.query.filter_by(user_id=user_id, task_id=task_id, status='pending').first()
+            performed_task = TaskPerformance.query.filter_by(user_id=user_id, task_id=task_id).filter(TaskPerformance.status.in_(('pending', 'reserved'))).first()
         
         
         if not performed_task:
@@ -392,19 +637,21 @@ def fetch_performed_tasks_by_status(status):
     try:
         current_user_id = int(get_jwt_identity())
         page = request.args.get("page", 1, type=int)
+        fields = requested_fields()
         tasks_per_page = int(6)
-        pagination = TaskPerformance.query.filter_by(user_id=current_user_id, status=status) \
-            .order_by(TaskPerformance.started_at.desc()) \
-            .paginate(page=page, per_page=tasks_per_page, error_out=False)
+        query = TaskPerformance.query.filter_by(user_id=current_user_id, status=status) \
+            .options(*performance_load_options(fields=fields))
+        pagination = paginate_query(query, TaskPerformance.started_at, page, tasks_per_page)
         
         
         performed_tasks = pagination.items
-        current_tasks = [performed_task.to_dict() for performed_task in performed_tasks]
+        current_tasks = serialize_performances(performed_tasks, fields=fields)
         json_data = {
             'total': pagination.total,
             "performed_tasks": current_tasks,
             "current_page": pagination.page,
             "total_pages": pagination.pages,
+            **pagination_meta(pagination),
         }
         return json_data
     except Exception as e:
@@ -13,9 +13,11 @@ These functions assist with tasks such as:
 import os
 from enum import Enum
 from threading import Thread
-from flask import current_app
+from flask import current_app, g
+from flask_jwt_extended import get_jwt_identity
 from werkzeug.datastructures import FileStorage
 from sqlalchemy.exc import ( DataError, DatabaseError, SQLAlchemyError )
+from sqlalchemy.orm import joinedload
 
 from ...extensions import db
 from ...models.role import Role, RoleNames
@@ -134,6 +136,29 @@ def get_user_info(user_id: int) -> dict:
     return userInfo
 
 
+def get_current_user() -> Trendit3User | None:
+    """
+    Returns the authenticated user of the current request.
+
+    The user is loaded on first use, along with their roles, membership, wallet and
+    settings in the same query, and kept on `g` so that decorators and controllers
+    handling the request share it instead of each querying for it.
+
+    Returns:
+        Trendit3User | None: The user identified by the request's JWT, or None if there is no such user.
+    """
+    if 'current_user' not in g:
+        user_id = get_jwt_identity()
+        g.current_user = Trendit3User.query.options(
+            joinedload(Trendit3User.roles),
+            joinedload(Trendit3User.membership),
+            joinedload(Trendit3User.wallet),
+            joinedload(Trendit3User.user_settings),
+        ).filter_by(id=int(user_id)).first() if user_id is not None else None
+    
+    return g.current_user
+
+
 def is_user_exist(identifier, field, user=None):
     """
     Checks if a user exists in the database with the given identifier and field.
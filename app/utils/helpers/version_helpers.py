@@ -0,0 +1,135 @@
+'''
+This module defines version counters for cached resources in the Trendit³ Flask application.
+
+A version counter is a Redis integer per resource namespace (optionally scoped
+to a user), bumped after every commit that changes the rows the resource is
+built from. Anything derived from those rows (ETags, cached responses) can be
+validated by comparing versions instead of re-querying or re-hashing the data.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import time
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from ...extensions import redis_client
+from ...models import (Task, TaskPerformance, TaskOption, Pricing, Trendit3User, Profile, Address,
+                       BankAccount, Wallet, Membership, SocialMediaProfile, UserSettings)
+from .basic_helpers import log_exception
+
+
+VERSION_KEY_PREFIX = "resource_version"
+
+TASK_CATALOG = 'task_catalog' # approved task listings, grouped tasks and counts
+TASK_LISTINGS = 'task_listings' # which tasks the public catalog lists, and whether they still have slots
+TASK_OPTIONS = 'task_options'
+PRICING = 'pricing'
+USER = 'user' # a user's profile, wallet, bank and social profiles
+
+_PENDING_BUMPS_KEY = "resource_version_bumps"
+
+# Task attributes that decide whether a task is listed in the public catalog
+LISTING_FIELDS = ('status', 'payment_status')
+
+
+def version_key(namespace: str, scope=None) -> str:
+    return f"{VERSION_KEY_PREFIX}:{namespace}" if scope is None else f"{VERSION_KEY_PREFIX}:{namespace}:{scope}"
+
+
+def get_versions(keys: list[str]) -> list[str]:
+    """Returns the current value of the given version counters.
+
+    Counters that don't exist yet are seeded with the current time, so that
+    versions handed out before a Redis flush are never reused afterwards.
+
+    Raises:
+        RedisError: If Redis is unavailable.
+    """
+    versions = redis_client.mget(keys)
+    missing = [key for key, version in zip(keys, versions) if version is None]
+    if missing:
+        seed = time.time_ns()
+        pipe = redis_client.pipeline(transaction=False)
+        for key in missing:
+            pipe.set(key, seed, nx=True)
+        pipe.execute()
+        versions = redis_client.mget(keys)
+    return versions
+
+
+def bump_versions(*keys: str) -> None:
+    """Increments the given version counters, invalidating anything derived from them."""
+    if not keys:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.incr(key)
+        pipe.execute()
+    except RedisError as e:
+        log_exception("Unable to bump resource versions", e)
+
+
+def queue_version_bump(session: Session, *keys: str) -> None:
+    """Marks version counters to be bumped once the session commits."""
+    session.info.setdefault(_PENDING_BUMPS_KEY, set()).update(keys)
+
+
+# model -> function returning the version keys its rows feed
+_TRACKED_MODELS = {
+    Task: lambda target: [version_key(TASK_CATALOG)],
+    TaskPerformance: lambda target: [version_key(TASK_CATALOG)], # performances move the task counters
+    TaskOption: lambda target: [version_key(TASK_OPTIONS)],
+    Pricing: lambda target: [version_key(PRICING)],
+    Trendit3User: lambda target: [version_key(USER, target.id)],
+    **{model: lambda target: [version_key(USER, target.trendit3_user_id)]
+       for model in (Profile, Address, BankAccount, Wallet, Membership, SocialMediaProfile, UserSettings)},
+}
+
+
+def _version_tracker(get_keys):
+    def track_changes(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            queue_version_bump(session, *get_keys(target))
+    return track_changes
+
+
+for _model, _get_keys in _TRACKED_MODELS.items():
+    _tracker = _version_tracker(_get_keys)
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, _tracker, propagate=True)
+
+
+@event.listens_for(Task, 'after_insert', propagate=True)
+@event.listens_for(Task, 'after_delete', propagate=True)
+def _track_listing_insert_delete(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        queue_version_bump(session, version_key(TASK_LISTINGS))
+
+
+@event.listens_for(Task, 'after_update', propagate=True)
+def _track_listing_update(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        return
+
+    attrs = inspect(target).attrs
+    if any(attrs[field].history.has_changes() for field in LISTING_FIELDS):
+        queue_version_bump(session, version_key(TASK_LISTINGS))
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_versions_after_commit(session):
+    keys = session.info.pop(_PENDING_BUMPS_KEY, None)
+    if keys:
+        bump_versions(*keys)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_version_bumps(session):
+    session.info.pop(_PENDING_BUMPS_KEY, None)
@@ -0,0 +1,93 @@
+'''
+This module defines the JSON provider of the Trendit³ Flask application.
+
+Every response built by `success_response`/`error_response` (or `jsonify`) is
+encoded by the app's JSON provider. This one encodes with orjson when it is
+installed, and falls back to the stdlib encoder otherwise. The output is the
+same JSON as Flask's default provider: datetimes and dates as HTTP dates,
+Decimals and UUIDs as strings, non-ASCII characters escaped unless
+`ensure_ascii` is turned off. Only floats in exponent notation are spelled
+differently by orjson (`1e16` rather than `1e+16`).
+
+orjson is only used where its output can't differ: payloads with non-string
+keys, integers over 64 bits or (with `ensure_ascii`) non-ASCII text are
+encoded by the stdlib encoder. Unlike Flask's default provider, both
+encoders also accept Enums (encoded as their values) and dataclasses.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import dataclasses, decimal, json, uuid
+from datetime import date
+from enum import Enum
+from typing import Any
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError: # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encodes the types neither encoder handles the way Flask does."""
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider encoding with orjson when available, and the stdlib encoder otherwise."""
+
+    default = staticmethod(_default)
+
+    @property
+    def is_fast(self) -> bool:
+        return orjson is not None
+
+    def _orjson_options(self) -> int:
+        # Datetimes go through `_default` so they keep Flask's HTTP date format
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Serializes data to compact JSON bytes."""
+        if orjson is not None:
+            try:
+                encoded = orjson.dumps(obj, default=_default, option=self._orjson_options())
+            except TypeError:
+                pass # non-string keys, integers over 64 bits: left to the stdlib encoder
+            else:
+                # orjson can't escape non-ASCII text, which is rare enough to re-encode
+                if not self.ensure_ascii or encoded.isascii():
+                    return encoded
+
+        return json.dumps(obj, default=_default, ensure_ascii=self.ensure_ascii, sort_keys=self.sort_keys, separators=(",", ":")).encode()
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and not kwargs:
+            return self.dumps_bytes(obj).decode()
+
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        if pretty:
+            return super().response(obj)
+
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
@@ -1,2 +1,3 @@
 from .after_request import set_access_control_allows
-from .before_request import check_emerge, json_check, ping_url
\ No newline at end of file
+from .before_request import check_emerge, json_check, ping_url
+from .compression import compress_response, static_payload
@@ -0,0 +1,135 @@
+'''
+This module compresses the responses of the Trendit³ Flask application.
+
+JSON and text responses at least `COMPRESSION_MIN_SIZE` bytes long are
+compressed with brotli (when it is installed and the client accepts it) or
+gzip, according to the request's Accept-Encoding. Streamed responses (like the
+grouped task listings) are compressed chunk by chunk as they are generated,
+each chunk flushed so the client can start decoding before the stream ends.
+File downloads and already-encoded responses are sent as they are.
+
+Views marked with `static_payload` (the religions and LGA lists, etc.) return
+the same bodies over and over, so their compressed forms are kept in a small
+in-process cache instead of being recompressed on every request.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import gzip, hashlib, zlib
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, g, request
+
+try:
+    import brotli
+except ImportError: # pragma: no cover - optional dependency
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = frozenset({'application/json', 'text/html', 'text/plain', 'text/css', 'text/csv', 'application/javascript'})
+STATIC_CACHE_SIZE = 64 # compressed static payloads kept in memory
+
+_static_cache = OrderedDict()
+
+
+def static_payload(fn):
+    """Marks a view whose response body rarely changes, so its compressed form is cached."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        g.static_payload = True
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def _choose_encoding() -> str | None:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=current_app.config['COMPRESSION_BROTLI_QUALITY'])
+    return gzip.compress(data, compresslevel=current_app.config['COMPRESSION_LEVEL'])
+
+
+def _compress_static(data: bytes, encoding: str) -> bytes:
+    key = (encoding, hashlib.sha1(data).digest())
+    compressed = _static_cache.get(key)
+    if compressed is not None:
+        _static_cache.move_to_end(key)
+        return compressed
+
+    compressed = _compress(data, encoding)
+    _static_cache[key] = compressed
+    if len(_static_cache) > STATIC_CACHE_SIZE:
+        _static_cache.popitem(last=False)
+    return compressed
+
+
+def _compress_stream(chunks, encoding: str, level: int):
+    """Compresses a streamed body chunk by chunk, flushing after each one."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS) # gzip container
+        compress, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+    try:
+        for chunk in chunks:
+            data = compress(chunk.encode() if isinstance(chunk, str) else chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def _weaken_etag(response) -> None:
+    # the compressed body is a different representation, so a strong ETag no longer applies
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def compress_response(response):
+    if (response.direct_passthrough
+            or not 200 <= response.status_code < 300 or response.status_code == 204
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.headers.get('Content-Disposition', '').startswith('attachment')):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        level = current_app.config['COMPRESSION_BROTLI_QUALITY' if encoding == 'br' else 'COMPRESSION_LEVEL']
+        response.response = _compress_stream(response.response, encoding, level)
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Content-Length', None)
+        _weaken_etag(response)
+        return response
+
+    data = response.get_data()
+    if len(data) < current_app.config['COMPRESSION_MIN_SIZE']:
+        return response
+
+    compressed = _compress_static(data, encoding) if g.get('static_payload') else _compress(data, encoding)
+    if len(compressed) >= len(data):
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    _weaken_etag(response)
+
+    return response
@@ -1,44 +1,168 @@
 '''
 This module contains the functions for handling conversion rates of currencies
 
+Rates are fetched from ExchangeRate-API by a periodic Celery job only
+(`refresh_exchange_rates`), which publishes them to Redis along with a version
+number. Every process keeps its own copy of the published rates and serves it
+straight from memory. Once the copy is older than `EXCHANGE_RATES_LOCAL_TTL`, it
+is still served while a background thread checks Redis for a newer version
+(stale-while-revalidate). A process that starts before any rates are published
+serves the snapshot bundled with the app, and enqueues a refresh right away
+instead of waiting for the schedule. So no request ever waits on the upstream
+API, and conversions keep working when it's down.
+
 @author Emmanuel Olowu
 @link: https://github.com/zeddyemy
 @package Trendit³
 '''
 
+import json, os, threading, time
+from itertools import repeat
+from typing import Iterable
 import requests
 from decimal import Decimal
-from cachetools import cached, TTLCache
+from flask import current_app, has_app_context
+from redis.exceptions import RedisError
 
 from config import Config
-from ..helpers import console_log
+from ...extensions import redis_client
+from ..helpers import log_exception
+
+
+RATES_KEY_PREFIX = "exchange_rates"
+REFRESH_LOCK_TTL = 60 # seconds between refreshes enqueued because no rates were published
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), 'exchange_rates_snapshot.json')
+
+_local_rates = {} # base currency -> {'version', 'rates', 'checked_at'}
+_revalidating = set()
+_lock = threading.Lock()
+
+
+def rates_key(base_currency: str) -> str:
+    return f"{RATES_KEY_PREFIX}:{base_currency}"
+
 
-# Create a cache with a Time-To-Live (TTL) of 12 hour (43200 seconds)
-cache = TTLCache(maxsize=100, ttl=864000)
+def fetch_exchange_rates(base_currency="NGN") -> dict | None:
+    """Fetches the latest rates from ExchangeRate-API. Only the refresher should call this."""
+    response = requests.get(f"{Config.EXCHANGE_RATE_API_URL}/{base_currency}", timeout=10)
 
-@cached(cache)
-def fetch_exchange_rates(base_currency="NGN"):
-    response = requests.get(f"{Config.EXCHANGE_RATE_API_URL}/{base_currency}")
-    
     if response.status_code == 200:
         response_data = response.json()
         if response_data.get("result") == "success":
             return response_data['conversion_rates']
     return None
 
+
+def refresh_exchange_rates(base_currency="NGN") -> int | None:
+    """Fetches the latest rates and publishes them to Redis under a new version.
+
+    Returns:
+        int | None: The published version, or None if the API returned no rates
+            (the previously published rates are kept).
+    """
+    rates = fetch_exchange_rates(base_currency)
+    if not rates:
+        return None
+
+    version = redis_client.incr(f"{rates_key(base_currency)}:version")
+    redis_client.set(rates_key(base_currency), json.dumps({'version': version, 'fetched_at': int(time.time()), 'rates': rates}))
+    return version
+
+
+def _load_snapshot(base_currency: str) -> dict:
+    """Returns the rates bundled with the app, used until published rates are available."""
+    try:
+        with open(SNAPSHOT_PATH) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+    except (OSError, ValueError):
+        return {}
+
+    return snapshot['conversion_rates'] if snapshot.get('base_code') == base_currency else {}
+
+
+def _revalidate(base_currency: str, app=None) -> None:
+    """Replaces the local copy with the published rates if they have a newer version."""
+    local = _local_rates.get(base_currency)
+    try:
+        published = redis_client.get(rates_key(base_currency))
+        if published:
+            published = json.loads(published)
+            if local is None or published['version'] != local['version']:
+                local = {'version': published['version'], 'rates': published['rates']}
+        elif redis_client.set(f"{rates_key(base_currency)}:refreshing", 1, nx=True, ex=REFRESH_LOCK_TTL):
+            # Nothing published yet (fresh deploy or flushed Redis): don't wait for the next scheduled refresh
+            from ...celery.jobs.tasks import refresh_exchange_rates as refresh_exchange_rates_job
+            refresh_exchange_rates_job.delay()
+    except Exception as e:
+        if app is not None:
+            with app.app_context():
+                log_exception("Unable to read published exchange rates", e)
+    finally:
+        # checked even on failure, so an unavailable Redis is retried once per TTL rather than on every request
+        if local is not None:
+            _local_rates[base_currency] = {**local, 'checked_at': time.monotonic()}
+        with _lock:
+            _revalidating.discard(base_currency)
+
+
+def get_exchange_rates(base_currency="NGN") -> dict:
+    """Returns the latest known rates from `base_currency`, without blocking on the network.
+
+    Returns:
+        dict: maps a currency code to its rate. Empty if no rates are known at all.
+    """
+    local = _local_rates.get(base_currency)
+    if local is None:
+        local = {'version': None, 'rates': _load_snapshot(base_currency), 'checked_at': float('-inf')}
+        _local_rates.setdefault(base_currency, local)
+
+    if time.monotonic() - local['checked_at'] > Config.EXCHANGE_RATES_LOCAL_TTL:
+        with _lock:
+            start = base_currency not in _revalidating
+            _revalidating.add(base_currency)
+        if start:
+            app = current_app._get_current_object() if has_app_context() else None
+            threading.Thread(target=_revalidate, args=(base_currency, app), daemon=True).start()
+
+    return local['rates']
+
+
+def exchange_rates_version(base_currency="NGN"):
+    """Returns the version of the rates this process converts with (None for the bundled snapshot)."""
+    get_exchange_rates(base_currency)
+    return _local_rates[base_currency]['version']
+
+
 def format_currency(value):
     """format Decimal with commas"""
     return f"{value:,.2f}"
 
 def convert_amount(amount_in_naira, target_currency, format=True):
-    exchange_rates = fetch_exchange_rates()
-    
-    converted_amount = amount_in_naira # Default to Naira if no rate is found
-    
-    if target_currency in exchange_rates:
-        converted_amount = Decimal(amount_in_naira) * Decimal(exchange_rates[target_currency])
-    
-    amount = round(converted_amount, 2)
-    amount = format_currency(amount) if format else amount
-    return amount
+    return convert_amounts([amount_in_naira], target_currency, format)[0]
+
+def convert_amounts(amounts_in_naira: Iterable, target_currencies: str | Iterable[str], format=True) -> list:
+    """Converts a column of naira amounts in one pass, looking each rate up once.
+
+    Args:
+        amounts_in_naira (Iterable): The amounts to convert.
+        target_currencies (str | Iterable[str]): One currency for every amount, or a currency per amount.
+        format (bool): Whether to format the amounts as strings with commas.
+
+    Returns:
+        list: The converted amounts, in the same order. Amounts in a currency without a
+            known rate are left in naira.
+    """
+    exchange_rates = get_exchange_rates()
+    if isinstance(target_currencies, str) or target_currencies is None:
+        target_currencies = repeat(target_currencies)
+
+    decimal_rates = {}
+    converted = []
+    for amount, currency in zip(amounts_in_naira, target_currencies):
+        if currency not in decimal_rates:
+            decimal_rates[currency] = Decimal(str(exchange_rates[currency])) if currency in exchange_rates else None
+        rate = decimal_rates[currency]
 
+        amount = round(Decimal(amount) * rate if rate is not None else amount, 2) # Default to Naira if no rate is found
+        converted.append(format_currency(amount) if format else amount)
+    return converted
@@ -16,7 +16,6 @@ from decimal import Decimal
 from datetime import datetime
 import requests, logging
 from flask import json
-from flask_jwt_extended import get_jwt_identity
 from sqlalchemy import func, sql
 from sqlalchemy.exc import ( DataError, DatabaseError )
 
@@ -25,6 +24,7 @@ from ...models import Payment, Transaction, TransactionType, Withdrawal, Trendit
 from ...utils.helpers.basic_helpers import console_log, log_exception, generate_random_string
 from ...utils.helpers.response_helpers import error_response, success_response
 from ...utils.helpers.mail_helpers import send_other_emails
+from ...utils.helpers.user_helpers import get_current_user
 
 from .flutterwave import initialize_flutterwave_payment
 from config import Config
@@ -80,8 +80,7 @@ def initialize_payment(user_id, data, payment_type=None, meta_data=None):
     meta = {}
     
     try:
-        current_user_id = get_jwt_identity()
-        current_user = Trendit3User.query.get(current_user_id)
+        current_user = get_current_user()
         if current_user is None:
             return error_response('User not found', 404)
         
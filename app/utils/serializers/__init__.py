@@ -0,0 +1,11 @@
+'''
+This package contains the batch serializers of the Trendit³ Flask application.
+
+Serializers load everything a page of records needs in a fixed number of
+queries (eager-loading relations for the whole page at once) and then build
+the response dicts in memory, so listing endpoints don't issue queries per row.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
@@ -0,0 +1,57 @@
+'''
+This module implements sparse fieldsets (`?fields=`) for the listing endpoints.
+
+Each serializer declares how to compute every field it can return, and which
+relationships a field needs loaded. When a client asks for a subset of fields,
+only those are computed and only the relationships they need are loaded, so
+unrequested fields cost neither serialization, queries nor bytes on the wire.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from typing import Callable
+from flask import request
+
+
+MISSING = object() # returned by a field getter when the field doesn't apply to the record
+
+
+def requested_fields(arg: str = 'fields') -> set[str] | None:
+    """Returns the fields requested with `?fields=a,b,c`, or None if every field is wanted."""
+    value = request.args.get(arg, '')
+    fields = {field.strip() for field in value.split(',') if field.strip()}
+    return fields or None
+
+
+def project(record, getters: dict[str, Callable], fields: set[str]) -> dict:
+    """Builds a dict of the requested fields of a record. Unknown fields are ignored."""
+    data = {}
+    for field in fields:
+        getter = getters.get(field)
+        if getter is None:
+            continue
+        value = getter(record)
+        if value is not MISSING:
+            data[field] = value
+
+    return data
+
+
+def field_load_options(relation_options: dict[str, list], fields: set[str] | None) -> list:
+    """Returns the loader options needed by the requested fields (all of them if fields is None).
+
+    Args:
+        relation_options (dict): maps a field to the loader options it needs.
+        fields (set | None): The requested fields.
+    """
+    options, seen = [], set()
+    for field, field_options in relation_options.items():
+        if fields is not None and field not in fields:
+            continue
+        for option in field_options:
+            if id(option) not in seen: # fields sharing a relationship share its option
+                seen.add(id(option))
+                options.append(option)
+
+    return options
@@ -0,0 +1,79 @@
+'''
+This module serializes pages of task performances.
+
+A page of performances is loaded together with its tasks (polymorphic, with
+their media and creators), proof screenshots, earners and their profile
+pictures in a fixed handful of IN-queries. `TaskPerformance.to_dict` then finds
+everything it looks up by id in the session's identity map instead of the database.
+With `?fields=`, only the relations the requested fields need are loaded.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from operator import attrgetter
+from sqlalchemy.orm import joinedload, selectinload
+
+from ...models.task import Task, AdvertTask, EngagementTask, TaskPerformance
+from ...models.user import Trendit3User, Profile
+from .fields import project, field_load_options
+
+
+PERFORMANCE_FIELDS = {
+    'id': attrgetter('id'),
+    'key': attrgetter('key'),
+    'reward_money': attrgetter('reward_money'),
+    'proof_screenshot_path': lambda performance: performance.get_proof_screenshot(),
+    'account_name': attrgetter('account_name'),
+    'post_link': attrgetter('post_link'),
+    'status': attrgetter('status'),
+    'started_at': attrgetter('started_at'),
+    'date_completed': attrgetter('date_completed'),
+    'user': lambda performance: {
+        'id': performance.user_id,
+        'username': performance.trendit3_user.username,
+        'email': performance.trendit3_user.email,
+        'profile_picture': performance.trendit3_user.profile.profile_pic,
+    },
+    'task': lambda performance: performance.get_task(),
+    'task_key': lambda performance: performance.task.task_key,
+}
+
+
+def performance_load_options(add_task: bool = True, fields: set[str] | None = None) -> list:
+    """Returns the loader options needed to serialize task performances without further queries.
+
+    Args:
+        add_task (bool): Whether the full task will be serialized along with each performance, or just its key.
+        fields (set, optional): The requested fields. Relations only needed by other fields are not loaded.
+    """
+    task_key = [selectinload(TaskPerformance.task)]
+    relation_options = {
+        'proof_screenshot_path': [joinedload(TaskPerformance.proof_screenshot)],
+        'user': [selectinload(TaskPerformance.trendit3_user).joinedload(Trendit3User.profile).joinedload(Profile.profile_picture)],
+        'task_key': task_key,
+    }
+    if add_task:
+        relation_options['task'] = [
+            selectinload(TaskPerformance.task).selectin_polymorphic([AdvertTask, EngagementTask]),
+            selectinload(TaskPerformance.task).selectinload(Task.media),
+            selectinload(TaskPerformance.task).joinedload(Task.trendit3_user),
+        ]
+        if fields is None:
+            del relation_options['task_key'] # the full task is loaded anyway
+
+    return field_load_options(relation_options, fields)
+
+
+def serialize_performances(performances: list, add_task: bool = True, fields: set[str] | None = None) -> list[dict]:
+    """Serializes a page of task performances loaded with `performance_load_options`.
+
+    Args:
+        performances (list): The task performances of the page.
+        add_task (bool): Whether to include the full task, or just its key.
+        fields (set, optional): Only include these fields. Defaults to the full `to_dict` shape.
+    """
+    if fields is None:
+        return [performance.to_dict(add_task=add_task) for performance in performances]
+
+    return [project(performance, PERFORMANCE_FIELDS, fields) for performance in performances]
@@ -0,0 +1,128 @@
+'''
+This module serializes pages of transactions, payments, task options, notifications and items.
+
+These records only need a relation loaded for a few of their fields (the
+wallet currency for a transaction amount, the image and seller of an item),
+so with `?fields=` those loads are skipped when the fields aren't requested.
+
+Money fields of a page are converted to the user's currency in one pass with
+`convert_amounts`, instead of once per record.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from operator import attrgetter
+from sqlalchemy.orm import joinedload
+
+from ...models.payment import Transaction
+from ...models.notification import Notification
+from ...models.item import Item
+from ...models.user import Trendit3User
+from ..payments.rates import convert_amounts
+from .fields import project, field_load_options
+
+
+# 'amount' has no getter: `serialize_transactions` converts the amounts of a page in bulk
+TRANSACTION_FIELDS = {
+    'id': attrgetter('id'),
+    'key': attrgetter('key'),
+    'transaction_type': lambda transaction: str(transaction.transaction_type.value),
+    'description': attrgetter('description'),
+    'status': attrgetter('status'),
+    'created_at': attrgetter('created_at'),
+    'updated_at': attrgetter('updated_at'),
+    'user_id': attrgetter('trendit3_user_id'),
+}
+
+NOTIFICATION_FIELDS = {
+    'id': attrgetter('id'),
+    'type': lambda notification: notification.notification_type.value,
+    'title': attrgetter('title'),
+    'body': attrgetter('body'),
+    'read': attrgetter('read'),
+    'created_at': attrgetter('created_at'),
+    'updated_at': attrgetter('updated_at'),
+}
+
+ITEM_FIELDS = {
+    'id': attrgetter('id'),
+    'name': attrgetter('name'),
+    'description': attrgetter('description'),
+    'item_img': lambda item: item.get_item_img(),
+    'price': attrgetter('price'),
+    'category': attrgetter('category'),
+    'brand_name': attrgetter('brand_name'),
+    'sizes': attrgetter('size'),
+    'colors': attrgetter('color'),
+    'material': attrgetter('material'),
+    'phone': attrgetter('phone'),
+    'slug': attrgetter('slug'),
+    'views_count': attrgetter('views_count'),
+    'item_type': attrgetter('item_type'),
+    'total_likes': lambda item: item.likes.count(),
+    'total_comments': lambda item: item.comments.count(),
+    'created_at': attrgetter('created_at'),
+    'updated_at': attrgetter('updated_at'),
+    'seller': lambda item: {
+        'id': item.seller_id,
+        'username': item.seller.username,
+        'email': item.seller.email
+    },
+}
+
+
+def transaction_load_options(fields: set[str] | None = None) -> list:
+    return field_load_options({'amount': [joinedload(Transaction.trendit3_user).joinedload(Trendit3User.wallet)]}, fields)
+
+
+def item_load_options(fields: set[str] | None = None) -> list:
+    return field_load_options({
+        'item_img': [joinedload(Item.media)],
+        'seller': [joinedload(Item.seller)],
+    }, fields)
+
+
+def serialize_records(records: list, getters: dict, fields: set[str] | None = None) -> list[dict]:
+    """Serializes a page of records with `to_dict`, or with only the requested fields."""
+    if fields is None:
+        return [record.to_dict() for record in records]
+
+    return [project(record, getters, fields) for record in records]
+
+
+def _owner_currencies(records, currency_code: str | None) -> str | list[str]:
+    """The currency to convert a page of records to: the given one, or each record's owner wallet currency."""
+    return currency_code if currency_code is not None else [record.currency_code for record in records]
+
+
+def serialize_transactions(transactions: list, fields: set[str] | None = None, currency_code: str | None = None) -> list[dict]:
+    """Serializes a page of transactions, converting their amounts in bulk.
+
+    Args:
+        transactions (list): The transactions of the page.
+        fields (set, optional): The requested fields. Every field if omitted.
+        currency_code (str, optional): The currency of every amount, when all transactions
+            belong to the same user. Defaults to each owner's wallet currency.
+    """
+    if fields is not None and 'amount' not in fields:
+        return [project(transaction, TRANSACTION_FIELDS, fields) for transaction in transactions]
+
+    amounts = convert_amounts([transaction.amount for transaction in transactions], _owner_currencies(transactions, currency_code))
+    if fields is None:
+        return [transaction.to_dict(converted_amount=amount) for transaction, amount in zip(transactions, amounts)]
+
+    return [{**project(transaction, TRANSACTION_FIELDS, fields), 'amount': amount} for transaction, amount in zip(transactions, amounts)]
+
+
+def serialize_payments(payments: list, currency_code: str | None = None) -> list[dict]:
+    """Serializes a page of payments, converting their amounts in bulk."""
+    amounts = convert_amounts([payment.amount for payment in payments], _owner_currencies(payments, currency_code))
+    return [payment.to_dict(converted_amount=amount) for payment, amount in zip(payments, amounts)]
+
+
+def serialize_task_options(task_options: list, user_type: str, currency_code: str) -> list[dict]:
+    """Serializes task options with their advertiser or earner price converted in bulk."""
+    price_field = 'advertiser_price' if user_type == "advertiser" else 'earner_price'
+    prices = convert_amounts([getattr(option, price_field) for option in task_options], currency_code)
+    return [option.to_dict(user_type, currency_code, converted_price=price) for option, price in zip(task_options, prices)]
@@ -0,0 +1,103 @@
+'''
+This module serializes pages of tasks.
+
+A page of tasks is loaded with its subclass rows (selectin_polymorphic), media
+and creator eagerly, so serializing it costs the same handful of queries
+however many tasks are on the page. With `?fields=`, only the relations the
+requested fields need are loaded.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from operator import attrgetter
+from sqlalchemy.orm import joinedload, selectinload, selectin_polymorphic
+
+from ...models.task import Task, AdvertTask, EngagementTask
+from .fields import MISSING, project, field_load_options
+
+
+def _subtype_field(task_model, name: str):
+    return lambda task: getattr(task, name) if isinstance(task, task_model) else MISSING
+
+
+TASK_FIELDS = {
+    'id': attrgetter('id'),
+    'task_type': attrgetter('task_type'),
+    'platform': attrgetter('platform'),
+    'fee': attrgetter('fee'),
+    'fee_paid': attrgetter('fee_paid'),
+    'reward_money': attrgetter('reward_money'),
+    'media_path': lambda task: task.get_task_media(),
+    'task_key': attrgetter('task_key'),
+    'authorization_url': attrgetter('authorization_url'),
+    'payment_status': lambda task: str(task.payment_status.value),
+    'status': lambda task: str(task.status.value),
+    'total_allocated': attrgetter('total_allocated'),
+    'total_success': attrgetter('total_success'),
+    'total_pending': attrgetter('total_pending'),
+    'total_in_review': attrgetter('total_in_review'),
+    'total_rejected': attrgetter('total_rejected'),
+    'total_timed_out': attrgetter('total_timed_out'),
+    'target_country': attrgetter('target_country'),
+    'target_state': attrgetter('target_state'),
+    'gender': attrgetter('gender'),
+    'religion': attrgetter('religion'),
+    'date_created': attrgetter('date_created'),
+    'updated_at': attrgetter('updated_at'),
+    'creator': lambda task: {
+        'id': task.trendit3_user_id,
+        'username': task.trendit3_user.username,
+        'email': task.trendit3_user.email
+    },
+    'posts_count': _subtype_field(AdvertTask, 'posts_count'),
+    'caption': _subtype_field(AdvertTask, 'caption'),
+    'hashtags': _subtype_field(AdvertTask, 'hashtags'),
+    'goal': _subtype_field(EngagementTask, 'goal'),
+    'account_link': _subtype_field(EngagementTask, 'account_link'),
+    'engagements_count': _subtype_field(EngagementTask, 'engagements_count'),
+}
+
+SUBTYPE_FIELDS = ('posts_count', 'caption', 'hashtags', 'goal', 'account_link', 'engagements_count')
+
+
+def task_load_options(task_model=Task, fields: set[str] | None = None) -> list:
+    """Returns the loader options needed to serialize tasks of the given model without further queries.
+
+    Args:
+        task_model: The model the tasks are queried from.
+        fields (set, optional): The requested fields. Relations only needed by other fields are not loaded.
+    """
+    relation_options = {
+        'media_path': [selectinload(task_model.media)],
+        'creator': [joinedload(task_model.trendit3_user)],
+    }
+    if task_model is Task:
+        polymorphic = selectin_polymorphic(Task, [AdvertTask, EngagementTask])
+        relation_options.update({field: [polymorphic] for field in SUBTYPE_FIELDS})
+
+    return field_load_options(relation_options, fields)
+
+
+def load_task_relations(tasks: list, fields: set[str] | None = None) -> list:
+    """Eager-loads the subclass columns, media and creator of tasks that were fetched without `task_load_options`."""
+    task_ids = [task.id for task in tasks]
+    options = task_load_options(Task, fields)
+    if task_ids and options:
+        # Objects already in the session get their unloaded attributes populated
+        Task.query.filter(Task.id.in_(task_ids)).options(*options).all()
+
+    return tasks
+
+
+def serialize_tasks(tasks: list, fields: set[str] | None = None) -> list[dict]:
+    """Serializes a page of tasks loaded with `task_load_options`.
+
+    Args:
+        tasks (list): The tasks of the page.
+        fields (set, optional): Only include these fields. Defaults to the full `to_dict` shape.
+    """
+    if fields is None:
+        return [task.to_dict() for task in tasks]
+
+    return [project(task, TASK_FIELDS, fields) for task in tasks]
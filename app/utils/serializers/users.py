@@ -0,0 +1,124 @@
+'''
+This module serializes pages of users for the admin listings.
+
+A page of users is loaded with its profile (and profile picture), address,
+wallet, membership, settings and roles eagerly, and the primary bank accounts
+and social media profiles of the whole page are fetched with one IN-query each,
+so a page costs the same few queries however many users it has.
+
+Two views are available: "full" has the same shape as `Trendit3User.to_dict`,
+and "summary" is a lightweight profile for list screens (no wallet, bank or
+social profiles).
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from sqlalchemy.orm import joinedload, selectinload
+
+from ...models.user import Trendit3User, Profile, BankAccount
+from ...models.social import SocialMediaProfile
+from ..payments.rates import convert_amounts
+
+
+USER_VIEWS = ('full', 'summary')
+
+
+def user_load_options(view: str = 'full') -> list:
+    """Returns the loader options needed to serialize users in the given view without further queries."""
+    options = [
+        joinedload(Trendit3User.profile).joinedload(Profile.profile_picture),
+        joinedload(Trendit3User.address),
+        joinedload(Trendit3User.membership),
+        selectinload(Trendit3User.roles),
+    ]
+    if view == 'full':
+        options += [
+            joinedload(Trendit3User.wallet),
+            joinedload(Trendit3User.user_settings),
+        ]
+
+    return options
+
+
+def _profile_picture(profile: Profile | None) -> str:
+    return profile.profile_picture.get_path() if profile and profile.profile_picture else ''
+
+
+def user_summary(user: Trendit3User) -> dict:
+    profile = user.profile
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'date_joined': user.date_joined,
+        'membership_fee': user.membership.membership_fee_paid if user.membership else False,
+        'roles': user.role_names,
+        'firstname': profile.firstname if profile else None,
+        'lastname': profile.lastname if profile else None,
+        'profile_picture': _profile_picture(profile),
+        'country': user.address.country if user.address else None,
+        'state': user.address.state if user.address else None,
+    }
+
+
+def serialize_users(users: list, view: str = 'full') -> list[dict]:
+    """Serializes a page of users loaded with `user_load_options`.
+
+    Args:
+        users (list): The users of the page.
+        view (str): 'full' (same shape as `Trendit3User.to_dict`) or 'summary'.
+
+    Raises:
+        ValueError: If the view is unknown.
+    """
+    if view not in USER_VIEWS:
+        raise ValueError(f"Invalid view: {view}. Must be one of {', '.join(USER_VIEWS)}")
+
+    if view == 'summary':
+        return [user_summary(user) for user in users]
+
+    user_ids = [user.id for user in users]
+    if not user_ids:
+        return []
+
+    primary_banks = {
+        bank.trendit3_user_id: bank
+        for bank in BankAccount.query.filter(BankAccount.trendit3_user_id.in_(user_ids), BankAccount.is_primary == True).all()
+    }
+    social_profiles = {}
+    for social_profile in SocialMediaProfile.query.filter(SocialMediaProfile.trendit3_user_id.in_(user_ids)).all():
+        social_profiles.setdefault(social_profile.trendit3_user_id, []).append(social_profile.to_dict())
+
+    wallets = [user.wallet for user in users if user.wallet]
+    balances = dict(zip((wallet.id for wallet in wallets), convert_amounts([wallet.balance for wallet in wallets], [wallet.currency_code for wallet in wallets])))
+
+    users_data = []
+    for user in users:
+        address_info = user.address.to_dict() if user.address else {}
+        address_info.pop('id', None)
+
+        profile_data = user.profile.to_dict() if user.profile else {} # profile picture is already in the identity map
+        profile_data.pop('id', None)
+
+        wallet_info = user.wallet.to_dict(converted_balance=balances[user.wallet.id]) if user.wallet else {}
+        wallet_info.pop('id', None)
+
+        primary_bank = primary_banks.get(user.id)
+
+        users_data.append({
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'date_joined': user.date_joined,
+            'membership_fee': user.membership.membership_fee_paid,
+            'wallet': wallet_info,
+            'social_profiles': social_profiles.get(user.id, []),
+            'primary_bank': primary_bank.to_dict() if primary_bank else {},
+            'roles': user.role_names,
+            'two_fa': user.two_fa_info(),
+            **address_info,
+            **profile_data,
+        })
+
+    return users_data
@@ -0,0 +1,10 @@
+'''
+This package contains the task allocation engine for the Trendit³ Flask application.
+
+It includes the inventory of open tasks that earners can be assigned, and other
+utilities used to hand out social tasks to earners efficiently.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
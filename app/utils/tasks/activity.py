@@ -0,0 +1,72 @@
+'''
+This module builds the activity feed of advertisers: every performance of
+every task they created, newest first.
+
+The feed is a single query joining task_performance to the advertiser's tasks,
+paginated with a (started_at, id) cursor, with the earners, their profile
+pictures and the proof screenshots loaded in the same round trip.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from sqlalchemy.orm import contains_eager, joinedload
+
+from ...models.task import Task, TaskPerformance
+from ...models.user import Trendit3User, Profile
+from ..helpers.pagination_helpers import cursor_paginate
+
+
+def activity_to_dict(performance: TaskPerformance) -> dict:
+    earner = performance.trendit3_user
+    profile_picture = earner.profile.profile_picture if earner.profile else None
+    return {
+        'id': performance.id,
+        'key': performance.key,
+        'status': performance.status,
+        'reward_money': performance.reward_money,
+        'account_name': performance.account_name,
+        'post_link': performance.post_link,
+        'proof_screenshot_path': performance.proof_screenshot.get_path() if performance.proof_screenshot else None,
+        'started_at': performance.started_at,
+        'date_completed': performance.date_completed,
+        'task': {
+            'id': performance.task.id,
+            'task_key': performance.task.task_key,
+            'task_type': performance.task.task_type,
+            'platform': performance.task.platform,
+        },
+        'user': {
+            'id': earner.id,
+            'username': earner.username,
+            'profile_picture': profile_picture.get_path() if profile_picture else '',
+        },
+    }
+
+
+def get_advertiser_activities(advertiser_id: int, cursor: str | None = None, per_page: int = 10) -> tuple[list[dict], str | None]:
+    """Returns a page of the performances of an advertiser's tasks, newest first.
+
+    Args:
+        advertiser_id (int): The ID of the advertiser.
+        cursor (str, optional): The `next_cursor` returned with the previous page.
+        per_page (int): The number of activities per page.
+
+    Returns:
+        tuple: The activities of the page, and the cursor of the next page (None on the last page).
+
+    Raises:
+        InvalidCursorError: If the cursor is invalid.
+    """
+    query = TaskPerformance.query \
+        .join(TaskPerformance.task) \
+        .filter(Task.trendit3_user_id == advertiser_id) \
+        .options(
+            contains_eager(TaskPerformance.task),
+            joinedload(TaskPerformance.proof_screenshot),
+            joinedload(TaskPerformance.trendit3_user).joinedload(Trendit3User.profile).joinedload(Profile.profile_picture),
+        )
+
+    pagination = cursor_paginate(query, TaskPerformance.started_at, per_page, cursor)
+
+    return [activity_to_dict(performance) for performance in pagination.items], pagination.next_cursor
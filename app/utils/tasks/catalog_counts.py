@@ -0,0 +1,179 @@
+'''
+This module maintains the counts of open tasks per platform, goal and targeting value.
+
+The counts power the platform/goal tiles of the earner home screen. Instead of
+a GROUP BY over every approved task on each request, they are kept in Redis
+hashes, one per (task type, field), mapping each field value to the number of
+open tasks having it. The inventory adjusts them whenever a task enters or
+leaves the open state (approved, paid and with slots left), and a periodic
+Celery job rebuilds them from the database to recover from drift.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import json
+from redis.exceptions import RedisError
+from sqlalchemy import func, select
+
+from ...extensions import db, redis_client
+from ..helpers.basic_helpers import log_exception
+from .inventory import _open_tasks_select
+
+
+COUNTS_KEY_PREFIX = "task_counts"
+COUNTS_INDEX_KEY = f"{COUNTS_KEY_PREFIX}:index" # hash of task id -> JSON of the values the task is counted under
+COUNTS_READY_KEY = f"{COUNTS_KEY_PREFIX}:ready"
+
+ALL_TASKS = 'all'
+
+# Atomically moves task ARGV[1] from the counts it is indexed under to the ones
+# in ARGV[2] (a JSON {key: hash field} object, empty if the task isn't open anymore).
+# Reading the index and adjusting the counts in one step keeps two concurrent
+# refreshes of the same task from both applying the same move.
+_move_task_script = redis_client.register_script("""
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if (current or '{}') == ARGV[2] then
+    return 0
+end
+if current then
+    for key, value in pairs(cjson.decode(current)) do
+        redis.call('HINCRBY', key, value, -1)
+    end
+end
+local new = cjson.decode(ARGV[2])
+if next(new) == nil then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+else
+    for key, value in pairs(new) do
+        redis.call('HINCRBY', key, value, 1)
+    end
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+end
+return 1
+""")
+
+# Fields tasks can be counted by, per task type
+COUNTED_FIELDS = {
+    ALL_TASKS: ('platform', 'target_country', 'target_state', 'gender', 'religion'),
+    'advert': ('platform', 'target_country', 'target_state', 'gender', 'religion'),
+    'engagement': ('platform', 'goal', 'target_country', 'target_state', 'gender', 'religion'),
+}
+
+
+def counts_key(task_type: str, field: str) -> str:
+    return f"{COUNTS_KEY_PREFIX}:{task_type}:{field}"
+
+
+def _counted_values(row) -> dict:
+    """Returns the {key: hash field} pairs an open task is counted under."""
+    values = {}
+    for task_type in (ALL_TASKS, row.task_type):
+        for field in COUNTED_FIELDS[task_type]:
+            value = getattr(row, field)
+            values[counts_key(task_type, field)] = '' if value is None else str(value)
+    return values
+
+
+def update_task_counts(task_ids, rows) -> None:
+    """Moves the given tasks in or out of the counts.
+
+    Args:
+        task_ids: The ids of the refreshed tasks.
+        rows: Their rows from the open tasks select; tasks without a row were deleted.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+
+    new_values = {task_id: None for task_id in task_ids}
+    for row in rows:
+        new_values[row.id] = _counted_values(row) if row.is_open else None
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for task_id in task_ids:
+            _move_task_script(keys=[COUNTS_INDEX_KEY], args=[task_id, json.dumps(new_values[task_id] or {})], client=pipe)
+        pipe.execute()
+    except RedisError as e:
+        log_exception("Unable to update task counts", e)
+
+
+def rebuild_task_counts() -> int:
+    """Rebuilds every count from the database.
+
+    Returns:
+        int: The number of open tasks counted.
+    """
+    rows = [row for row in db.session.execute(_open_tasks_select()).all() if row.is_open]
+
+    counts = {}
+    index = {}
+    for row in rows:
+        values = _counted_values(row)
+        for key, value in values.items():
+            counts.setdefault(key, {}).setdefault(value, 0)
+            counts[key][value] += 1
+        index[row.id] = json.dumps(values)
+
+    stale_keys = set(redis_client.scan_iter(match=f"{COUNTS_KEY_PREFIX}:*"))
+
+    pipe = redis_client.pipeline(transaction=True)
+    if stale_keys:
+        pipe.delete(*stale_keys)
+    for key, mapping in counts.items():
+        pipe.hset(key, mapping=mapping)
+    if index:
+        pipe.hset(COUNTS_INDEX_KEY, mapping=index)
+    pipe.set(COUNTS_READY_KEY, 1)
+    pipe.execute()
+
+    return len(rows)
+
+
+def get_task_counts(field: str, task_type: str | None = None) -> dict | None:
+    """Returns the number of open tasks per value of a field.
+
+    Args:
+        field (str): The field to count tasks by (see `COUNTED_FIELDS`).
+        task_type (str, optional): 'advert' or 'engagement'. Counts every task if omitted.
+
+    Returns:
+        dict | None: maps each field value to its count, or None if the counts are
+            unavailable and the caller should count in the database.
+
+    Raises:
+        ValueError: If the tasks can't be counted by the field.
+    """
+    task_type = task_type or ALL_TASKS
+    if field not in COUNTED_FIELDS[task_type]:
+        raise ValueError(f"Invalid field: {field}")
+
+    try:
+        pipe = redis_client.pipeline()
+        pipe.exists(COUNTS_READY_KEY)
+        pipe.hgetall(counts_key(task_type, field))
+        is_ready, counts = pipe.execute()
+    except RedisError as e:
+        log_exception("Unable to read task counts", e)
+        return None
+
+    if not is_ready:
+        return None
+
+    return {value or None: int(count) for value, count in counts.items() if int(count) > 0}
+
+
+def count_open_tasks(field: str, task_type: str | None = None) -> dict:
+    """Counts the open tasks per value of a field in the database, with a GROUP BY."""
+    task_type = task_type or ALL_TASKS
+    if field not in COUNTED_FIELDS[task_type]:
+        raise ValueError(f"Invalid field: {field}")
+
+    open_tasks = _open_tasks_select().subquery()
+    column = open_tasks.c[field]
+    statement = select(column, func.count()).where(open_tasks.c.is_open).group_by(column)
+    if task_type != ALL_TASKS:
+        statement = statement.where(open_tasks.c.task_type == task_type)
+
+    return {value: count for value, count in db.session.execute(statement).all()}
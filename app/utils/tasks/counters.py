@@ -0,0 +1,117 @@
+'''
+This module keeps the per-task progress counters shown to advertisers.
+
+Every task counts its performances by status (pending, in review, completed,
+rejected and timed out), so dashboards read a handful of columns instead of
+running COUNT queries over task_performance. The counters are bumped on the
+flush connection by TaskPerformance mapper events, so they commit or roll back
+together with the status change. Bulk status updates that bypass the ORM (like
+expiry) adjust them in the same statement, and a reconciliation job rebuilds
+them from scratch.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from sqlalchemy import event, func, inspect, or_, select, update
+from sqlalchemy.orm import object_session
+
+from ...extensions import db
+from ...models.task import Task, TaskPerformance
+from .inventory import queue_inventory_refresh
+
+
+# Maps each counted performance status to the Task column counting it
+STATUS_COUNTERS = {
+    'pending': 'total_pending',
+    'in_review': 'total_in_review',
+    'completed': 'total_success',
+    'rejected': 'total_rejected',
+    'timed_out': 'total_timed_out',
+}
+
+
+def counter_changes(old_status: str | None, new_status: str | None) -> dict:
+    """Returns the increments to apply to a task's counters when a performance moves between statuses."""
+    changes = {}
+    if old_status == new_status:
+        return changes
+
+    if old_status in STATUS_COUNTERS:
+        changes[STATUS_COUNTERS[old_status]] = -1
+    if new_status in STATUS_COUNTERS:
+        changes[STATUS_COUNTERS[new_status]] = changes.get(STATUS_COUNTERS[new_status], 0) + 1
+
+    return changes
+
+
+def counter_values(changes: dict, task_table=None) -> dict:
+    """Builds the SET clause applying counter increments, treating NULL counters as 0."""
+    task_table = task_table if task_table is not None else Task.__table__
+    return {column: func.greatest(func.coalesce(task_table.c[column], 0) + increment, 0) for column, increment in changes.items()}
+
+
+def _apply(connection, target: TaskPerformance, changes: dict) -> None:
+    if not changes:
+        return
+
+    task_table = Task.__table__
+    connection.execute(update(task_table).where(task_table.c.id == target.task_id).values(**counter_values(changes, task_table)))
+
+    session = object_session(target)
+    if 'total_success' in changes and session is not None:
+        queue_inventory_refresh(session, target.task_id) # completions count towards filling up the task
+
+
+@event.listens_for(TaskPerformance, 'after_insert')
+def _count_new_performance(mapper, connection, target):
+    _apply(connection, target, counter_changes(None, target.status))
+
+
+@event.listens_for(TaskPerformance, 'after_update')
+def _count_status_change(mapper, connection, target):
+    history = inspect(target).attrs.status.history
+    if not history.has_changes():
+        return
+
+    old_status = history.deleted[0] if history.deleted else None
+    _apply(connection, target, counter_changes(old_status, target.status))
+
+
+@event.listens_for(TaskPerformance, 'after_delete')
+def _count_deleted_performance(mapper, connection, target):
+    # Deletes usually follow a release to 'cancelled' in the same flush, which fires no
+    # after_update, so the counted status is the committed one rather than target.status
+    history = inspect(target).attrs.status.history
+    old_status = history.deleted[0] if history.deleted else target.status
+    _apply(connection, target, counter_changes(old_status, None))
+
+
+def recount_task_progress() -> int:
+    """Rebuilds the progress counters of every task from its performances.
+
+    Returns:
+        int: The number of tasks whose counters were corrected.
+    """
+    task_table = Task.__table__
+    performance_table = TaskPerformance.__table__
+
+    counts = select(
+        task_table.c.id,
+        *[func.count(performance_table.c.id).filter(performance_table.c.status == status).label(column) for status, column in STATUS_COUNTERS.items()]
+    ).select_from(task_table.outerjoin(performance_table, performance_table.c.task_id == task_table.c.id)) \
+        .group_by(task_table.c.id) \
+        .subquery()
+
+    drifted = [task_table.c[column].is_distinct_from(counts.c[column]) for column in STATUS_COUNTERS.values()]
+
+    result = db.session.execute(
+        update(task_table)
+        .where(task_table.c.id == counts.c.id, or_(*drifted))
+        .values(**{column: counts.c[column] for column in STATUS_COUNTERS.values()})
+        .returning(task_table.c.id)
+    ).all()
+
+    db.session.commit()
+
+    return len(result)
@@ -0,0 +1,126 @@
+'''
+This module keeps the deadline queue of task performances.
+
+Every pending task performance sits in a Redis sorted set scored by the time
+it times out. Entries are added when a performance is created (or goes back to
+pending) and removed as soon as it is submitted, cancelled or deleted, so the
+expiry worker only ever pops the performances that are actually due, instead of
+scanning the task_performance table.
+
+Like the inventory, the queue is only touched after the session commits.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import calendar, time
+from datetime import datetime
+from flask import current_app
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from ...extensions import redis_client
+from ...models.task import TaskPerformance
+from ..helpers.basic_helpers import log_exception
+
+
+DEADLINES_KEY = "task_deadlines" # sorted set of task performance id -> timeout timestamp
+
+_PENDING_DEADLINES_KEY = "task_deadlines_changes"
+
+# Atomically pops up to ARGV[2] entries due at or before ARGV[1]
+_pop_due_script = redis_client.register_script("""
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+end
+return due
+""")
+
+
+def get_deadline(started_at: datetime) -> float:
+    """Returns the timestamp a task performance started at `started_at` times out at."""
+    return calendar.timegm((started_at + current_app.config['TASK_PERFORMANCE_TIMEOUT']).utctimetuple())
+
+
+def schedule_deadlines(deadlines: dict) -> None:
+    """Adds or removes task performances from the deadline queue.
+
+    Args:
+        deadlines (dict): maps a task performance id to its deadline timestamp, or None to remove it.
+    """
+    if not deadlines:
+        return
+
+    due = {performance_id: deadline for performance_id, deadline in deadlines.items() if deadline is not None}
+    done = [performance_id for performance_id, deadline in deadlines.items() if deadline is None]
+
+    pipe = redis_client.pipeline()
+    if due:
+        pipe.zadd(DEADLINES_KEY, due)
+    if done:
+        pipe.zrem(DEADLINES_KEY, *done)
+    pipe.execute()
+
+
+def pop_due_performances(limit: int) -> list[int] | None:
+    """Pops up to `limit` task performances whose deadline has passed.
+
+    Returns:
+        list[int] | None: The due task performance ids, or None if the queue is unavailable.
+    """
+    try:
+        due = _pop_due_script(keys=[DEADLINES_KEY], args=[time.time(), limit])
+    except RedisError as e:
+        log_exception("Unable to pop due task performances", e)
+        return None
+
+    return [int(performance_id) for performance_id in due]
+
+
+def _queue_deadline(session: Session, performance: TaskPerformance) -> None:
+    deadline = get_deadline(performance.started_at) if performance.status == 'pending' and performance.started_at else None
+    session.info.setdefault(_PENDING_DEADLINES_KEY, {})[performance.id] = deadline
+
+
+@event.listens_for(TaskPerformance, 'after_insert')
+def _track_performance_insert(mapper, connection, target):
+    session = object_session(target)
+    if session is not None and target.status == 'pending':
+        _queue_deadline(session, target)
+
+
+@event.listens_for(TaskPerformance, 'after_update')
+def _track_performance_update(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        return
+
+    attrs = inspect(target).attrs
+    if attrs.status.history.has_changes() or attrs.started_at.history.has_changes():
+        _queue_deadline(session, target)
+
+
+@event.listens_for(TaskPerformance, 'after_delete')
+def _track_performance_delete(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_DEADLINES_KEY, {})[target.id] = None
+
+
+@event.listens_for(Session, 'after_commit')
+def _sync_deadlines_after_commit(session):
+    deadlines = session.info.pop(_PENDING_DEADLINES_KEY, None)
+    if not deadlines:
+        return
+
+    try:
+        schedule_deadlines(deadlines)
+    except RedisError as e:
+        log_exception("Unable to update task deadlines", e)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_deadlines(session):
+    session.info.pop(_PENDING_DEADLINES_KEY, None)
@@ -0,0 +1,154 @@
+'''
+This module times out task performances that earners started but never submitted.
+
+Due performances are popped from the deadline queue (see `deadlines`), so the
+work done scales with the number of performances actually timing out. A periodic
+sweep over the (status, started_at) index catches anything the queue missed.
+
+Expiry is set-based: each batch is a single `UPDATE ... RETURNING`, followed by
+one executemany giving the released slots back to their tasks and moving them
+from the tasks' pending to timed out counters, in the same transaction.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import time
+from collections import Counter
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import bindparam, func, select, update
+
+from ...extensions import db
+from ...models.task import Task, TaskPerformance
+from ..helpers.count_helpers import queue_count_invalidation
+from .inventory import queue_inventory_refresh
+from .deadlines import pop_due_performances, schedule_deadlines
+
+
+EXPIRY_BATCH_SIZE = 500 # rows timed out per transaction
+
+
+def _expire(performances_filter) -> tuple[int, int]:
+    """Times out the pending task performances matching the filter and gives their slots back, without committing.
+
+    Returns:
+        tuple[int, int]: The number of performances expired and of tasks whose slots were released.
+    """
+    performance_table = TaskPerformance.__table__
+    task_table = Task.__table__
+
+    expired = db.session.execute(
+        update(performance_table)
+        .where(performance_table.c.status == 'pending', performances_filter)
+        .values(status='timed_out')
+        .returning(performance_table.c.id, performance_table.c.task_id)
+    ).all()
+
+    if not expired:
+        return 0, 0
+
+    released = Counter(row.task_id for row in expired)
+    db.session.execute(
+        update(task_table)
+        .where(task_table.c.id == bindparam('b_task_id'))
+        .values(
+            total_allocated=func.greatest(func.coalesce(task_table.c.total_allocated, 0) - bindparam('b_released'), 0),
+            total_pending=func.greatest(func.coalesce(task_table.c.total_pending, 0) - bindparam('b_released'), 0),
+            total_timed_out=func.coalesce(task_table.c.total_timed_out, 0) + bindparam('b_released'),
+        ),
+        [{'b_task_id': task_id, 'b_released': count} for task_id, count in released.items()]
+    )
+    for task_id in released:
+        queue_inventory_refresh(db.session, task_id)
+    queue_count_invalidation(db.session, performance_table, task_table)
+
+    return len(expired), len(released)
+
+
+def _log_metrics(name: str, metrics: dict, started: float) -> dict:
+    metrics['duration_ms'] = round((time.monotonic() - started) * 1000)
+    current_app.logger.info(f"{name}: {metrics}")
+    return metrics
+
+
+def expire_due_performances(batch_size: int = EXPIRY_BATCH_SIZE) -> dict | None:
+    """Times out the task performances popped from the deadline queue and releases their slots.
+
+    Args:
+        batch_size (int): The maximum number of performances popped per transaction.
+
+    Returns:
+        dict | None: Metrics of the run, or None if the deadline queue is unavailable.
+    """
+    performance_table = TaskPerformance.__table__
+    started = time.monotonic()
+    metrics = {'due': 0, 'expired': 0, 'tasks_released': 0, 'batches': 0}
+
+    while True:
+        due_ids = pop_due_performances(batch_size)
+        if due_ids is None:
+            return None
+        if not due_ids:
+            break
+
+        try:
+            expired, tasks_released = _expire(performance_table.c.id.in_(due_ids))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            schedule_deadlines({performance_id: time.time() for performance_id in due_ids}) # put them back for the next run
+            raise
+
+        metrics['due'] += len(due_ids)
+        metrics['expired'] += expired
+        metrics['tasks_released'] += tasks_released
+        metrics['batches'] += 1
+
+        if len(due_ids) < batch_size:
+            break
+
+    return _log_metrics("task performance expiry (deadline queue)", metrics, started)
+
+
+def expire_timed_out_performances(batch_size: int = EXPIRY_BATCH_SIZE) -> dict:
+    """Marks pending task performances older than `TASK_PERFORMANCE_TIMEOUT` as timed out and releases their slots.
+
+    This scans the (status, started_at) index, and is the fallback for performances the deadline queue missed.
+
+    Args:
+        batch_size (int): The maximum number of rows updated per transaction.
+
+    Returns:
+        dict: Metrics of the run: rows expired, tasks whose slots were released, batches and duration.
+    """
+    performance_table = TaskPerformance.__table__
+
+    expired_before = datetime.utcnow() - current_app.config['TASK_PERFORMANCE_TIMEOUT']
+    started = time.monotonic()
+    metrics = {'expired': 0, 'tasks_released': 0, 'batches': 0}
+
+    while True:
+        # the oldest pending rows, skipping the ones a concurrent run has locked
+        batch = select(performance_table.c.id) \
+            .where(performance_table.c.status == 'pending', performance_table.c.started_at <= expired_before) \
+            .order_by(performance_table.c.started_at) \
+            .limit(batch_size) \
+            .with_for_update(skip_locked=True) \
+            .scalar_subquery()
+
+        expired, tasks_released = _expire(performance_table.c.id.in_(batch))
+        if not expired:
+            db.session.rollback()
+            break
+
+        db.session.commit()
+
+        metrics['expired'] += expired
+        metrics['tasks_released'] += tasks_released
+        metrics['batches'] += 1
+
+        if expired < batch_size:
+            break
+
+    return _log_metrics("task performance expiry (sweep)", metrics, started)
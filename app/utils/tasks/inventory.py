@@ -0,0 +1,272 @@
+'''
+This module maintains the inventory of open tasks that can be assigned to earners.
+
+Open tasks are kept in Redis sets, one pool per (task_type, platform/goal), so that
+a random candidate can be drawn with SRANDMEMBER instead of sorting the whole task
+table with ORDER BY random() on every "get me a task" request.
+
+Each open task is also indexed by its targeting (see `targeting`), so the draw
+only returns tasks aimed at the earner's country, state and gender.
+
+The pools are refreshed after every commit that changes a task's status, payment_status,
+total_success, total_allocated or targeting, and are fully rebuilt by a periodic Celery job to recover from drift.
+The same refresh keeps the open task counts of `catalog_counts` up to date.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import json, uuid
+from redis.exceptions import RedisError
+from sqlalchemy import and_, case, event, func, inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from ...extensions import db, redis_client
+from ...models.task import Task, AdvertTask, EngagementTask, TaskStatus, TaskPaymentStatus
+from ..helpers.basic_helpers import log_exception
+from ..helpers.version_helpers import TASK_CATALOG, TASK_LISTINGS, bump_versions, queue_version_bump, version_key
+from .targeting import TARGETING_KEY_PREFIX, targeting_key, task_targeting_keys, WILDCARD
+
+
+INVENTORY_KEY_PREFIX = "task_inventory"
+INVENTORY_INDEX_KEY = f"{INVENTORY_KEY_PREFIX}:index" # hash of task id -> JSON list of the sets the task currently sits in
+INVENTORY_READY_KEY = f"{INVENTORY_KEY_PREFIX}:ready" # set once the pools have been built at least once
+INVENTORY_SAMPLE_SIZE = 25 # number of candidates drawn from a pool per request
+INVENTORY_CHANGES_KEY = f"{INVENTORY_KEY_PREFIX}:changed" # set of task ids refreshed since the ranking last caught up
+
+# Task attributes that decide whether (and where) a task sits in the inventory
+WATCHED_FIELDS = ('status', 'payment_status', 'total_success', 'total_allocated', 'platform', 'goal', 'posts_count', 'engagements_count', 'target_country', 'target_state', 'gender', 'religion')
+
+_PENDING_REFRESH_KEY = "task_inventory_refresh"
+
+
+def get_filter_field(task_type: str) -> str:
+    """Returns the field earners filter tasks by: platform for adverts, goal for engagements."""
+    return 'platform' if task_type == 'advert' else 'goal'
+
+
+def get_count_field(task_type: str) -> str:
+    """Returns the field holding the number of times a task should be performed."""
+    return 'posts_count' if task_type == 'advert' else 'engagements_count'
+
+
+def inventory_key(task_type: str, filter_value: str) -> str:
+    return f"{INVENTORY_KEY_PREFIX}:{task_type}:{filter_value}"
+
+
+def _open_tasks_select():
+    """Builds a SELECT of every advert/engagement task along with its pool key and whether it is open."""
+    task = Task.__table__
+    advert = AdvertTask.__table__
+    engagement = EngagementTask.__table__
+
+    capacity = func.coalesce(advert.c.posts_count, engagement.c.engagements_count, 0)
+    filter_value = case((task.c.task_type == 'engagement', engagement.c.goal), else_=task.c.platform)
+    is_open = and_(
+        task.c.status == TaskStatus.APPROVED,
+        task.c.payment_status == TaskPaymentStatus.COMPLETE,
+        func.coalesce(task.c.total_success, 0) < capacity,
+        func.coalesce(task.c.total_allocated, 0) < capacity,
+    )
+
+    return select(task.c.id, task.c.task_type, filter_value.label('filter_value'), is_open.label('is_open'),
+                  task.c.platform, engagement.c.goal, task.c.target_country, task.c.target_state, task.c.gender, task.c.religion,
+                  capacity.label('capacity'), func.coalesce(task.c.total_allocated, 0).label('allocated'),
+                  task.c.reward_money, task.c.date_created, task.c.trendit3_user_id) \
+        .select_from(task.outerjoin(advert, advert.c.id == task.c.id).outerjoin(engagement, engagement.c.id == task.c.id)) \
+        .where(task.c.task_type.in_(('advert', 'engagement')))
+
+
+def _member_keys(row) -> list[str]:
+    """Returns the pool and targeting sets an open task belongs to."""
+    return [inventory_key(row.task_type, row.filter_value), *task_targeting_keys(row)]
+
+
+def _load_member_keys(value: str | None) -> set[str]:
+    """Parses an index entry; entries written before targeting was indexed hold a bare pool key."""
+    if not value:
+        return set()
+    return set(json.loads(value)) if value.startswith('[') else {value}
+
+
+def _apply_inventory_changes(changes: dict) -> None:
+    """Moves tasks in and out of the pools and targeting sets.
+
+    Args:
+        changes (dict): maps a task id to the list of sets it should be in, or None if it should be removed.
+    """
+    if not changes:
+        return
+
+    task_ids = list(changes)
+    current_members = redis_client.hmget(INVENTORY_INDEX_KEY, task_ids)
+
+    opened_or_closed = False
+    pipe = redis_client.pipeline()
+    for task_id, current in zip(task_ids, current_members):
+        current_keys = _load_member_keys(current)
+        new_keys = changes[task_id] or []
+        opened_or_closed = opened_or_closed or bool(current_keys) != bool(new_keys)
+        for key in current_keys.difference(new_keys):
+            pipe.srem(key, task_id)
+        for key in new_keys:
+            pipe.sadd(key, task_id)
+        if new_keys:
+            pipe.hset(INVENTORY_INDEX_KEY, task_id, json.dumps(new_keys))
+        elif current_keys:
+            pipe.hdel(INVENTORY_INDEX_KEY, task_id)
+    pipe.sadd(INVENTORY_CHANGES_KEY, *task_ids)
+    pipe.execute()
+
+    if opened_or_closed:
+        # a task filled up (or reopened), so cached catalog pages showing its slots are stale
+        bump_versions(version_key(TASK_LISTINGS))
+
+
+def refresh_task_inventory(task_ids) -> None:
+    """Re-reads the given tasks from the database and moves them in or out of their pools.
+
+    This runs after a commit, so it uses its own connection instead of the session.
+    Tasks that no longer exist are removed from the inventory.
+    """
+    task_ids = {int(task_id) for task_id in task_ids if task_id is not None}
+    if not task_ids:
+        return
+
+    try:
+        with db.engine.connect() as connection:
+            rows = connection.execute(_open_tasks_select().where(Task.__table__.c.id.in_(task_ids))).all()
+
+        changes = {task_id: None for task_id in task_ids}
+        for row in rows:
+            changes[row.id] = _member_keys(row) if row.is_open else None
+
+        _apply_inventory_changes(changes)
+
+        from .catalog_counts import update_task_counts
+        update_task_counts(task_ids, rows)
+    except RedisError as e:
+        log_exception("Unable to refresh task inventory", e)
+    except Exception as e:
+        log_exception("An exception occurred refreshing task inventory", e)
+
+
+def rebuild_task_inventory() -> int:
+    """Rebuilds every inventory pool from the database.
+
+    Returns:
+        int: The number of open tasks placed in the inventory.
+    """
+    rows = db.session.execute(_open_tasks_select()).all()
+
+    stale_keys = set(redis_client.scan_iter(match=f"{INVENTORY_KEY_PREFIX}:advert:*"))
+    stale_keys.update(redis_client.scan_iter(match=f"{INVENTORY_KEY_PREFIX}:engagement:*"))
+    stale_keys.update(redis_client.scan_iter(match=f"{TARGETING_KEY_PREFIX}:*"))
+
+    pipe = redis_client.pipeline(transaction=True)
+    if stale_keys:
+        pipe.delete(*stale_keys)
+    pipe.delete(INVENTORY_INDEX_KEY)
+
+    total = 0
+    for row in rows:
+        if not row.is_open:
+            continue
+        member_keys = _member_keys(row)
+        for key in member_keys:
+            pipe.sadd(key, row.id)
+        pipe.hset(INVENTORY_INDEX_KEY, row.id, json.dumps(member_keys))
+        total += 1
+
+    pipe.set(INVENTORY_READY_KEY, 1)
+    pipe.execute()
+
+    return total
+
+
+def draw_task_ids(task_type: str, filter_value: str, count: int = INVENTORY_SAMPLE_SIZE, earner_targeting: dict | None = None) -> list[int] | None:
+    """Draws random task ids from the pool of open tasks for the given task type and platform/goal.
+
+    Args:
+        task_type (str): The type of task ('advert' or 'engagement').
+        filter_value (str): The platform (for adverts) or goal (for engagements).
+        count (int): The maximum number of distinct ids to draw.
+        earner_targeting (dict, optional): The earner's targeting attributes (see `targeting.get_earner_targeting`).
+            When given, only tasks targeted at the earner (or at everyone) are drawn.
+
+    Returns:
+        list[int] | None: The drawn ids, in random order, or None if the inventory
+            is unavailable and the caller should fall back to the database.
+    """
+    pool_key = inventory_key(task_type, filter_value)
+    try:
+        pipe = redis_client.pipeline(transaction=bool(earner_targeting))
+        pipe.exists(INVENTORY_READY_KEY)
+
+        if earner_targeting:
+            # Intersect the pool with (earner's value OR wildcard) for every attribute, in one round trip
+            token = uuid.uuid4().hex
+            scratch_keys = []
+            for attribute, value in earner_targeting.items():
+                scratch_key = f"{TARGETING_KEY_PREFIX}:tmp:{token}:{attribute}"
+                pipe.sunionstore(scratch_key, [targeting_key(attribute, value), targeting_key(attribute, WILDCARD)])
+                scratch_keys.append(scratch_key)
+
+            matches_key = f"{TARGETING_KEY_PREFIX}:tmp:{token}"
+            pipe.sinterstore(matches_key, [pool_key, *scratch_keys])
+            pipe.srandmember(matches_key, count)
+            pipe.delete(matches_key, *scratch_keys)
+            results = pipe.execute()
+            is_ready, task_ids = results[0], results[-2]
+        else:
+            pipe.srandmember(pool_key, count)
+            is_ready, task_ids = pipe.execute()
+    except RedisError as e:
+        log_exception("Unable to draw tasks from inventory", e)
+        return None
+
+    if not is_ready:
+        return None
+
+    return [int(task_id) for task_id in task_ids]
+
+
+def queue_inventory_refresh(session: Session, task_id: int) -> None:
+    """Marks a task to be re-synced with the inventory once the session commits.
+
+    The task catalog version is bumped too, since callers use this after changing
+    a task's counters with Core UPDATEs that mapper events don't see.
+    """
+    session.info.setdefault(_PENDING_REFRESH_KEY, set()).add(task_id)
+    queue_version_bump(session, version_key(TASK_CATALOG))
+
+
+@event.listens_for(Task, 'after_insert', propagate=True)
+@event.listens_for(Task, 'after_delete', propagate=True)
+def _track_task_insert_delete(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        queue_inventory_refresh(session, target.id)
+
+
+@event.listens_for(Task, 'after_update', propagate=True)
+def _track_task_update(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        return
+
+    attrs = inspect(target).attrs
+    if any(field in attrs and attrs[field].history.has_changes() for field in WATCHED_FIELDS):
+        queue_inventory_refresh(session, target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _sync_inventory_after_commit(session):
+    task_ids = session.info.pop(_PENDING_REFRESH_KEY, None)
+    if task_ids:
+        refresh_task_inventory(task_ids)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_inventory_refresh(session):
+    session.info.pop(_PENDING_REFRESH_KEY, None)
@@ -0,0 +1,215 @@
+'''
+This module ranks open tasks so earners see the most valuable, still-fillable tasks first.
+
+Each segment (task_type, platform/goal) keeps its top tasks in a Redis sorted
+set, scored from the reward, the slots left and how recent the task is. The
+freshness term is time-invariant (the creation time in half-lives, on a log
+scale), so scores never need to be recomputed as time passes: only tasks that
+changed are re-scored. The inventory records every task it refreshes, and a
+background job re-scores just those; a periodic full rebuild recovers from drift.
+
+At request time the top of the segment is personalised for the earner: tasks
+they can't perform are dropped, and tasks specifically targeted at them or from
+advertisers whose tasks they completed before are boosted.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import calendar, math
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from ...extensions import db, redis_client
+from ...models.task import Task, TaskPerformance
+from ..helpers.basic_helpers import log_exception
+from .inventory import INVENTORY_CHANGES_KEY, _open_tasks_select
+from .targeting import normalize_target, WILDCARD
+
+
+RANKING_KEY_PREFIX = "task_ranking"
+RANKING_INDEX_KEY = f"{RANKING_KEY_PREFIX}:index" # hash of task id -> segment key the task is ranked in
+RANKING_READY_KEY = f"{RANKING_KEY_PREFIX}:ready"
+RANKING_TOP_K = 200 # tasks kept per segment
+RANKING_REFRESH_BATCH = 1000 # changed tasks re-scored per refresh
+
+# Weights of the ranking signals (natural log scale)
+REWARD_WEIGHT = 1.0
+SLOTS_WEIGHT = 0.5
+FRESHNESS_HALF_LIFE = 3 * 24 * 60 * 60 # seconds for a task to lose half its freshness
+TARGETING_BOOST = math.log(1.5) # task targeted at the earner's own country/state/gender
+ADVERTISER_BOOST = math.log(1.25) # earner completed tasks of this advertiser before
+
+
+def ranking_key(task_type: str, filter_value: str) -> str:
+    return f"{RANKING_KEY_PREFIX}:{task_type}:{filter_value}"
+
+
+def score_task(row) -> float:
+    """Scores an open task. Higher is better; scores of tasks created at different times stay comparable forever."""
+    reward = float(row.reward_money or 0)
+    slots_left = max((row.capacity or 0) - (row.allocated or 0), 0)
+    created_at = calendar.timegm(row.date_created.utctimetuple()) if row.date_created else 0
+
+    return REWARD_WEIGHT * math.log1p(reward) \
+        + SLOTS_WEIGHT * math.log1p(slots_left) \
+        + math.log(2) * created_at / FRESHNESS_HALF_LIFE
+
+
+def _rank_rows(rows) -> None:
+    """Moves the given tasks in or out of their segment's ranking."""
+    rows = list(rows)
+    if not rows:
+        return
+
+    task_ids = [row.id for row in rows]
+    current_segments = dict(zip(task_ids, redis_client.hmget(RANKING_INDEX_KEY, task_ids)))
+
+    touched_segments = []
+    pipe = redis_client.pipeline()
+    for row in rows:
+        current = current_segments.get(row.id)
+        segment = ranking_key(row.task_type, row.filter_value) if row.is_open else None
+        if current and current != segment:
+            pipe.zrem(current, row.id)
+        if segment:
+            pipe.zadd(segment, {row.id: score_task(row)})
+            pipe.hset(RANKING_INDEX_KEY, row.id, segment)
+            if segment not in touched_segments:
+                touched_segments.append(segment)
+        elif current:
+            pipe.hdel(RANKING_INDEX_KEY, row.id)
+
+    pipe.execute()
+
+    _trim_segments(touched_segments)
+
+
+def _trim_segments(segments) -> None:
+    """Keeps the top K tasks of each segment, dropping the trimmed tasks from the index too."""
+    if not segments:
+        return
+
+    pipe = redis_client.pipeline()
+    for segment in segments:
+        pipe.zrange(segment, 0, -(RANKING_TOP_K + 1))
+    trimmed = pipe.execute()
+
+    pipe = redis_client.pipeline()
+    for segment, task_ids in zip(segments, trimmed):
+        if task_ids:
+            pipe.zrem(segment, *task_ids)
+            pipe.hdel(RANKING_INDEX_KEY, *task_ids)
+    pipe.execute()
+
+
+def refresh_task_ranking(batch_size: int = RANKING_REFRESH_BATCH) -> int:
+    """Re-scores the tasks the inventory refreshed since the last run.
+
+    Returns:
+        int: The number of tasks re-scored.
+    """
+    task_ids = [int(task_id) for task_id in redis_client.spop(INVENTORY_CHANGES_KEY, batch_size) or []]
+    if not task_ids:
+        return 0
+
+    rows = db.session.execute(_open_tasks_select().where(Task.__table__.c.id.in_(task_ids))).all()
+
+    found = {row.id for row in rows}
+    missing = [task_id for task_id in task_ids if task_id not in found] # deleted tasks
+    if missing:
+        segments = redis_client.hmget(RANKING_INDEX_KEY, missing)
+        pipe = redis_client.pipeline()
+        for task_id, segment in zip(missing, segments):
+            if segment:
+                pipe.zrem(segment, task_id)
+        pipe.hdel(RANKING_INDEX_KEY, *missing)
+        pipe.execute()
+
+    _rank_rows(rows)
+
+    return len(task_ids)
+
+
+def rebuild_task_ranking() -> int:
+    """Rebuilds the ranking of every segment from the database.
+
+    Returns:
+        int: The number of open tasks ranked.
+    """
+    rows = [row for row in db.session.execute(_open_tasks_select()).all() if row.is_open]
+
+    segments = {}
+    for row in rows:
+        segments.setdefault(ranking_key(row.task_type, row.filter_value), []).append(row)
+
+    stale_keys = set(redis_client.scan_iter(match=f"{RANKING_KEY_PREFIX}:advert:*"))
+    stale_keys.update(redis_client.scan_iter(match=f"{RANKING_KEY_PREFIX}:engagement:*"))
+
+    pipe = redis_client.pipeline(transaction=True)
+    if stale_keys:
+        pipe.delete(*stale_keys)
+    pipe.delete(RANKING_INDEX_KEY)
+
+    for segment, segment_rows in segments.items():
+        top_rows = sorted(segment_rows, key=score_task, reverse=True)[:RANKING_TOP_K]
+        pipe.zadd(segment, {row.id: score_task(row) for row in top_rows})
+        for row in top_rows:
+            pipe.hset(RANKING_INDEX_KEY, row.id, segment)
+
+    pipe.set(RANKING_READY_KEY, 1)
+    pipe.execute()
+
+    return len(rows)
+
+
+def get_ranked_task_ids(task_type: str, filter_value: str, count: int, offset: int = 0) -> list[tuple[int, float]] | None:
+    """Returns `count` ranked tasks of a segment with their scores, starting `offset` tasks from the top.
+
+    Returns:
+        list | None: (task id, score) pairs, best first, or None if the ranking is unavailable.
+    """
+    try:
+        pipe = redis_client.pipeline()
+        pipe.exists(RANKING_READY_KEY)
+        pipe.zrevrange(ranking_key(task_type, filter_value), offset, offset + count - 1, withscores=True)
+        is_ready, ranked = pipe.execute()
+    except RedisError as e:
+        log_exception("Unable to read task ranking", e)
+        return None
+
+    if not is_ready:
+        return None
+
+    return [(int(task_id), score) for task_id, score in ranked]
+
+
+def personalize_scores(tasks: list, scores: dict, user_id: int, earner_targeting: dict) -> list:
+    """Orders tasks for an earner, boosting tasks targeted at them and from advertisers they worked for.
+
+    Args:
+        tasks (list): The eligible tasks.
+        scores (dict): maps a task id to its segment score.
+        user_id (int): The ID of the earner.
+        earner_targeting (dict): The earner's targeting attributes.
+
+    Returns:
+        list: The tasks, best first.
+    """
+    advertiser_ids = {task.trendit3_user_id for task in tasks}
+    worked_for = set(db.session.scalars(
+        select(Task.trendit3_user_id).distinct()
+        .join(TaskPerformance, TaskPerformance.task_id == Task.id)
+        .where(TaskPerformance.user_id == user_id, TaskPerformance.status == 'completed', Task.trendit3_user_id.in_(advertiser_ids))
+    ))
+
+    def personal_score(task) -> float:
+        score = scores.get(task.id, 0.0)
+        targets = {'country': task.target_country, 'state': task.target_state, 'gender': task.gender}
+        score += sum(TARGETING_BOOST for attribute, value in earner_targeting.items()
+                     if attribute in targets and normalize_target(targets[attribute]) not in (WILDCARD, '') and normalize_target(targets[attribute]) == value)
+        if task.trendit3_user_id in worked_for:
+            score += ADVERTISER_BOOST
+        return score
+
+    return sorted(tasks, key=personal_score, reverse=True)
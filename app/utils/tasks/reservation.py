@@ -0,0 +1,156 @@
+'''
+This module handles the allocation of task slots to earners.
+
+A slot is claimed with a single conditional UPDATE on the task row
+(`total_allocated < posts_count/engagements_count`), so concurrent earners
+can never push a task past the number of performances the advertiser paid for.
+The TaskPerformance for the claimed slot is created in the same transaction,
+and slots are given back when a performance is cancelled or times out.
+
+Earners can also prefetch a batch of tasks: those are created as 'reserved'
+performances, which hold their slot for `TASK_RESERVATION_TTL` and are deleted
+(giving the slot back) if the earner doesn't perform them in time.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import func, select, update
+
+from ...extensions import db
+from ...models.task import Task, AdvertTask, EngagementTask, TaskPerformance
+from ...exceptions import TaskSlotsFilledError
+from ..helpers.count_helpers import queue_count_invalidation
+from .inventory import get_count_field, queue_inventory_refresh
+from . import deadlines # keeps the deadline queue in sync with performance statuses
+from . import counters # keeps the tasks' progress counters in sync with performance statuses
+
+
+# Performance statuses that still hold on to a task slot which can be given back
+RELEASABLE_STATUSES = ('reserved', 'pending', 'in_review')
+
+# Performance statuses that occupy a slot of the task
+SLOT_HOLDING_STATUSES = ('reserved', 'pending', 'in_review', 'completed')
+
+
+def reserve_task_slot(task: Task, user_id: int, status: str = 'pending') -> TaskPerformance:
+    """Atomically claims a slot of the task for a user and creates the TaskPerformance for it.
+
+    The caller is responsible for committing the session.
+
+    Args:
+        task (Task): The advert or engagement task to claim a slot of.
+        user_id (int): The ID of the earner performing the task.
+        status (str): The status to create the TaskPerformance with. Defaults to 'pending'.
+
+    Returns:
+        TaskPerformance: The newly created (uncommitted) task performance.
+
+    Raises:
+        TaskSlotsFilledError: If every slot of the task has already been allocated.
+    """
+    task_table = Task.__table__
+    count_table = (AdvertTask if task.task_type == 'advert' else EngagementTask).__table__
+    count_column = count_table.c[get_count_field(task.task_type)]
+
+    capacity = select(count_column).where(count_table.c.id == task_table.c.id).scalar_subquery()
+    allocated = func.coalesce(task_table.c.total_allocated, 0)
+
+    claimed = db.session.execute(
+        update(task_table)
+        .where(task_table.c.id == task.id, allocated < capacity)
+        .values(total_allocated=allocated + 1)
+        .returning(task_table.c.total_allocated)
+    ).first()
+
+    if claimed is None:
+        raise TaskSlotsFilledError()
+
+    queue_inventory_refresh(db.session, task.id) # the task may have just been filled up
+    queue_count_invalidation(db.session, task_table)
+
+    return TaskPerformance.create_task_performance(user_id=user_id, task_id=task.id, task_type=task.task_type, reward_money=task.reward_money, proof_screenshot=None, account_name='', post_link='', status=status, commit=False)
+
+
+def release_task_slot(performance: TaskPerformance, status: str) -> bool:
+    """Updates the status of a task performance, giving its slot back to the task if it still held one.
+
+    The caller is responsible for committing the session.
+
+    Args:
+        performance (TaskPerformance): The task performance being cancelled, timed out, etc.
+        status (str): The new status of the task performance.
+
+    Returns:
+        bool: True if a slot was released.
+    """
+    released = performance.status in RELEASABLE_STATUSES and status not in SLOT_HOLDING_STATUSES
+    performance.status = status
+
+    if released:
+        task_table = Task.__table__
+        db.session.execute(
+            update(task_table)
+            .where(task_table.c.id == performance.task_id, task_table.c.total_allocated > 0)
+            .values(total_allocated=task_table.c.total_allocated - 1)
+        )
+        queue_inventory_refresh(db.session, performance.task_id)
+        queue_count_invalidation(db.session, task_table)
+
+    return released
+
+
+def release_expired_reservations(performance_ids: list[int] | None = None) -> int:
+    """Deletes prefetched task reservations the earner didn't perform in time, giving their slots back.
+
+    Args:
+        performance_ids (list[int], optional): Only consider these task performances. Defaults to every reservation.
+
+    Returns:
+        int: The number of reservations released.
+    """
+    expired_before = datetime.utcnow() - current_app.config['TASK_RESERVATION_TTL']
+    query = TaskPerformance.query.filter(TaskPerformance.status == 'reserved', TaskPerformance.started_at <= expired_before)
+    if performance_ids is not None:
+        query = query.filter(TaskPerformance.id.in_(performance_ids))
+
+    expired_reservations = query.with_for_update(skip_locked=True).all()
+    for reservation in expired_reservations:
+        release_task_slot(reservation, 'cancelled')
+        db.session.delete(reservation) # so the task can be offered to the earner again
+
+    db.session.commit()
+
+    return len(expired_reservations)
+
+
+def recount_task_allocations() -> int:
+    """Recomputes `total_allocated` of every task from the performances that hold a slot.
+
+    Returns:
+        int: The number of tasks whose allocation count was corrected.
+    """
+    task_table = Task.__table__
+    performance_table = TaskPerformance.__table__
+
+    holding = select(func.count(performance_table.c.id)) \
+        .where(performance_table.c.task_id == task_table.c.id, performance_table.c.status.in_(SLOT_HOLDING_STATUSES)) \
+        .scalar_subquery()
+
+    result = db.session.execute(
+        update(task_table)
+        .where(func.coalesce(task_table.c.total_allocated, 0) != holding)
+        .values(total_allocated=holding)
+        .returning(task_table.c.id)
+    ).all()
+
+    for row in result:
+        queue_inventory_refresh(db.session, row.id)
+    if result:
+        queue_count_invalidation(db.session, task_table)
+
+    db.session.commit()
+
+    return len(result)
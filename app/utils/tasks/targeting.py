@@ -0,0 +1,99 @@
+'''
+This module matches open tasks against the earner's demographics.
+
+Advertisers can target a task at a country, a state, a gender and a religion.
+Alongside the inventory pools, every open task is indexed in one Redis set per
+targeted attribute value (an inverted index), with wildcard targets such as
+"All Countries" or "All Religion" stored under a shared "*" set. Matching an
+earner is then a set intersection of the pool with the union of the earner's
+value set and the wildcard set for each attribute, done inside Redis.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from sqlalchemy import func, or_
+
+from ...extensions import db
+from ...models.user import Trendit3User, Address, Profile
+
+
+TARGETING_KEY_PREFIX = "task_targeting"
+WILDCARD = "*"
+
+# Maps each targeting attribute to the Task column holding it
+TARGETING_FIELDS = {
+    'country': 'target_country',
+    'state': 'target_state',
+    'gender': 'gender',
+    'religion': 'religion',
+}
+
+# Target values that mean "everyone"
+WILDCARD_VALUES = ('', 'all', 'any', 'both', 'everyone', 'none')
+
+
+def normalize_target(value: str | None) -> str:
+    """Normalizes a targeted value so task targets and earner attributes can be compared.
+
+    Wildcards like "All Countries", "All States" or an empty value become "*",
+    and the " State" suffix is dropped so "Lagos" and "Lagos State" match.
+    """
+    value = (value or '').strip().lower()
+
+    if value in WILDCARD_VALUES or value.startswith('all '):
+        return WILDCARD
+
+    if value.endswith(' state'):
+        value = value[:-len(' state')].strip()
+
+    return value
+
+
+def targeting_key(attribute: str, value: str) -> str:
+    return f"{TARGETING_KEY_PREFIX}:{attribute}:{value}"
+
+
+def task_targeting_keys(task) -> list[str]:
+    """Returns the index sets a task (or a row with the same target columns) belongs to."""
+    return [targeting_key(attribute, normalize_target(getattr(task, field))) for attribute, field in TARGETING_FIELDS.items()]
+
+
+def get_earner_targeting(user_id: int) -> dict:
+    """Returns the earner's normalized targeting attributes, leaving out the ones they haven't provided.
+
+    Religion isn't collected from earners yet, so tasks targeted at a religion are
+    not filtered on it.
+    """
+    row = db.session.query(Address.country, Address.state, Profile.gender) \
+        .select_from(Trendit3User) \
+        .outerjoin(Address, Address.trendit3_user_id == Trendit3User.id) \
+        .outerjoin(Profile, Profile.trendit3_user_id == Trendit3User.id) \
+        .filter(Trendit3User.id == user_id) \
+        .first()
+
+    if row is None:
+        return {}
+
+    earner = {
+        'country': normalize_target(row.country),
+        'state': normalize_target(row.state),
+        'gender': normalize_target(row.gender),
+    }
+
+    return {attribute: value for attribute, value in earner.items() if value != WILDCARD}
+
+
+def targeting_filters(task_model, earner_targeting: dict) -> list:
+    """Builds SQL filters matching the same tasks as the Redis index, for when it isn't available."""
+    filters = []
+    for attribute, value in earner_targeting.items():
+        column = func.lower(func.trim(getattr(task_model, TARGETING_FIELDS[attribute])))
+        filters.append(or_(
+            getattr(task_model, TARGETING_FIELDS[attribute]).is_(None),
+            column.in_(WILDCARD_VALUES),
+            column.like('all %'),
+            column.in_((value, f"{value} state")),
+        ))
+
+    return filters
@@ -0,0 +1,102 @@
+'''
+Benchmarks the JSON encoding of typical Trendit³ API responses.
+
+Compares Flask's default JSON provider with `FastJSONProvider` (orjson when
+installed) on pages shaped like the task and transaction listings, reporting
+the encode time and the response size.
+
+Usage:
+    python -m benchmarks.json_encoding [--rows 500] [--repeat 50]
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import argparse, random, timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils.json_provider import FastJSONProvider, orjson
+
+
+def task_payload(rows: int) -> dict:
+    """A page shaped like the output of `AdvertTask.to_dict`."""
+    now = datetime.utcnow()
+    tasks = [{
+        'id': i,
+        'task_type': 'advert',
+        'platform': random.choice(['instagram', 'facebook', 'tiktok', 'x', 'whatsapp']),
+        'fee': Decimal('5000.00'),
+        'fee_paid': Decimal('5000.00'),
+        'media_path': [f'https://res.cloudinary.com/trendit/image/upload/v1/task_{i}_{n}.jpg' for n in range(2)],
+        'task_key': f'{random.getrandbits(80):020x}',
+        'authorization_url': '',
+        'payment_status': 'complete',
+        'status': 'approved',
+        'total_allocated': random.randint(0, 50),
+        'total_success': random.randint(0, 50),
+        'total_pending': random.randint(0, 5),
+        'total_in_review': random.randint(0, 5),
+        'total_rejected': 0,
+        'total_timed_out': random.randint(0, 3),
+        'posts_count': 50,
+        'target_country': 'Nigeria',
+        'target_state': 'Lagos',
+        'gender': 'All',
+        'religion': 'All Religion',
+        'caption': 'Share our new collection with your followers ' * 3,
+        'hashtags': '#trendit #ads #lagos',
+        'date_created': now - timedelta(hours=i),
+        'updated_at': now,
+        'creator': {'id': i % 40, 'username': f'advertiser{i % 40}', 'email': f'advertiser{i % 40}@example.com'},
+    } for i in range(rows)]
+
+    return {'status': 'success', 'status_code': 200, 'message': 'All Advert Tasks fetched successfully',
+            'total': rows * 10, 'current_page': 1, 'total_pages': 10, 'advert_tasks': tasks}
+
+
+def transaction_payload(rows: int) -> dict:
+    """A page shaped like the output of `Transaction.to_dict`."""
+    now = datetime.utcnow()
+    transactions = [{
+        'id': i,
+        'key': f'{random.getrandbits(80):020x}',
+        'amount': Decimal(random.randint(100, 500000)) / 100,
+        'transaction_type': random.choice(['credit', 'debit', 'withdrawal', 'payment']),
+        'description': 'Payment for performed task',
+        'status': 'complete',
+        'created_at': now - timedelta(minutes=i),
+        'updated_at': now,
+        'user_id': 7,
+    } for i in range(rows)]
+
+    return {'status': 'success', 'status_code': 200, 'message': 'Transactions fetched successfully',
+            'total': rows * 10, 'current_page': 1, 'total_pages': 10, 'transactions': transactions}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=500, help='rows per page')
+    parser.add_argument('--repeat', type=int, default=50, help='encodings per measurement')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    providers = {
+        'flask default': DefaultJSONProvider(app),
+        f'fast ({"orjson" if orjson else "stdlib fallback"})': FastJSONProvider(app),
+    }
+    payloads = {'tasks': task_payload(args.rows), 'transactions': transaction_payload(args.rows)}
+
+    print(f"{'payload':<14}{'provider':<28}{'ms/encode':>12}{'bytes':>12}")
+    with app.app_context():
+        for payload_name, payload in payloads.items():
+            for provider_name, provider in providers.items():
+                body = provider.response(payload).get_data()
+                seconds = timeit.timeit(lambda: provider.response(payload), number=args.repeat)
+                print(f"{payload_name:<14}{provider_name:<28}{seconds / args.repeat * 1000:>12.2f}{len(body):>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -45,8 +45,17 @@ class Config:
     
     # Constants
     TASKS_PER_PAGE = os.environ.get('TASKS_PER_PAGE') or 10
+    TASK_PREFETCH_LIMIT = int(os.environ.get('TASK_PREFETCH_LIMIT') or 10) # max tasks an earner can hold in reserve
+    TASK_PERFORMANCE_TIMEOUT = timedelta(hours=1) # time an earner has to submit a task they started
+    TASK_RESERVATION_TTL = timedelta(minutes=int(os.environ.get('TASK_RESERVATION_TTL_MINUTES') or 15))
     ITEMS_PER_PAGE = os.environ.get('ITEMS_PER_PAGE') or 10
+    COUNT_CACHE_TTL = int(os.environ.get('COUNT_CACHE_TTL') or 60) # seconds an exact list total is served from cache
+    COUNT_ESTIMATE_THRESHOLD = int(os.environ.get('COUNT_ESTIMATE_THRESHOLD') or 10000) # below this, planner estimates are replaced by exact counts
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL') or 300) # seconds a cached catalog page is kept, bounding how stale its counters get
     PAYMENT_TYPES = ['task-creation', 'membership-fee', 'credit-wallet', 'item-upload']
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE') or 1024) # bytes; smaller responses go out uncompressed
+    COMPRESSION_LEVEL = 6 # gzip level
+    COMPRESSION_BROTLI_QUALITY = 5
     
     # JWT configurations
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
@@ -101,6 +110,7 @@ class Config:
     #  ExchangeRate-API
     EXCHANGE_RATE_API_KEY = os.environ.get('EXCHANGE_RATE_API_KEY')
     EXCHANGE_RATE_API_URL = f"https://v6.exchangerate-api.com/v6/{EXCHANGE_RATE_API_KEY}/latest"
+    EXCHANGE_RATES_LOCAL_TTL = int(os.environ.get('EXCHANGE_RATES_LOCAL_TTL') or 300) # seconds before a process checks Redis for newer rates
     
     # Rate limit
     RATELIMIT_STORAGE_URI = REDIS_URL
@@ -0,0 +1,67 @@
+'''
+Tests for the incremental open task counts.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+from app.utils.tasks import catalog_counts
+from app.utils.tasks.catalog_counts import COUNTS_INDEX_KEY, counts_key, update_task_counts
+
+
+class RecordingPipeline:
+    def __init__(self):
+        self.executed = False
+
+    def execute(self):
+        self.executed = True
+
+
+@pytest.fixture
+def moves(monkeypatch):
+    """Records the task moves sent to the counts script instead of running it on Redis."""
+    pipe = RecordingPipeline()
+    recorded = []
+    monkeypatch.setattr(catalog_counts, 'redis_client', SimpleNamespace(pipeline=lambda transaction=True: pipe))
+    monkeypatch.setattr(catalog_counts, '_move_task_script', lambda keys, args, client: recorded.append((keys, args, client)))
+    yield recorded
+    assert pipe.executed
+
+
+def _row(task_id, is_open=True, **values):
+    columns = dict(task_type='engagement', platform='instagram', goal='follow', target_country='Nigeria',
+                   target_state=None, gender='', religion='All Religion')
+    columns.update(values)
+    return SimpleNamespace(id=task_id, is_open=is_open, **columns)
+
+
+def test_open_task_moves_to_its_counted_values(moves):
+    update_task_counts([7], [_row(7)])
+
+    [(keys, (task_id, new), _)] = moves
+    assert keys == [COUNTS_INDEX_KEY]
+    assert task_id == 7
+    new = json.loads(new)
+    assert new[counts_key('all', 'platform')] == 'instagram'
+    assert new[counts_key('engagement', 'goal')] == 'follow'
+    assert new[counts_key('engagement', 'target_state')] == ''
+    assert counts_key('advert', 'platform') not in new
+
+
+def test_closed_and_deleted_tasks_move_out_of_the_counts(moves):
+    update_task_counts([7, 8], [_row(7, is_open=False)])
+
+    assert [args for _, args, _ in moves] == [[7, '{}'], [8, '{}']]
+
+
+def test_every_move_goes_through_one_pipeline(moves):
+    update_task_counts([1, 2, 3], [_row(1), _row(2), _row(3)])
+
+    assert len({id(client) for _, _, client in moves}) == 1
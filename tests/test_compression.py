@@ -0,0 +1,148 @@
+'''
+Tests for the response compression middleware.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import gzip, json, zlib
+
+import pytest
+
+pytest.importorskip("flask")
+
+from flask import Flask, Response, jsonify, send_file
+from io import BytesIO
+
+from app.utils.middleware import compression
+from app.utils.middleware.compression import compress_response, static_payload
+
+
+LARGE = {'tasks': [{'id': index, 'platform': 'instagram', 'goal': 'follow'} for index in range(200)]}
+SMALL = {'status': 'success'}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+
+    app = Flask(__name__)
+    app.config.update(COMPRESSION_MIN_SIZE=1024, COMPRESSION_LEVEL=6, COMPRESSION_BROTLI_QUALITY=5)
+    app.after_request(compress_response)
+
+    @app.route('/large')
+    def large():
+        response = jsonify(LARGE)
+        response.set_etag('abc')
+        return response
+
+    @app.route('/small')
+    def small():
+        return jsonify(SMALL)
+
+    @app.route('/error')
+    def error():
+        return jsonify(LARGE), 400
+
+    @app.route('/empty')
+    def empty():
+        return '', 204
+
+    @app.route('/streamed')
+    def streamed():
+        return Response((json.dumps(item) for item in LARGE['tasks']), mimetype='application/json')
+
+    @app.route('/encoded')
+    def encoded():
+        response = jsonify(LARGE)
+        response.headers['Content-Encoding'] = 'identity'
+        return response
+
+    @app.route('/image')
+    def image():
+        return Response(b'\0' * 4096, mimetype='image/png')
+
+    @app.route('/download')
+    def download():
+        return send_file(BytesIO(json.dumps(LARGE).encode()), mimetype='text/csv', as_attachment=True, download_name='transactions.csv')
+
+    @app.route('/religions')
+    @static_payload
+    def religions():
+        return jsonify(LARGE)
+
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+GZIP = {'Accept-Encoding': 'gzip'}
+
+
+def test_large_json_is_gzipped(client):
+    response = client.get('/large', headers=GZIP)
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(gzip.decompress(response.get_data())) == LARGE
+
+
+def test_compressed_response_gets_a_weak_etag(client):
+    response = client.get('/large', headers=GZIP)
+
+    assert response.get_etag() == ('abc', True)
+
+
+def test_uncompressed_response_keeps_its_strong_etag(client):
+    response = client.get('/large')
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_etag() == ('abc', False)
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+@pytest.mark.parametrize("path", ['/small', '/error', '/empty', '/encoded', '/image', '/download'])
+def test_skipped_responses_are_sent_as_they_are(client, path):
+    response = client.get(path, headers=GZIP)
+
+    assert response.headers.get('Content-Encoding') in (None, 'identity')
+
+
+def test_streamed_json_is_gzipped_chunk_by_chunk(app):
+    with app.test_request_context('/streamed', headers=GZIP):
+        response = app.full_dispatch_request()
+        assert response.is_streamed
+        chunks = [chunk for chunk in response.response]
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    # every task is flushed as it is generated, so the client can decode the stream as it arrives
+    assert len(chunks) > len(LARGE['tasks'])
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert decompressor.decompress(chunks[0]).decode() == json.dumps(LARGE['tasks'][0])
+    body = decompressor.decompress(b''.join(chunks[1:])) + decompressor.flush()
+    assert body.decode() == ''.join(json.dumps(task) for task in LARGE['tasks'][1:])
+
+
+def test_streamed_json_without_accepted_encoding_is_sent_as_is(client):
+    response = client.get('/streamed')
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data(as_text=True) == ''.join(json.dumps(task) for task in LARGE['tasks'])
+
+
+def test_static_payloads_are_compressed_once(client, monkeypatch):
+    compression._static_cache.clear()
+    compressed = []
+    compress = compression._compress
+    monkeypatch.setattr(compression, '_compress', lambda data, encoding: compressed.append(encoding) or compress(data, encoding))
+
+    first = client.get('/religions', headers=GZIP)
+    second = client.get('/religions', headers=GZIP)
+
+    assert compressed == ['gzip']
+    assert first.get_data() == second.get_data()
+    assert json.loads(gzip.decompress(second.get_data())) == LARGE
@@ -0,0 +1,50 @@
+'''
+Tests for the invalidation of cached list totals.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.task import Task, TaskPerformance
+from app.utils.helpers.count_helpers import _PENDING_TABLES_KEY, _track_row_change, queue_count_invalidation
+
+
+def _loaded_performance(session: Session) -> TaskPerformance:
+    performance = TaskPerformance()
+    set_committed_value(performance, 'status', 'pending')
+    session.add(performance)
+    return performance
+
+
+def test_changed_row_invalidates_its_table():
+    session = Session()
+    performance = _loaded_performance(session)
+    performance.status = 'timed_out'
+
+    _track_row_change(None, None, performance)
+
+    assert session.info[_PENDING_TABLES_KEY] == {TaskPerformance.__table__.name}
+
+
+def test_unchanged_row_keeps_cached_counts():
+    session = Session()
+    performance = _loaded_performance(session)
+
+    _track_row_change(None, None, performance)
+
+    assert _PENDING_TABLES_KEY not in session.info
+
+
+def test_bulk_updates_queue_tables_by_table_or_name():
+    session = Session()
+
+    queue_count_invalidation(session, Task.__table__, 'task_performance')
+
+    assert session.info[_PENDING_TABLES_KEY] == {Task.__table__.name, 'task_performance'}
@@ -0,0 +1,66 @@
+'''
+Tests for converting naira amounts with the known exchange rates.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("flask")
+
+from app.utils.payments import rates
+
+
+RATES = {'NGN': 1, 'USD': 0.000673, 'GBP': 0.000531}
+
+
+@pytest.fixture(autouse=True)
+def known_rates(monkeypatch):
+    monkeypatch.setattr(rates, 'get_exchange_rates', lambda base_currency="NGN": RATES)
+
+
+def test_converts_every_amount_to_one_currency():
+    assert rates.convert_amounts([1000, 250000, '1500.50'], 'USD', format=False) == [
+        Decimal('0.67'), Decimal('168.25'), Decimal('1.01'),
+    ]
+
+
+def test_converts_each_amount_to_its_own_currency():
+    assert rates.convert_amounts([100000, 100000, 100000], ['USD', 'GBP', 'NGN'], format=False) == [
+        Decimal('67.30'), Decimal('53.10'), Decimal('100000.00'),
+    ]
+
+
+def test_formats_amounts_with_commas():
+    assert rates.convert_amounts([1500000, 12], 'NGN') == ['1,500,000.00', '12.00']
+
+
+def test_amounts_in_a_currency_without_a_rate_stay_in_naira():
+    assert rates.convert_amounts([Decimal('2500.456')], 'XYZ', format=False) == [Decimal('2500.46')]
+    assert rates.convert_amounts([2500], None) == ['2,500.00']
+
+
+def test_looks_each_rate_up_once(monkeypatch):
+    lookups = []
+
+    class CountingRates(dict):
+        def __getitem__(self, currency):
+            lookups.append(currency)
+            return super().__getitem__(currency)
+
+    monkeypatch.setattr(rates, 'get_exchange_rates', lambda base_currency="NGN": CountingRates(RATES))
+
+    rates.convert_amounts(range(100), ['USD', 'GBP'] * 50)
+
+    assert sorted(lookups) == ['GBP', 'USD']
+
+
+def test_convert_amount_matches_bulk_conversion():
+    assert rates.convert_amount(123456, 'USD') == rates.convert_amounts([123456], 'USD')[0]
+
+
+def test_empty_column_converts_to_empty_list():
+    assert rates.convert_amounts([], 'USD') == []
@@ -0,0 +1,115 @@
+'''
+Tests that the orjson-backed JSON provider encodes responses like Flask's default provider.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import dataclasses, json, uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+
+import pytest
+
+pytest.importorskip("flask")
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils.json_provider import FastJSONProvider
+
+
+class Status(str, Enum):
+    PENDING = 'pending'
+
+
+@dataclasses.dataclass
+class Money:
+    amount: Decimal
+    currency: str
+
+
+PAYLOADS = [
+    {'status': 'success', 'status_code': 200, 'message': 'Tasks fetched successfully', 'tasks': []},
+    {'b': 1, 'a': {'d': [1, 2.5, None, True, False], 'c': 'x'}},
+    {'created_at': datetime(2024, 5, 17, 9, 30, 12), 'due': date(2024, 6, 1), 'aware': datetime(2024, 5, 17, 9, 30, tzinfo=timezone.utc)},
+    {'amount': Decimal('1500.50'), 'id': uuid.UUID('12345678-1234-5678-1234-567812345678'), 'status': Status.PENDING},
+    {'price': Money(Decimal('10.00'), 'NGN')},
+    [{'id': index, 'reward_money': Decimal(index) / 4} for index in range(50)],
+    {'name': 'Adébáyọ̀', 'currency': '₦', 'bio': 'I ❤ tasks'},
+    {1: 'one', 2: 'two'},
+    {'counts': {3: 'lagos', 1: 'abuja'}, 'big': 2 ** 70},
+]
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def _decoded(body: str | bytes):
+    """Decodes a JSON body keeping the order of object keys."""
+    return json.loads(body, object_pairs_hook=list)
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_dumps_matches_default_provider(app, payload):
+    assert _decoded(FastJSONProvider(app).dumps(payload)) == _decoded(DefaultJSONProvider(app).dumps(payload))
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_response_matches_default_provider(app, payload):
+    with app.app_context():
+        fast = FastJSONProvider(app).response(payload)
+        default = DefaultJSONProvider(app).response(payload)
+
+    assert fast.mimetype == default.mimetype == 'application/json'
+    assert _decoded(fast.get_data()) == _decoded(default.get_data())
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_response_body_is_identical_to_default_provider(app, payload):
+    with app.app_context():
+        fast = FastJSONProvider(app).response(payload).get_data()
+        default = DefaultJSONProvider(app).response(payload).get_data()
+
+    assert fast == default
+
+
+def test_non_ascii_text_is_escaped_by_default(app):
+    assert FastJSONProvider(app).dumps({'currency': '₦'}) == '{"currency":"\\u20a6"}'
+
+
+def test_non_ascii_text_is_kept_when_ensure_ascii_is_off(app):
+    fast = FastJSONProvider(app)
+    fast.ensure_ascii = False
+    default = DefaultJSONProvider(app)
+    default.ensure_ascii = False
+
+    with app.app_context():
+        assert fast.response({'currency': '₦'}).get_data() == default.response({'currency': '₦'}).get_data()
+    assert fast.dumps({'currency': '₦'}) == '{"currency":"₦"}'
+
+
+def test_ascii_payloads_are_encoded_by_orjson(app, monkeypatch):
+    pytest.importorskip("orjson")
+    from app.utils import json_provider
+
+    def stdlib_dumps(*args, **kwargs):
+        raise AssertionError("encoded by the stdlib encoder")
+    monkeypatch.setattr(json_provider.json, 'dumps', stdlib_dumps)
+
+    assert FastJSONProvider(app).dumps_bytes(PAYLOADS[3]).startswith(b'{"amount":"1500.50"')
+
+
+def test_response_is_compact(app):
+    with app.app_context():
+        body = FastJSONProvider(app).response({'a': [1, 2]}).get_data()
+
+    assert body == b'{"a":[1,2]}\n'
+
+
+def test_unknown_types_are_rejected(app):
+    with pytest.raises(TypeError):
+        FastJSONProvider(app).dumps({'value': object()})
@@ -0,0 +1,74 @@
+'''
+Tests for the pagination helpers: keyset cursors and the last page check.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import base64
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("flask")
+
+from app.exceptions import InvalidCursorError
+from app.utils.helpers.pagination_helpers import decode_cursor, encode_cursor, is_past_last_page
+
+
+def test_cursor_round_trips_datetimes_and_ids():
+    sort_key = (datetime(2024, 5, 17, 9, 30, 12, 345678), 4821)
+
+    assert decode_cursor(encode_cursor(*sort_key)) == sort_key
+
+
+def test_cursor_round_trips_strings_and_numbers():
+    assert decode_cursor(encode_cursor('lagos', 12.5, None)) == ('lagos', 12.5, None)
+
+
+def test_cursor_is_url_safe_and_unpadded():
+    cursor = encode_cursor(datetime(2024, 1, 1), 1)
+
+    assert '=' not in cursor
+    assert set(cursor) <= set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_')
+
+
+@pytest.mark.parametrize("cursor", [
+    'not a cursor',
+    '!!!',
+    base64.urlsafe_b64encode(b'{"dt": 1}').decode(),
+    base64.urlsafe_b64encode(b'[{"dt": "yesterday"}]').decode(),
+    base64.urlsafe_b64encode(b'[{"id": 1}]').decode(),
+    base64.urlsafe_b64encode(b'12').decode(),
+])
+def test_malformed_cursors_raise_invalid_cursor_error(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_invalid_cursor_error_is_a_bad_request():
+    error = InvalidCursorError()
+
+    assert isinstance(error, ValueError)
+    assert error.status_code == 400
+    assert error.message == "Invalid cursor"
+
+
+def _page(page, pages, items, total_is_estimate=False):
+    return SimpleNamespace(page=page, pages=pages, items=items, total_is_estimate=total_is_estimate)
+
+
+def test_page_beyond_exact_total_is_past_last_page():
+    assert is_past_last_page(_page(page=4, pages=3, items=[]))
+    assert not is_past_last_page(_page(page=3, pages=3, items=[1]))
+
+
+def test_page_beyond_estimated_total_is_served_while_it_has_items():
+    # the planner estimated 3 pages but page 4 really exists
+    assert not is_past_last_page(_page(page=4, pages=3, items=[1, 2], total_is_estimate=True))
+    assert is_past_last_page(_page(page=5, pages=3, items=[], total_is_estimate=True))
+
+
+def test_keyset_pages_are_never_past_last_page():
+    assert not is_past_last_page(SimpleNamespace(page=None, pages=None, items=[]))
@@ -0,0 +1,116 @@
+'''
+Tests for serving the ranked task feed from the segment rankings.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+from app.utils.helpers import task_helpers
+from app.utils.tasks.ranking import RANKING_TOP_K
+
+
+class FakeColumn:
+    def in_(self, ids):
+        return ('in', set(ids))
+
+    def notin_(self, ids):
+        return ('notin', set(ids))
+
+    def desc(self):
+        return self
+
+
+class FakeQuery:
+    """Serves the eligible tasks, recording whether the database was asked to sort."""
+    def __init__(self, model, conditions=(), limit=None):
+        self.model, self.conditions, self._limit = model, conditions, limit
+
+    def filter(self, *conditions):
+        return FakeQuery(self.model, self.conditions + conditions, self._limit)
+
+    def order_by(self, *columns):
+        self.model.sorted_in_db = True
+        return self
+
+    def limit(self, limit):
+        return FakeQuery(self.model, self.conditions, limit)
+
+    def all(self):
+        tasks = [task for task in self.model.eligible if all(self._matches(task, condition) for condition in self.conditions)]
+        self.model.queries.append(self)
+        return tasks[:self._limit] if self._limit is not None else tasks
+
+    @staticmethod
+    def _matches(task, condition):
+        kind, ids = condition
+        return task.id in ids if kind == 'in' else task.id not in ids
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = SimpleNamespace(id=FakeColumn(), reward_money=FakeColumn(), date_created=FakeColumn(), eligible=[], queries=[], sorted_in_db=False)
+    model.query = FakeQuery(model)
+    monkeypatch.setattr(task_helpers, 'AdvertTask', model)
+    monkeypatch.setattr(task_helpers, 'get_jwt_identity', lambda: '7')
+    monkeypatch.setattr(task_helpers, 'get_earner_targeting', lambda user_id: {})
+    monkeypatch.setattr(task_helpers, '_eligibility_filters', lambda *args: [])
+    monkeypatch.setattr(task_helpers, 'personalize_scores', lambda tasks, scores, *args: sorted(tasks, key=lambda task: scores[task.id], reverse=True))
+    return model
+
+
+def _segment(monkeypatch, size):
+    """A ranked segment of `size` tasks, task 1 being the best."""
+    reads = []
+    def get_ranked_task_ids(task_type, filter_value, count, offset=0):
+        reads.append(offset)
+        return [(task_id, -task_id) for task_id in range(offset + 1, min(offset + count, size) + 1)]
+    monkeypatch.setattr(task_helpers, 'get_ranked_task_ids', get_ranked_task_ids)
+    return reads
+
+
+def _tasks(*task_ids):
+    return [SimpleNamespace(id=task_id) for task_id in task_ids]
+
+
+def test_short_segment_is_served_as_ranked(model, monkeypatch):
+    _segment(monkeypatch, 4)
+    model.eligible = _tasks(4, 2)
+
+    assert [task.id for task in task_helpers.get_ranked_tasks('advert', 'instagram', count=3)] == [2, 4]
+    assert not model.sorted_in_db
+    assert len(model.queries) == 1
+
+
+def test_reads_further_down_the_ranking_for_ineligible_users(model, monkeypatch):
+    reads = _segment(monkeypatch, 100)
+    model.eligible = _tasks(5, 40, 41)
+
+    tasks = task_helpers.get_ranked_tasks('advert', 'instagram', count=3)
+
+    assert [task.id for task in tasks] == [5, 40, 41]
+    assert reads == [0, 9, 18, 27, 36]
+    assert not model.sorted_in_db
+
+
+def test_full_segment_is_topped_up_from_below_the_cut_without_sorting(model, monkeypatch):
+    _segment(monkeypatch, RANKING_TOP_K)
+    model.eligible = _tasks(3, RANKING_TOP_K + 50, RANKING_TOP_K + 7)
+
+    tasks = task_helpers.get_ranked_tasks('advert', 'instagram', count=2)
+
+    assert [task.id for task in tasks] == [3, RANKING_TOP_K + 50]
+    assert not model.sorted_in_db
+
+
+def test_unavailable_ranking_is_sorted_in_the_database(model, monkeypatch):
+    monkeypatch.setattr(task_helpers, 'get_ranked_task_ids', lambda *args, **kwargs: None)
+    model.eligible = _tasks(9, 8)
+
+    assert [task.id for task in task_helpers.get_ranked_tasks('advert', 'instagram', count=2)] == [9, 8]
+    assert model.sorted_in_db
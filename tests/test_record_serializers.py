@@ -0,0 +1,58 @@
+'''
+Tests for the bulk conversion of money fields when serializing records.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+from app.utils.serializers import records
+from app.utils.serializers.records import serialize_transactions
+
+
+@pytest.fixture
+def conversions(monkeypatch):
+    """Records every call to `convert_amounts`, converting at a rate of 2."""
+    calls = []
+
+    def convert_amounts(amounts, currencies, format=True):
+        amounts = list(amounts)
+        calls.append((amounts, currencies))
+        return [f"{Decimal(amount) * 2:.2f}" for amount in amounts]
+
+    monkeypatch.setattr(records, 'convert_amounts', convert_amounts)
+    return calls
+
+
+def _transaction(transaction_id, amount, currency_code='USD'):
+    return SimpleNamespace(id=transaction_id, key=f"key-{transaction_id}", amount=amount, currency_code=currency_code,
+                           description='Task payment', status='complete', created_at=datetime(2024, 5, 1))
+
+
+def test_requested_amounts_are_converted_once_in_bulk(conversions):
+    transactions = [_transaction(1, 100), _transaction(2, 250, 'GBP')]
+
+    serialized = serialize_transactions(transactions, {'id', 'amount'})
+
+    assert serialized == [{'id': 1, 'amount': '200.00'}, {'id': 2, 'amount': '500.00'}]
+    assert conversions == [([100, 250], ['USD', 'GBP'])]
+
+
+def test_amounts_are_converted_to_the_given_currency(conversions):
+    serialize_transactions([_transaction(1, 100)], {'amount'}, currency_code='NGN')
+
+    assert conversions == [([100], 'NGN')]
+
+
+def test_amounts_arent_converted_unless_requested(conversions):
+    serialized = serialize_transactions([_transaction(1, 100)], {'id', 'status'})
+
+    assert serialized == [{'id': 1, 'status': 'complete'}]
+    assert conversions == []
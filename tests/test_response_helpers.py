@@ -0,0 +1,91 @@
+'''
+Tests for the streamed JSON success response.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import gzip, json
+
+import pytest
+
+pytest.importorskip("flask")
+
+from flask import Flask
+
+from app.utils.helpers.response_helpers import streamed_success_response, success_response
+from app.utils.json_provider import FastJSONProvider
+from app.utils.middleware.compression import compress_response
+
+
+def _get(pairs, extra_data=None, headers=None):
+    """Serves a streamed response of `pairs` and returns it once fully read."""
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config.update(COMPRESSION_MIN_SIZE=1024, COMPRESSION_LEVEL=6, COMPRESSION_BROTLI_QUALITY=5)
+    app.after_request(compress_response)
+
+    @app.route('/groups')
+    def groups():
+        return streamed_success_response("Tasks fetched", 200, 'groups', pairs, extra_data)
+
+    response = app.test_client().get('/groups', headers=headers)
+    data = response.get_data()
+    response.body = json.loads(gzip.decompress(data) if response.headers.get('Content-Encoding') == 'gzip' else data)
+    return response
+
+
+def test_streamed_body_matches_success_response():
+    groups = [('instagram', {'total': 2, 'tasks': [1, 2]}), ('tiktok', {'total': 0, 'tasks': []})]
+    app = Flask(__name__)
+    with app.test_request_context():
+        expected = success_response("Tasks fetched", 200, {'total_groups': 2, 'groups': dict(groups)}).get_json()
+
+    response = _get(iter(groups), {'total_groups': 2})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert response.body == expected
+
+
+def test_streams_an_empty_object():
+    assert _get(iter(())).body['groups'] == {}
+
+
+def test_error_while_streaming_ends_with_stream_error():
+    def groups():
+        yield 'instagram', {'total': 1}
+        raise RuntimeError("connection lost")
+
+    body = _get(groups()).body
+
+    assert body['groups'] == {'instagram': {'total': 1}}
+    assert body['stream_error'] is True
+    assert body['status'] == 'success'
+
+
+def test_error_before_the_first_entry_still_ends_the_body():
+    def groups():
+        raise RuntimeError("connection lost")
+        yield
+
+    body = _get(groups()).body
+
+    assert body['groups'] == {}
+    assert body['stream_error'] is True
+
+
+def test_complete_stream_has_no_stream_error():
+    assert 'stream_error' not in _get(iter([('a', 1)])).body
+
+
+def test_compressed_stream_decodes_to_the_same_body():
+    def groups():
+        yield 'instagram', {'total': 1}
+        raise RuntimeError("connection lost")
+
+    response = _get(groups(), headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.body['groups'] == {'instagram': {'total': 1}}
+    assert response.body['stream_error'] is True
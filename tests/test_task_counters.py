@@ -0,0 +1,72 @@
+'''
+Tests for the per-task progress counters kept by TaskPerformance mapper events.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.task import TaskPerformance
+from app.utils.tasks.counters import _count_deleted_performance, counter_changes
+
+
+class RecordingConnection:
+    """Stands in for the flush connection, keeping the statements executed on it."""
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+
+
+def _loaded_performance(status: str) -> TaskPerformance:
+    """A performance as loaded from the database with the given committed status."""
+    performance = TaskPerformance()
+    set_committed_value(performance, 'task_id', 1)
+    set_committed_value(performance, 'status', status)
+    return performance
+
+
+def test_cancelled_then_deleted_pending_performance_decrements_pending():
+    performance = _loaded_performance('pending')
+    performance.status = 'cancelled' # release_task_slot(performance, 'cancelled') before the delete
+    connection = RecordingConnection()
+
+    _count_deleted_performance(None, connection, performance)
+
+    assert len(connection.statements) == 1
+    set_columns = {column.key if hasattr(column, 'key') else column for column in connection.statements[0]._values}
+    assert set_columns == {'total_pending'}
+
+
+def test_deleted_performance_without_status_change_decrements_its_status():
+    performance = _loaded_performance('in_review')
+    connection = RecordingConnection()
+
+    _count_deleted_performance(None, connection, performance)
+
+    set_columns = {column.key if hasattr(column, 'key') else column for column in connection.statements[0]._values}
+    assert set_columns == {'total_in_review'}
+
+
+@pytest.mark.parametrize("old_status, new_status, expected", [
+    (None, 'pending', {'total_pending': 1}),
+    ('pending', 'in_review', {'total_pending': -1, 'total_in_review': 1}),
+    ('in_review', 'completed', {'total_in_review': -1, 'total_success': 1}),
+    ('in_review', 'rejected', {'total_in_review': -1, 'total_rejected': 1}),
+    ('pending', 'timed_out', {'total_pending': -1, 'total_timed_out': 1}),
+    ('pending', 'cancelled', {'total_pending': -1}),
+    ('completed', None, {'total_success': -1}),
+])
+def test_counter_changes_move_a_performance_between_counters(old_status, new_status, expected):
+    assert counter_changes(old_status, new_status) == expected
+
+
+@pytest.mark.parametrize("status", ['pending', 'cancelled', None])
+def test_counter_changes_ignore_unchanged_statuses(status):
+    assert counter_changes(status, status) == {}
@@ -0,0 +1,57 @@
+'''
+Tests for the scores tasks are ranked by.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import math
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+from app.utils.tasks.ranking import FRESHNESS_HALF_LIFE, score_task
+
+
+CREATED = datetime(2024, 5, 1, 12, 0)
+
+
+def _row(reward_money=100, capacity=10, allocated=0, date_created=CREATED):
+    return SimpleNamespace(reward_money=reward_money, capacity=capacity, allocated=allocated, date_created=date_created)
+
+
+def test_higher_reward_ranks_higher():
+    assert score_task(_row(reward_money=200)) > score_task(_row(reward_money=100))
+
+
+def test_more_slots_left_ranks_higher():
+    assert score_task(_row(allocated=2)) > score_task(_row(allocated=8))
+
+
+def test_newer_task_ranks_higher():
+    assert score_task(_row(date_created=CREATED + timedelta(hours=1))) > score_task(_row())
+
+
+def test_freshness_doubles_every_half_life():
+    older = score_task(_row())
+    newer = score_task(_row(date_created=CREATED + timedelta(seconds=FRESHNESS_HALF_LIFE)))
+
+    assert newer - older == pytest.approx(math.log(2))
+
+
+def test_score_doesnt_depend_on_when_it_is_computed():
+    # Two tasks keep the same order however long ago they were scored
+    gap = score_task(_row(reward_money=500)) - score_task(_row(date_created=CREATED + timedelta(days=1)))
+    later_gap = score_task(_row(reward_money=500, date_created=CREATED + timedelta(days=30))) \
+        - score_task(_row(date_created=CREATED + timedelta(days=31)))
+
+    assert gap == pytest.approx(later_gap)
+
+
+def test_overfilled_and_missing_values_score_as_zero():
+    row = _row(reward_money=None, capacity=None, allocated=5, date_created=None)
+
+    assert score_task(row) == 0
@@ -0,0 +1,84 @@
+'''
+Tests for reserving a batch of tasks for an earner to prefetch.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+from flask import Flask
+
+from app.celery.jobs import tasks as jobs
+from app.exceptions import PrefetchLimitError
+from app.models import TaskPaymentStatus
+from app.utils.helpers import task_helpers
+
+
+class RecordingSession:
+    def __init__(self):
+        self.committed = False
+        self.rolled_back = False
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = RecordingSession()
+    monkeypatch.setattr(task_helpers, 'db', SimpleNamespace(session=session))
+    monkeypatch.setattr(task_helpers, 'get_jwt_identity', lambda: '7')
+    monkeypatch.setattr(task_helpers, 'add_user_role', lambda role, user_id: None)
+    monkeypatch.setattr(task_helpers, 'reserve_task_slot', lambda task, user_id, status: SimpleNamespace(id=task.id, to_dict=lambda: {'task_id': task.id}))
+
+    app = Flask(__name__)
+    app.config['TASK_RESERVATION_TTL'] = timedelta(minutes=30)
+    with app.app_context():
+        yield session
+
+
+def _reserved_count(monkeypatch, count):
+    query = SimpleNamespace(filter_by=lambda **kwargs: SimpleNamespace(count=lambda: count))
+    monkeypatch.setattr(task_helpers, 'TaskPerformance', SimpleNamespace(query=query))
+
+
+def _tasks(*task_ids):
+    return [SimpleNamespace(id=task_id, payment_status=TaskPaymentStatus.COMPLETE) for task_id in task_ids]
+
+
+def test_reservations_are_returned_when_their_release_cant_be_scheduled(session, monkeypatch):
+    def broker_down(*args, **kwargs):
+        raise ConnectionError("broker unavailable")
+    monkeypatch.setattr(jobs.release_expired_reservations, 'apply_async', broker_down)
+
+    assert task_helpers.reserve_tasks(_tasks(1, 2)) == [{'task_id': 1}, {'task_id': 2}]
+    assert session.committed
+
+
+def test_reservations_stop_at_the_prefetch_limit(session, monkeypatch):
+    monkeypatch.setattr(jobs.release_expired_reservations, 'apply_async', lambda *args, **kwargs: None)
+    _reserved_count(monkeypatch, 8)
+
+    assert task_helpers.reserve_tasks(_tasks(1, 2, 3), limit=10) == [{'task_id': 1}, {'task_id': 2}]
+    assert 'FOR UPDATE' in str(session.statements[0])
+
+
+def test_user_at_the_prefetch_limit_cant_reserve_more(session, monkeypatch):
+    _reserved_count(monkeypatch, 10)
+
+    with pytest.raises(PrefetchLimitError):
+        task_helpers.reserve_tasks(_tasks(1), limit=10)
+    assert session.rolled_back and not session.committed
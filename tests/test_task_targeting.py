@@ -0,0 +1,59 @@
+'''
+Tests for matching tasks' targeting against the earner's demographics.
+
+@author: Emmanuel Olowu
+@link: https://github.com/zeddyemy
+@package: Trendit³
+'''
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.task import Task
+from app.utils.tasks.targeting import WILDCARD, normalize_target, targeting_filters
+
+
+@pytest.mark.parametrize("value", [None, '', '  ', 'All', 'All Countries', 'all states', 'Any', 'Both', 'Everyone', 'None'])
+def test_wildcard_targets_normalize_to_wildcard(value):
+    assert normalize_target(value) == WILDCARD
+
+
+@pytest.mark.parametrize("value, expected", [
+    ('Lagos', 'lagos'),
+    ('Lagos State', 'lagos'),
+    ('  lagos state ', 'lagos'),
+    ('Akwa Ibom State', 'akwa ibom'),
+    ('Nigeria', 'nigeria'),
+    ('Female', 'female'),
+])
+def test_targets_normalize_to_comparable_values(value, expected):
+    assert normalize_target(value) == expected
+
+
+def _compile(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_targeting_filters_builds_one_filter_per_earner_attribute():
+    filters = targeting_filters(Task, {'country': 'nigeria', 'state': 'lagos'})
+
+    assert len(filters) == 2
+    country, state = (_compile(clause) for clause in filters)
+    assert 'task.target_country IS NULL' in country
+    assert "'all %%'" in country or "'all %'" in country
+    assert "'nigeria', 'nigeria state'" in country
+    assert "'lagos', 'lagos state'" in state
+    assert 'task.target_state' in state and 'target_country' not in state
+
+
+def test_targeting_filters_accept_wildcard_targets():
+    compiled = _compile(targeting_filters(Task, {'gender': 'female'})[0])
+
+    for wildcard in ('', 'all', 'any', 'both', 'everyone', 'none'):
+        assert f"'{wildcard}'" in compiled
+
+
+def test_targeting_filters_without_earner_attributes_match_everything():
+    assert targeting_filters(Task, {}) == []